@@ -399,5 +399,8 @@ class DIContainerInMem:
     def get_chronicle_recorder_service(self):
         return ChronicleRecorderService(self.chronicle_repo)
 
+    def get_view_chronicle_recorder_service(self):
+        return self.get_chronicle_recorder_service()
+
     def get_chronicle_query_service(self):
         return ChronicleQueryService(self.chronicle_repo)
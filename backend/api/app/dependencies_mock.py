@@ -696,6 +696,9 @@ class MockDIContainer:
     def get_chronicle_recorder_service(self):
         return ChronicleRecorderService(self._chronicle_repo)
 
+    def get_view_chronicle_recorder_service(self):
+        return self.get_chronicle_recorder_service()
+
     def get_chronicle_query_service(self):
         return ChronicleQueryService(self._chronicle_repo)
 
@@ -23,6 +23,7 @@ from infra.storage.library_tag_association_repository_impl import (
 )
 from infra.storage.tag_repository_impl import SQLAlchemyTagRepository
 from infra.storage.chronicle_repository_impl import SQLAlchemyChronicleRepository
+from infra.storage.view_counter_buffer import get_view_counter_buffer
 from infra.storage.maturity_repository_impl import SQLAlchemyMaturitySnapshotRepository
 from api.app.shared.events import get_event_bus
 from api.app.modules.tag.application.adapters import (
@@ -471,5 +472,9 @@ class DIContainerReal:
     def get_chronicle_recorder_service(self) -> ChronicleRecorderService:
         return ChronicleRecorderService(self.chronicle_repo)
 
+    def get_view_chronicle_recorder_service(self) -> ChronicleRecorderService:
+        """Recorder for high-volume view facts (book_opened): write-behind, no per-view transaction."""
+        return ChronicleRecorderService(get_view_counter_buffer().chronicle_writer)
+
     def get_chronicle_query_service(self) -> ChronicleQueryService:
         return ChronicleQueryService(self.chronicle_repo)
@@ -397,6 +397,18 @@ async def startup():
             logger.info("EventBus handlers bootstrap complete")
         except Exception as e:
             logger.error(f"Failed to bootstrap EventBus: {e}")
+
+        # Pooled async ES client for Stage1 recall (closed on shutdown).
+        if (os.getenv("SEARCH_STAGE1_PROVIDER") or "postgres").strip().lower() == "elastic":
+            try:
+                from infra.search.elastic_client import get_elastic_client
+                get_elastic_client()
+            except Exception as e:
+                logger.error(f"Failed to create Elastic client: {e}")
+
+        # Write-behind view counters (flushed periodically and on shutdown).
+        from infra.storage.view_counter_buffer import get_view_counter_buffer
+        get_view_counter_buffer().start()
     else:
         logger.warning("API running in minimal mode - no infrastructure")
 
@@ -404,10 +416,22 @@ async def startup():
 async def shutdown():
     """Shutdown event"""
     logger.info("Wordloom API shutdown")
+    if _infra_available:
+        # Drain queued domain events and flush buffered views while the engine is still up.
+        from infra.event_bus.dispatch_queue import shutdown_event_dispatch_queue
+        await shutdown_event_dispatch_queue()
+
+        from infra.storage.view_counter_buffer import shutdown_view_counter_buffer
+        await shutdown_view_counter_buffer()
+
     # Cleanup database engine
     from api.app.config.database import shutdown_db
     await shutdown_db()
 
+    if _infra_available:
+        from infra.search.elastic_client import shutdown_elastic_client
+        await shutdown_elastic_client()
+
 # ============================================================================
 # Exception Handler
 # ============================================================================
@@ -187,7 +187,7 @@ async def list_blocks(
         # Chronicle: treat first page list as opening the book content.
         if skip == 0 and not include_deleted:
             try:
-                chronicle = di.get_chronicle_recorder_service()
+                chronicle = di.get_view_chronicle_recorder_service()
                 await chronicle.record_book_opened(book_id=book_id, actor_id=actor.user_id)
             except Exception:
                 logger.warning("Chronicle record_book_opened failed", exc_info=True)
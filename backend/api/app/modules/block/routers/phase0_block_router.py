@@ -31,6 +31,7 @@ from api.app.modules.block.domain.block import Block, BlockType
 from api.app.modules.chronicle.application.services import ChronicleRecorderService
 from api.app.modules.chronicle.application.todo_facts import diff_todo_list_facts
 from infra.storage.chronicle_repository_impl import SQLAlchemyChronicleRepository
+from infra.storage.view_counter_buffer import get_view_counter_buffer
 
 logger = logging.getLogger(__name__)
 
@@ -197,10 +198,10 @@ async def list_blocks_phase0(
     )
 
     # Chronicle: treat first page list as opening the book content.
+    # Buffered (write-behind): no chronicle transaction on the read path.
     if page == 1:
         try:
-            chronicle_repo = SQLAlchemyChronicleRepository(session)
-            chronicle = ChronicleRecorderService(chronicle_repo)
+            chronicle = ChronicleRecorderService(get_view_counter_buffer().chronicle_writer)
             await chronicle.record_book_opened(book_id=book_id, actor_id=actor.user_id)
         except Exception:
             pass
@@ -119,8 +119,9 @@ class BookRepositoryImpl(BookRepository):
                 existing.legacy_flag = getattr(book, "legacy_flag", False)
                 existing.manual_maturity_override = getattr(book, "manual_maturity_override", False)
                 existing.manual_maturity_reason = getattr(book, "manual_maturity_reason", None)
-                existing.last_visited_at = getattr(book, "last_visited_at", None)
-                existing.visit_count_90d = getattr(book, "visit_count_90d", 0)
+                # last_visited_at / visit_count_90d are owned by the chronicle projection
+                # (infra/storage/chronicle_activity_rollup.py); writing back the loaded
+                # snapshot would drop visits projected since it was read.
                 existing.block_count = book.block_count
                 existing.soft_deleted_at = book.soft_deleted_at  # ← RULE-012
                 existing.previous_bookshelf_id = getattr(book, "previous_bookshelf_id", None)
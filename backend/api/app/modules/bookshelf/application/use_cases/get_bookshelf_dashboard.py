@@ -7,6 +7,9 @@
 
 该 UseCase 直接使用 AsyncSession 执行聚合查询，返回应用层可用的
 BookshelfDashboardItem 列表，供路由层序列化为 API 输出。
+
+过滤、置顶优先排序与分页在数据库侧完成；书籍统计、Chronicle 活跃度与
+标签只为当前页的书架查询，快照计数由一条单独的聚合查询给出。
 """
 
 from __future__ import annotations
@@ -16,15 +19,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 
-import locale
-
-try:
-    locale.setlocale(locale.LC_COLLATE, "zh_CN.UTF-8")
-except locale.Error:
-    # Fallback to default locale if zh_CN is unavailable
-    locale.setlocale(locale.LC_COLLATE, "")
-
-from sqlalchemy import and_, case, func, select
+from sqlalchemy import and_, case, func, select, true
 from sqlalchemy.sql import Select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -43,7 +38,7 @@ from api.app.modules.library.application.ports.output import ILibraryRepository
 from infra.database.models.book_models import BookModel
 from infra.database.models.bookshelf_models import BookshelfModel
 from infra.database.models.library_models import LibraryModel
-from infra.database.models.chronicle_models import ChronicleEventModel
+from infra.database.models.chronicle_activity_models import ChronicleBookActivityDailyModel
 from infra.database.models.tag_models import (
     TagAssociationModel,
     TagModel,
@@ -133,38 +128,41 @@ class GetBookshelfDashboardUseCase:
     async def execute(self, request: BookshelfDashboardRequest) -> BookshelfDashboardResult:
         await self._enforce_library_owner(request)
 
-        # 1. 拉取基础书架列表（排除 Basement / Deleted）
-        shelves = await self._fetch_bookshelves(request.library_id)
-        if not shelves:
+        now = datetime.now(timezone.utc)
+        # 每个书架的最近活动时间（排序 / 健康度过滤所需的唯一派生列）
+        shelf_activity = self._shelf_activity_subquery(request.library_id)
+        last_activity = shelf_activity.c.last_activity_at
+        filter_clause = self._filter_clause(request.status_filter, last_activity, now)
+
+        # 1. 汇总快照 + 过滤后总数（一次聚合查询，不加载书架行）
+        snapshot, total = await self._fetch_snapshot(request.library_id, shelf_activity, filter_clause, now)
+        if snapshot.total == 0:
             return BookshelfDashboardResult(
                 items=[],
                 total=0,
-                snapshot=BookshelfDashboardSnapshot(),
+                snapshot=snapshot,
             )
 
+        # 2. 过滤 + 置顶优先排序 + 分页（数据库侧完成，只取当前页）
+        shelves = await self._fetch_bookshelves(request, shelf_activity, filter_clause)
+        if not shelves:
+            return BookshelfDashboardResult(items=[], total=total, snapshot=snapshot)
+
         shelf_ids = [model.id for model, _ in shelves]
 
-        # 2. 统计书籍成熟度
+        # 3. 统计书籍成熟度（仅当前页）
         counts_by_shelf = await self._fetch_book_counts(shelf_ids)
 
-        # 3. 统计 Chronicle 活跃度
+        # 4. 统计 Chronicle 活跃度（仅当前页）
         chronicle_stats = await self._fetch_chronicle_stats(
             request.library_id,
             shelf_ids,
         )
 
-        # 4. 拉取标签快照
+        # 5. 拉取标签快照（仅当前页）
         tag_snapshots_by_shelf = await self._fetch_tag_snapshots(shelf_ids)
 
-        now = datetime.now(timezone.utc)
         items: List[BookshelfDashboardItem] = []
-        pinned_total = 0
-        health_totals = {
-            "active": 0,
-            "slowing": 0,
-            "cooling": 0,
-            "archived": 0,
-        }
         for model, library_cover_media_id in shelves:
             counts = counts_by_shelf.get(model.id, BookshelfBookCounts())
             stats = chronicle_stats.get(model.id, {})
@@ -179,12 +177,6 @@ class GetBookshelfDashboardUseCase:
             tag_ids = [snapshot.id for snapshot in tag_snapshots]
             tag_names = [snapshot.name for snapshot in tag_snapshots]
 
-            if model.is_pinned:
-                pinned_total += 1
-            if health not in health_totals:
-                health_totals[health] = 0
-            health_totals[health] += 1
-
             items.append(
                 BookshelfDashboardItem(
                     id=model.id,
@@ -210,28 +202,7 @@ class GetBookshelfDashboardUseCase:
                 )
             )
 
-        # 4. 过滤 + 排序 + 分页（内存层处理，书架数量通常较小）
-        filtered = [item for item in items if self._matches_filter(item, request.status_filter)]
-        total = len(filtered)
-
-        pinned_items = [item for item in filtered if item.is_pinned]
-        regular_items = [item for item in filtered if not item.is_pinned]
-
-        pinned_sorted = self._sort_items(pinned_items, BookshelfDashboardSort.RECENT_ACTIVITY)
-        regular_sorted = self._sort_items(regular_items, request.sort)
-
-        sorted_items = pinned_sorted + regular_sorted
-        start = (request.page - 1) * request.size
-        end = start + request.size
-        paginated = sorted_items[start:end]
-
-        snapshot = BookshelfDashboardSnapshot(
-            total=len(items),
-            pinned=pinned_total,
-            health_counts=BookshelfHealthCounts(**health_totals),
-        )
-
-        return BookshelfDashboardResult(items=paginated, total=total, snapshot=snapshot)
+        return BookshelfDashboardResult(items=items, total=total, snapshot=snapshot)
 
     async def _enforce_library_owner(self, request: BookshelfDashboardRequest) -> None:
         if not request.enforce_owner_check or request.actor_user_id is None:
@@ -292,20 +263,149 @@ class GetBookshelfDashboardUseCase:
             snapshots.setdefault(bookshelf_id, []).append(snapshot)
         return snapshots
 
-    async def _fetch_bookshelves(self, library_id: UUID) -> List[Tuple[BookshelfModel, Optional[UUID]]]:
+    @staticmethod
+    def _visible_shelf_clause(library_id: UUID):
+        return and_(
+            BookshelfModel.library_id == library_id,
+            BookshelfModel.status != BookshelfStatus.DELETED.value,
+            BookshelfModel.is_basement.is_(False),
+        )
+
+    @staticmethod
+    def _shelf_activity_subquery(library_id: UUID):
+        """bookshelf_id → 最近活动时间（每本书只读最新一个日桶）。"""
+        daily = ChronicleBookActivityDailyModel
+        latest = (
+            select(daily.last_activity_at)
+            .where(daily.book_id == BookModel.id)
+            .order_by(daily.day.desc())
+            .limit(1)
+            .lateral("latest_activity")
+        )
+        return (
+            select(
+                BookModel.bookshelf_id.label("bookshelf_id"),
+                func.max(latest.c.last_activity_at).label("last_activity_at"),
+            )
+            .select_from(BookModel)
+            .join(latest, true())
+            .where(BookModel.library_id == library_id)
+            .group_by(BookModel.bookshelf_id)
+            .subquery("shelf_activity")
+        )
+
+    def _health_expr(self, last_activity, now: datetime):
+        """与 _compute_health 相同的规则，数据库侧版本。"""
+        return case(
+            (BookshelfModel.status == BookshelfStatus.ARCHIVED.value, "archived"),
+            (last_activity.is_(None), "cooling"),
+            (last_activity >= now - timedelta(days=self.HEALTH_ACTIVE_THRESHOLD_DAYS), "active"),
+            (last_activity >= now - timedelta(days=self.HEALTH_SLOWING_THRESHOLD_DAYS), "slowing"),
+            else_="cooling",
+        )
+
+    def _filter_clause(self, status_filter: BookshelfDashboardFilter, last_activity, now: datetime):
+        if status_filter == BookshelfDashboardFilter.ACTIVE:
+            return BookshelfModel.status == BookshelfStatus.ACTIVE.value
+        if status_filter == BookshelfDashboardFilter.ARCHIVED:
+            return BookshelfModel.status == BookshelfStatus.ARCHIVED.value
+        if status_filter == BookshelfDashboardFilter.PINNED:
+            return BookshelfModel.is_pinned.is_(True)
+        if status_filter == BookshelfDashboardFilter.STALE:
+            return self._health_expr(last_activity, now).in_(["cooling", "archived"])
+        return true()
+
+    @staticmethod
+    def _sort_keys(sort: BookshelfDashboardSort, last_activity, book_totals) -> list:
+        recent = func.coalesce(last_activity, BookshelfModel.updated_at, BookshelfModel.created_at)
+        if sort == BookshelfDashboardSort.NAME_ASC:
+            keys = [func.lower(func.coalesce(BookshelfModel.name, "")).asc()]
+        elif sort == BookshelfDashboardSort.CREATED_DESC:
+            keys = [BookshelfModel.created_at.desc().nulls_last()]
+        elif sort == BookshelfDashboardSort.BOOK_COUNT_DESC:
+            keys = [
+                func.coalesce(book_totals.c.total, 0).desc(),
+                func.coalesce(last_activity, BookshelfModel.updated_at).desc().nulls_last(),
+            ]
+        else:
+            # Default: recent activity (DESC, None last)
+            keys = [recent.desc().nulls_last()]
+        # 置顶书架在前，且固定按最近活动排序；其余按请求的排序键
+        return [
+            BookshelfModel.is_pinned.desc(),
+            case((BookshelfModel.is_pinned.is_(True), recent)).desc().nulls_last(),
+            *keys,
+            BookshelfModel.id.asc(),
+        ]
+
+    async def _fetch_snapshot(
+        self,
+        library_id: UUID,
+        shelf_activity,
+        filter_clause,
+        now: datetime,
+    ) -> Tuple[BookshelfDashboardSnapshot, int]:
+        health = self._health_expr(shelf_activity.c.last_activity_at, now)
+        stmt: Select = (
+            select(
+                func.count().label("total"),
+                func.count().filter(BookshelfModel.is_pinned.is_(True)).label("pinned"),
+                func.count().filter(health == "active").label("active"),
+                func.count().filter(health == "slowing").label("slowing"),
+                func.count().filter(health == "cooling").label("cooling"),
+                func.count().filter(health == "archived").label("archived"),
+                func.count().filter(filter_clause).label("filtered"),
+            )
+            .select_from(BookshelfModel)
+            .outerjoin(shelf_activity, shelf_activity.c.bookshelf_id == BookshelfModel.id)
+            .where(self._visible_shelf_clause(library_id))
+        )
+        row = (await self.session.execute(stmt)).one()
+        snapshot = BookshelfDashboardSnapshot(
+            total=int(row.total or 0),
+            pinned=int(row.pinned or 0),
+            health_counts=BookshelfHealthCounts(
+                active=int(row.active or 0),
+                slowing=int(row.slowing or 0),
+                cooling=int(row.cooling or 0),
+                archived=int(row.archived or 0),
+            ),
+        )
+        return snapshot, int(row.filtered or 0)
+
+    async def _fetch_bookshelves(
+        self,
+        request: BookshelfDashboardRequest,
+        shelf_activity,
+        filter_clause,
+    ) -> List[Tuple[BookshelfModel, Optional[UUID]]]:
+        book_totals = None
+        if request.sort == BookshelfDashboardSort.BOOK_COUNT_DESC:
+            book_totals = (
+                select(BookModel.bookshelf_id.label("bookshelf_id"), func.count().label("total"))
+                .where(
+                    BookModel.library_id == request.library_id,
+                    BookModel.soft_deleted_at.is_(None),
+                )
+                .group_by(BookModel.bookshelf_id)
+                .subquery("book_totals")
+            )
+
         stmt: Select = (
             select(
                 BookshelfModel,
                 LibraryModel.cover_media_id.label("library_cover_media_id"),
             )
             .join(LibraryModel, LibraryModel.id == BookshelfModel.library_id)
-            .where(
-                and_(
-                    BookshelfModel.library_id == library_id,
-                    BookshelfModel.status != BookshelfStatus.DELETED.value,
-                    BookshelfModel.is_basement.is_(False),
-                )
-            )
+            .outerjoin(shelf_activity, shelf_activity.c.bookshelf_id == BookshelfModel.id)
+            .where(self._visible_shelf_clause(request.library_id), filter_clause)
+        )
+        if book_totals is not None:
+            stmt = stmt.outerjoin(book_totals, book_totals.c.bookshelf_id == BookshelfModel.id)
+        stmt = (
+            stmt.order_by(*self._sort_keys(request.sort, shelf_activity.c.last_activity_at, book_totals))
+            .offset((request.page - 1) * request.size)
+            .limit(request.size)
         )
         result = await self.session.execute(stmt)
         rows = result.all()
@@ -350,41 +450,43 @@ class GetBookshelfDashboardUseCase:
         library_id: UUID,
         shelf_ids: List[UUID],
     ) -> Dict[UUID, Dict[str, Optional[int]]]:
+        """Chronicle 活跃度，读取每日汇总表 chronicle_book_activity_daily。
+
+        每本书只读取窗口内的日桶 + 最新一个日桶，成本与历史长度无关。
+        7 天窗口按 UTC 自然日对齐（包含 7 天前当天的整日）。
+        """
         if not shelf_ids:
             return {}
 
-        seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
+        window_start_day = (datetime.now(timezone.utc) - timedelta(days=7)).date()
+        daily = ChronicleBookActivityDailyModel
+
+        latest = (
+            select(daily.last_activity_at)
+            .where(daily.book_id == BookModel.id)
+            .order_by(daily.day.desc())
+            .limit(1)
+            .lateral("latest_activity")
+        )
+        window = (
+            select(
+                func.coalesce(func.sum(daily.edits), 0).label("edits"),
+                func.coalesce(func.sum(daily.views), 0).label("views"),
+            )
+            .where(daily.book_id == BookModel.id, daily.day >= window_start_day)
+            .lateral("window_activity")
+        )
 
         stmt: Select = (
             select(
                 BookModel.bookshelf_id,
-                func.max(ChronicleEventModel.occurred_at).label("last_activity_at"),
-                func.sum(
-                    case(
-                        (
-                            and_(
-                                ChronicleEventModel.occurred_at >= seven_days_ago,
-                                ChronicleEventModel.event_type != "book_opened",
-                            ),
-                            1,
-                        ),
-                        else_=0,
-                    )
-                ).label("edits_last_7d"),
-                func.sum(
-                    case(
-                        (
-                            and_(
-                                ChronicleEventModel.occurred_at >= seven_days_ago,
-                                ChronicleEventModel.event_type == "book_opened",
-                            ),
-                            1,
-                        ),
-                        else_=0,
-                    )
-                ).label("views_last_7d"),
+                func.max(latest.c.last_activity_at).label("last_activity_at"),
+                func.sum(window.c.edits).label("edits_last_7d"),
+                func.sum(window.c.views).label("views_last_7d"),
             )
-            .join(BookModel, ChronicleEventModel.book_id == BookModel.id)
+            .select_from(BookModel)
+            .join(latest, true())
+            .join(window, true())
             .where(
                 and_(
                     BookModel.bookshelf_id.in_(shelf_ids),
@@ -430,55 +532,3 @@ class GetBookshelfDashboardUseCase:
         if days <= self.HEALTH_SLOWING_THRESHOLD_DAYS:
             return "slowing"
         return "cooling"
-
-    def _matches_filter(
-        self,
-        item: BookshelfDashboardItem,
-        status_filter: BookshelfDashboardFilter,
-    ) -> bool:
-        if status_filter == BookshelfDashboardFilter.ALL:
-            return True
-        if status_filter == BookshelfDashboardFilter.ACTIVE:
-            return item.status == BookshelfStatus.ACTIVE.value
-        if status_filter == BookshelfDashboardFilter.ARCHIVED:
-            return item.status == BookshelfStatus.ARCHIVED.value
-        if status_filter == BookshelfDashboardFilter.PINNED:
-            return item.is_pinned
-        if status_filter == BookshelfDashboardFilter.STALE:
-            return item.health in {"cooling", "archived"}
-        return True
-
-    def _sort_items(
-        self,
-        items: List[BookshelfDashboardItem],
-        sort: BookshelfDashboardSort,
-    ) -> List[BookshelfDashboardItem]:
-        if not items:
-            return items
-
-        if sort == BookshelfDashboardSort.NAME_ASC:
-            return sorted(
-                items,
-                key=lambda i: locale.strxfrm((i.name or "").casefold()),
-            )
-        if sort == BookshelfDashboardSort.CREATED_DESC:
-            return sorted(
-                items,
-                key=lambda i: i.created_at or datetime.min.replace(tzinfo=timezone.utc),
-                reverse=True,
-            )
-        if sort == BookshelfDashboardSort.BOOK_COUNT_DESC:
-            return sorted(
-                items,
-                key=lambda i: (
-                    i.book_counts.total,
-                    i.last_activity_at or i.updated_at or datetime.min.replace(tzinfo=timezone.utc),
-                ),
-                reverse=True,
-            )
-        # Default: recent activity (DESC, None last)
-        return sorted(
-            items,
-            key=lambda i: i.last_activity_at or i.updated_at or i.created_at or datetime.min.replace(tzinfo=timezone.utc),
-            reverse=True,
-        )
\ No newline at end of file
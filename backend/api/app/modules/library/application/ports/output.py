@@ -19,7 +19,7 @@ Cross-Reference:
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from uuid import UUID
 from enum import Enum
 
@@ -343,6 +343,29 @@ class ILibraryTagAssociationRepository(ABC):
         pass
 
 
+# ============================================================================
+# Output Port: ILibraryViewCounter
+# ============================================================================
+
+class ILibraryViewCounter(ABC):
+    """
+    Counter Port - write-behind view counting for Libraries
+
+    Views only ever add to `views_count` / `last_viewed_at`, so they are
+    buffered in-process and persisted in periodic set-based flushes instead of
+    a load + save per view.
+    """
+
+    @abstractmethod
+    def record_view(self, library_id: UUID, occurred_at: Optional[datetime] = None) -> Tuple[int, datetime]:
+        """Count one view.
+
+        Returns:
+            (views of this Library not yet persisted, latest buffered view time)
+        """
+        pass
+
+
 # ============================================================================
 # Module Exports
 # ============================================================================
@@ -352,6 +375,7 @@ __all__ = [
     "IBookRepository",
     "IBookshelfRepository",
     "ILibraryTagAssociationRepository",
+    "ILibraryViewCounter",
     "LibraryTagAssociationDTO",
     "LibrarySort",
 ]
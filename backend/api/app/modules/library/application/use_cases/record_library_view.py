@@ -1,4 +1,4 @@
-"""RecordLibraryView UseCase - persist view counters immediately."""
+"""RecordLibraryView UseCase - count views through the write-behind view counter."""
 
 import logging
 
@@ -7,17 +7,22 @@ from api.app.modules.library.application.ports.input import (
     RecordLibraryViewResponse,
     IRecordLibraryViewUseCase,
 )
-from api.app.modules.library.application.ports.output import ILibraryRepository
+from api.app.modules.library.application.ports.output import ILibraryRepository, ILibraryViewCounter
 from api.app.modules.library.exceptions import LibraryNotFoundError
 
 logger = logging.getLogger(__name__)
 
 
 class RecordLibraryViewUseCase(IRecordLibraryViewUseCase):
-    """Increment the view counter and persist last viewed timestamp."""
+    """Count a view; the counter flushes `views_count` / `last_viewed_at` in batches.
 
-    def __init__(self, repository: ILibraryRepository):
+    The Library is only read (existence check + response payload): no aggregate
+    save and no write transaction per view.
+    """
+
+    def __init__(self, repository: ILibraryRepository, view_counter: ILibraryViewCounter):
         self.repository = repository
+        self.view_counter = view_counter
 
     async def execute(self, request: RecordLibraryViewRequest) -> RecordLibraryViewResponse:
         logger.debug("Recording library view", extra={"library_id": str(request.library_id)})
@@ -25,8 +30,7 @@ class RecordLibraryViewUseCase(IRecordLibraryViewUseCase):
         if not library:
             raise LibraryNotFoundError(str(request.library_id))
 
-        library.record_view()
-        await self.repository.save(library)
+        pending_views, last_viewed_at = self.view_counter.record_view(library.id)
 
         return RecordLibraryViewResponse(
             library_id=library.id,
@@ -41,7 +45,8 @@ class RecordLibraryViewUseCase(IRecordLibraryViewUseCase):
             pinned_order=library.pinned_order,
             archived_at=library.archived_at,
             last_activity_at=library.last_activity_at,
-            views_count=library.views_count,
-            last_viewed_at=library.last_viewed_at,
+            # Persisted count plus this process's not-yet-flushed views.
+            views_count=library.views_count + pending_views,
+            last_viewed_at=last_viewed_at,
             theme_color=getattr(library, "theme_color", None),
         )
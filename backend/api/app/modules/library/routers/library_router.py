@@ -37,6 +37,7 @@ from api.app.modules.library.application.ports.output import LibrarySort
 
 # Infrastructure imports
 from infra.storage.library_repository_impl import SQLAlchemyLibraryRepository
+from infra.storage.view_counter_buffer import get_view_counter_buffer
 from infra.storage.bookshelf_repository_impl import SQLAlchemyBookshelfRepository
 from infra.storage.library_tag_association_repository_impl import (
     SQLAlchemyLibraryTagAssociationRepository,
@@ -310,7 +311,10 @@ async def get_record_library_view_usecase(
     session: AsyncSession = Depends(get_db_session),
 ) -> tuple[RecordLibraryViewUseCase, AsyncSession]:
     repository = SQLAlchemyLibraryRepository(session)
-    return RecordLibraryViewUseCase(repository=repository), session
+    return RecordLibraryViewUseCase(
+        repository=repository,
+        view_counter=get_view_counter_buffer().library_views,
+    ), session
 
 
 async def get_list_library_tags_usecase(
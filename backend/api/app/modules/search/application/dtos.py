@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from typing import List, Optional
 from uuid import UUID
 
+from api.app.modules.search.domain import SearchResult
+
 
 @dataclass(frozen=True, slots=True)
 class BlockSearchHit:
@@ -20,6 +22,18 @@ class BlockSearchHit:
     score: Optional[float] = None
 
 
+@dataclass(frozen=True, slots=True)
+class FederatedSearchPage:
+    """One page of federated (cross-type) search.
+
+    next_cursor is an opaque keyset token; None means this is the last page.
+    """
+
+    result: SearchResult
+    next_cursor: Optional[str] = None
+
+
 __all__ = [
     "BlockSearchHit",
+    "FederatedSearchPage",
 ]
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+from itertools import islice
+from typing import Any, Callable, List, Optional, Protocol, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.app.modules.search.application.dtos import FederatedSearchPage
+from api.app.modules.search.domain import SearchCursor, SearchHit, SearchQuery, SearchResult
+
+
+DEFAULT_FEDERATED_ENTITY_TYPES: tuple[str, ...] = ("block", "book")
+
+
+class EntityTypePageSource(Protocol):
+    async def search_entity_type_page(
+        self,
+        query: SearchQuery,
+        entity_type: str,
+        *,
+        fetch_limit: int,
+        after: Optional[SearchCursor] = None,
+    ) -> tuple:
+        ...
+
+
+def _merge_key(hit: SearchHit) -> tuple:
+    # Must match the per-type SQL ordering: (score DESC, entity_type, entity_id).
+    return (-hit.score, hit.entity_type.value, hit.entity_id)
+
+
+class FederatedSearchService:
+    """Global search across entity types (search-only workflow).
+
+    - Runs one ranked query per entity type concurrently, each on its own
+      session (AsyncSession is not safe for concurrent use).
+    - Merges the per-type sorted streams with a k-way top-N merge on the
+      normalized score.
+    - Paginates by keyset cursor (score, entity_type, entity_id); `offset`
+      is still honoured when no cursor is given.
+    - Each per-type query returns hits + capped total in one round-trip; the
+      total is computed on the first page and carried in the cursor.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        source_factory: Callable[[AsyncSession], EntityTypePageSource],
+        entity_types: Sequence[str] = DEFAULT_FEDERATED_ENTITY_TYPES,
+    ):
+        self._session_factory = session_factory
+        self._source_factory = source_factory
+        self._entity_types = tuple(entity_types)
+
+    async def _fetch(
+        self,
+        query: SearchQuery,
+        entity_type: str,
+        *,
+        fetch_limit: int,
+        after: Optional[SearchCursor],
+    ) -> tuple:
+        async with self._session_factory() as session:
+            source = self._source_factory(session)
+            return await source.search_entity_type_page(
+                query,
+                entity_type,
+                fetch_limit=fetch_limit,
+                after=after,
+            )
+
+    async def search(self, query: SearchQuery, *, cursor: Optional[str] = None) -> FederatedSearchPage:
+        after = SearchCursor.decode(cursor, query) if cursor else None
+        skip = 0 if after is not None else query.offset
+
+        # +1 per type is enough to know whether another page exists globally.
+        fetch_limit = skip + query.limit + 1
+
+        pages = await asyncio.gather(
+            *(
+                self._fetch(query, entity_type, fetch_limit=fetch_limit, after=after)
+                for entity_type in self._entity_types
+            )
+        )
+
+        if after is not None:
+            total, total_capped = after.total, after.total_capped
+        else:
+            total = sum(int(count or 0) for count, _, _ in pages)
+            total_capped = any(capped for _, _, capped in pages)
+
+        merged = heapq.merge(*(hits for _, hits, _ in pages), key=_merge_key)
+        window: List[SearchHit] = list(islice(merged, skip, skip + query.limit + 1))
+
+        hits = window[: query.limit]
+        result = SearchResult(total=total, hits=hits, query=query, total_capped=total_capped)
+
+        next_cursor = None
+        if len(window) > query.limit and hits:
+            next_cursor = SearchCursor.after(hits[-1], result).encode()
+
+        return FederatedSearchPage(result=result, next_cursor=next_cursor)
+
+
+__all__ = [
+    "DEFAULT_FEDERATED_ENTITY_TYPES",
+    "EntityTypePageSource",
+    "FederatedSearchService",
+]
@@ -5,12 +5,17 @@ change the existing global search contract.
 
 Stage1 responsibility: cheap recall of candidate entity IDs.
 Stage2 responsibility: strict business joins/filters in Postgres.
+
+Providers return candidates ordered by (order_key DESC, entity_id DESC); the
+`after` cursor continues that order so Stage2 can ask for more when it
+filtered too many out. `scope` is pushed down into recall where the engine
+can apply it; Stage2 still enforces it.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional, Protocol
+from typing import Optional, Protocol, Tuple
 from uuid import UUID
 
 
@@ -22,17 +27,51 @@ class Candidate:
     score: Optional[float] = None
 
 
+@dataclass(frozen=True)
+class CandidateScope:
+    """Recall filters applied inside the Stage1 engine (FTS / Elastic)."""
+
+    library_id: Optional[UUID] = None
+    book_id: Optional[UUID] = None
+    entity_types: Tuple[str, ...] = ("block",)
+
+    @property
+    def kind(self) -> str:
+        """Low-cardinality label for the scope shape (metrics / adaptive stats)."""
+        if self.book_id is not None:
+            return "book"
+        if self.library_id is not None:
+            return "library"
+        return "global"
+
+
+@dataclass(frozen=True)
+class CandidateCursor:
+    """Keyset position: return candidates strictly after this one."""
+
+    order_key: int
+    entity_id: UUID
+
+    @classmethod
+    def after(cls, candidate: Candidate) -> "CandidateCursor":
+        return cls(order_key=candidate.order_key, entity_id=candidate.entity_id)
+
+
 class CandidateProvider(Protocol):
     async def get_block_candidates(
         self,
         *,
         q: str,
         candidate_limit: int,
+        scope: Optional[CandidateScope] = None,
+        after: Optional[CandidateCursor] = None,
     ) -> list[Candidate]:
         ...
 
 
 __all__ = [
     "Candidate",
+    "CandidateCursor",
     "CandidateProvider",
+    "CandidateScope",
 ]
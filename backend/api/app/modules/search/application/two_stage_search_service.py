@@ -1,13 +1,64 @@
 from __future__ import annotations
 
-from typing import List
+import math
+from dataclasses import replace
+from typing import Dict, List, Optional
 from uuid import UUID
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.app.modules.search.application.dtos import BlockSearchHit
-from api.app.modules.search.application.ports.candidate_provider import CandidateProvider
+from api.app.modules.search.application.ports.candidate_provider import (
+    Candidate,
+    CandidateCursor,
+    CandidateProvider,
+    CandidateScope,
+)
+
+
+# Adaptive candidate_limit bounds (keep worst-case latency bounded).
+ADAPTIVE_MIN_CANDIDATE_LIMIT = 50
+ADAPTIVE_MAX_CANDIDATE_LIMIT = 2000
+ADAPTIVE_MAX_ROUNDS = 3
+ADAPTIVE_HEADROOM = 1.5
+
+HEADLINE_OPTIONS = "MaxFragments=2,MinWords=3,MaxWords=15,ShortWord=3,HighlightAll=FALSE"
+
+
+class Stage2SurvivalStats:
+    """Learned Stage2 survival ratio (hits / candidates), per scope kind.
+
+    EWMA keyed by CandidateScope.kind ("global" | "library" | "book") so the
+    table stays tiny; concrete scope ids would be unbounded.
+    """
+
+    def __init__(self, *, alpha: float = 0.2, initial_ratio: float = 1.0, floor: float = 0.02):
+        self._alpha = alpha
+        self._initial_ratio = initial_ratio
+        self._floor = floor
+        self._ratios: Dict[str, float] = {}
+
+    def ratio(self, kind: str) -> float:
+        return self._ratios.get(kind, self._initial_ratio)
+
+    def observe(self, kind: str, *, candidates: int, survivors: int) -> None:
+        if candidates <= 0:
+            return
+        sample = max(self._floor, survivors / candidates)
+        previous = self._ratios.get(kind)
+        if previous is None:
+            self._ratios[kind] = sample
+        else:
+            self._ratios[kind] = (1 - self._alpha) * previous + self._alpha * sample
+
+    def candidate_limit(self, kind: str, needed: int, *, minimum: int, maximum: int) -> int:
+        wanted = math.ceil(needed * ADAPTIVE_HEADROOM / max(self._floor, self.ratio(kind)))
+        return max(minimum, min(maximum, wanted))
+
+
+# Process-wide default; survives across requests so the ratio is actually learned.
+_default_survival_stats = Stage2SurvivalStats()
 
 
 class TwoStageSearchService:
@@ -16,13 +67,36 @@ class TwoStageSearchService:
     Stage1: candidate recall from CandidateProvider (Postgres FTS now, Elastic later).
     Stage2: strict business filter/joins in Postgres (blocks + tags).
 
+    Scope (library_id/book_id) is pushed down into Stage1 and re-checked in Stage2.
+
+    Highlighting: hits without a Stage1 snippet (Postgres FTS recall) get one
+    batched ts_headline pass over the final page only, so snippet cost scales
+    with `limit`, not with the candidate pool.
+
+    Adaptive mode (candidate_limit=None): Stage1 is sized from the learned
+    Stage2 survival ratio, and refilled through a keyset cursor until `limit`
+    hits survive, Stage1 is exhausted, or ADAPTIVE_MAX_ROUNDS is reached.
+
     This service is intentionally separate from the existing SearchPort / usecase
     to avoid contract changes.
     """
 
-    def __init__(self, session: AsyncSession, candidate_provider: CandidateProvider):
+    def __init__(
+        self,
+        session: AsyncSession,
+        candidate_provider: CandidateProvider,
+        survival_stats: Optional[Stage2SurvivalStats] = None,
+        *,
+        min_candidate_limit: int = ADAPTIVE_MIN_CANDIDATE_LIMIT,
+        max_candidate_limit: int = ADAPTIVE_MAX_CANDIDATE_LIMIT,
+        max_rounds: int = ADAPTIVE_MAX_ROUNDS,
+    ):
         self._session = session
         self._candidate_provider = candidate_provider
+        self._survival_stats = survival_stats or _default_survival_stats
+        self._min_candidate_limit = min_candidate_limit
+        self._max_candidate_limit = max_candidate_limit
+        self._max_rounds = max_rounds
 
     async def search_block_hits(
         self,
@@ -30,14 +104,59 @@ class TwoStageSearchService:
         q: str,
         book_id: UUID | None,
         limit: int,
-        candidate_limit: int,
+        candidate_limit: Optional[int],
+        library_id: UUID | None = None,
     ) -> List[BlockSearchHit]:
-        candidates = await self._candidate_provider.get_block_candidates(
-            q=q, candidate_limit=candidate_limit
-        )
-        if not candidates:
-            return []
+        scope = CandidateScope(library_id=library_id, book_id=book_id)
+
+        if candidate_limit is not None:
+            candidates = await self._candidate_provider.get_block_candidates(
+                q=q, candidate_limit=candidate_limit, scope=scope
+            )
+            if not candidates:
+                return []
+            hits = await self._filter_candidates(
+                candidates, book_id=book_id, library_id=library_id, limit=limit
+            )
+            return await self._highlight_hits(q, hits)
+
+        hits: List[BlockSearchHit] = []
+        after: Optional[CandidateCursor] = None
+        for _ in range(self._max_rounds):
+            needed = limit - len(hits)
+            batch_limit = self._survival_stats.candidate_limit(
+                scope.kind,
+                needed,
+                minimum=self._min_candidate_limit,
+                maximum=self._max_candidate_limit,
+            )
+            candidates = await self._candidate_provider.get_block_candidates(
+                q=q, candidate_limit=batch_limit, scope=scope, after=after
+            )
+            if not candidates:
+                break
+
+            # No LIMIT on the batch so the survival sample is not truncated.
+            survivors = await self._filter_candidates(
+                candidates, book_id=book_id, library_id=library_id, limit=len(candidates)
+            )
+            self._survival_stats.observe(scope.kind, candidates=len(candidates), survivors=len(survivors))
+
+            hits.extend(survivors[:needed])
+            if len(hits) >= limit or len(candidates) < batch_limit:
+                break
+            after = CandidateCursor.after(candidates[-1])
+
+        return await self._highlight_hits(q, hits)
 
+    async def _filter_candidates(
+        self,
+        candidates: List[Candidate],
+        *,
+        book_id: UUID | None,
+        limit: int,
+        library_id: UUID | None = None,
+    ) -> List[BlockSearchHit]:
         # Stage2: join blocks + tag_associations + tags with business filters.
         # Feed candidates through unnest arrays to avoid dynamic SQL.
         block_ids = [c.entity_id for c in candidates]
@@ -58,7 +177,7 @@ class TwoStageSearchService:
             )
             SELECT
                 c.block_id AS id,
-                COALESCE(NULLIF(c.snippet, ''), LEFT(b.content, 200)) AS snippet,
+                NULLIF(c.snippet, '') AS snippet,
                 c.score AS score,
                 array_remove(array_agg(DISTINCT t.name), NULL) AS tags
             FROM candidate_blocks c
@@ -70,8 +189,17 @@ class TwoStageSearchService:
                 ON t.id = ta.tag_id AND t.deleted_at IS NULL
             WHERE b.soft_deleted_at IS NULL
                 AND (:book_id IS NULL OR b.book_id = CAST(:book_id AS uuid))
-            GROUP BY c.block_id, c.snippet, c.score, c.order_key, b.content
-            ORDER BY c.order_key DESC
+                AND (
+                    :library_id IS NULL
+                    OR EXISTS (
+                        SELECT 1
+                        FROM books bk
+                        WHERE bk.id = b.book_id
+                            AND bk.library_id = CAST(:library_id AS uuid)
+                    )
+                )
+            GROUP BY c.block_id, c.snippet, c.score, c.order_key
+            ORDER BY c.order_key DESC, c.block_id DESC
             LIMIT :limit
             """
         )
@@ -85,6 +213,7 @@ class TwoStageSearchService:
                     "scores": scores,
                     "order_keys": order_keys,
                     "book_id": book_id,
+                    "library_id": library_id,
                     "limit": limit,
                 },
             )
@@ -103,5 +232,43 @@ class TwoStageSearchService:
             )
         return hits
 
+    async def _highlight_hits(self, q: str, hits: List[BlockSearchHit]) -> List[BlockSearchHit]:
+        """Fill missing snippets for the surviving page in one round-trip.
+
+        ts_headline over the stored search_index text; falls back to the block
+        content preview when the projection row is missing or nothing matched.
+        """
+        missing = [h.id for h in hits if not h.snippet]
+        if not missing:
+            return hits
+
+        sql = text(
+            """
+            SELECT
+                h.id AS id,
+                COALESCE(
+                    NULLIF(
+                        ts_headline('english', si.text, plainto_tsquery('english', :q), :options),
+                        ''
+                    ),
+                    LEFT(b.content, 200)
+                ) AS snippet
+            FROM unnest(CAST(:ids AS uuid[])) AS h(id)
+            JOIN blocks b
+                ON b.id = h.id
+            LEFT JOIN search_index si
+                ON si.entity_type = 'block' AND si.entity_id = h.id
+            """
+        )
+        rows = (
+            await self._session.execute(sql, {"ids": missing, "q": q, "options": HEADLINE_OPTIONS})
+        ).mappings().all()
+        snippets = {row["id"]: row["snippet"] for row in rows}
+
+        return [
+            h if h.snippet else replace(h, snippet=snippets.get(h.id))
+            for h in hits
+        ]
+
 
-__all__ = ["TwoStageSearchService"]
+__all__ = ["Stage2SurvivalStats", "TwoStageSearchService"]
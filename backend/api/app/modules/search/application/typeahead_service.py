@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+TYPEAHEAD_ENTITY_TYPES: tuple[str, ...] = ("tag", "library", "book")
+
+
+@dataclass(frozen=True, slots=True)
+class Suggestion:
+    """Search-only typeahead DTO."""
+
+    entity_type: str
+    entity_id: UUID
+    label: str
+    score: float
+
+
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# One branch per entity type. Each branch is index-driven by a pg_trgm GIN
+# index (migration 8e1d6c2b4a97) and limited on its own before the merge.
+# Every branch is scoped to the caller's own tags / libraries.
+_BRANCHES: dict[str, str] = {
+    "tag": """
+        SELECT 'tag' AS entity_type, t.id AS entity_id, t.name AS label,
+               (lower(t.name) LIKE :prefix) AS is_prefix,
+               similarity(lower(t.name), :kw) AS sim,
+               t.usage_count AS popularity
+        FROM tags t
+        WHERE t.deleted_at IS NULL
+          AND t.user_id = :user_id
+          AND lower(t.name) LIKE :contains
+        ORDER BY is_prefix DESC, sim DESC, popularity DESC
+        LIMIT :k
+    """,
+    "library": """
+        SELECT 'library' AS entity_type, l.id AS entity_id, l.name AS label,
+               (l.name ILIKE :prefix) AS is_prefix,
+               similarity(lower(l.name), :kw) AS sim,
+               l.views_count AS popularity
+        FROM libraries l
+        WHERE l.soft_deleted_at IS NULL
+          AND l.user_id = :user_id
+          AND l.name ILIKE :contains
+        ORDER BY is_prefix DESC, sim DESC, popularity DESC
+        LIMIT :k
+    """,
+    "book": """
+        SELECT 'book' AS entity_type, b.id AS entity_id, b.title AS label,
+               (b.title ILIKE :prefix) AS is_prefix,
+               similarity(lower(b.title), :kw) AS sim,
+               b.visit_count_90d AS popularity
+        FROM books b
+        WHERE b.soft_deleted_at IS NULL
+          AND b.title ILIKE :contains
+          AND (CAST(:library_id AS uuid) IS NULL OR b.library_id = CAST(:library_id AS uuid))
+          AND EXISTS (SELECT 1 FROM libraries l WHERE l.id = b.library_id AND l.user_id = :user_id)
+        ORDER BY is_prefix DESC, sim DESC, popularity DESC
+        LIMIT :k
+    """,
+}
+
+
+class TypeaheadService:
+    """Search-as-you-type suggestions for tags, library names and book titles.
+
+    - Matches partial input anywhere in the name (LIKE '%kw%'), served by
+      trigram GIN indexes instead of sequential scans.
+    - Ranks prefix matches first, then trigram similarity, then popularity.
+    - Reads the source tables directly, so suggestions are current as soon as
+      the write commits (no projection lag, no in-process state to sync).
+    - All requested types are answered in one round-trip (UNION ALL).
+    - Only the caller's own tags, libraries and books are suggested.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def suggest(
+        self,
+        q: str,
+        *,
+        user_id: UUID,
+        entity_types: Optional[Sequence[str]] = None,
+        library_id: Optional[UUID] = None,
+        limit: int = 10,
+    ) -> List[Suggestion]:
+        kw = " ".join(q.split()).lower()
+        if not kw:
+            return []
+
+        types = [t for t in (entity_types or TYPEAHEAD_ENTITY_TYPES) if t in _BRANCHES]
+        if not types:
+            raise ValueError(f"Unsupported typeahead entity types: {list(entity_types or [])}")
+
+        escaped = _like_escape(kw)
+        sql = text(
+            "SELECT entity_type, entity_id, label, is_prefix, sim FROM ("
+            + " UNION ALL ".join(f"({_BRANCHES[t]})" for t in types)
+            + ") s ORDER BY is_prefix DESC, sim DESC, popularity DESC NULLS LAST, label LIMIT :k"
+        )
+        rows = (
+            await self._session.execute(
+                sql,
+                {
+                    "kw": kw,
+                    "prefix": f"{escaped}%",
+                    "contains": f"%{escaped}%",
+                    "library_id": library_id,
+                    "user_id": user_id,
+                    "k": limit,
+                },
+            )
+        ).mappings().all()
+
+        return [
+            Suggestion(
+                entity_type=row["entity_type"],
+                entity_id=row["entity_id"],
+                label=row["label"],
+                # Prefix hits outrank any similarity-only hit.
+                score=(1.0 if row["is_prefix"] else 0.0) + float(row["sim"] or 0.0),
+            )
+            for row in rows
+        ]
+
+
+__all__ = ["Suggestion", "TYPEAHEAD_ENTITY_TYPES", "TypeaheadService"]
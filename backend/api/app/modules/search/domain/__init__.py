@@ -5,7 +5,7 @@ Follows Media module pattern: enums.py, search.py, exceptions.py, events.py
 """
 
 from .enums import SearchEntityType, SearchMediaType
-from .search import SearchQuery, SearchHit, SearchResult
+from .search import SearchQuery, SearchHit, SearchResult, SearchCursor
 from .exceptions import (
     SearchDomainException,
     InvalidQueryError,
@@ -23,6 +23,7 @@ __all__ = [
     "SearchQuery",
     "SearchHit",
     "SearchResult",
+    "SearchCursor",
     # Exceptions
     "SearchDomainException",
     "InvalidQueryError",
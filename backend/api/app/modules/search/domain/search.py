@@ -7,11 +7,16 @@ Domain model philosophy:
 - SearchQuery: ValueObject (immutable search parameters)
 - SearchHit: ValueObject (immutable search result)
 - SearchResult: ValueObject (immutable result set)
+- SearchCursor: ValueObject (opaque keyset position for federated pagination)
 - No AggregateRoot: Search is a query adapter, not a managed entity
 
 All domain logic and invariants implemented in __post_init__ validation.
 """
 
+import base64
+import hashlib
+import json
+import math
 from dataclasses import dataclass, field
 from typing import Optional, List
 from uuid import UUID
@@ -98,10 +103,14 @@ class SearchResult:
     Invariants:
     - total: >= 0
     - hits count: <= limit
+
+    total_capped=True means the adapter stopped counting at `total`
+    ("total+" matches); otherwise total is exact.
     """
     total: int
     hits: List[SearchHit] = field(default_factory=list)
     query: Optional[SearchQuery] = None  # The query that produced these results
+    total_capped: bool = False
 
     def __post_init__(self):
         """Validate search result"""
@@ -111,8 +120,104 @@ class SearchResult:
             raise ValueError("Hit count exceeds limit")
 
 
+@dataclass(frozen=True)
+class SearchCursor:
+    """
+    Keyset cursor - ValueObject
+
+    Position of the last hit returned by a federated (cross-type) search page.
+    Global ordering is (score DESC, entity_type ASC, entity_id ASC), so this
+    triple is enough to resume the merge without offsets.
+
+    Serialized as an opaque urlsafe base64 token for HTTP clients. The first
+    page's total is carried along so later pages don't have to recount.
+    `query_key` binds the cursor to the search that issued it (text and
+    scope), so it cannot be replayed against another query.
+
+    Invariants:
+    - score: finite
+    - total: >= 0
+    """
+    score: float
+    entity_type: str
+    entity_id: UUID
+    total: int = 0
+    total_capped: bool = False
+    query_key: str = ""
+
+    def __post_init__(self):
+        """Validate cursor position"""
+        if not math.isfinite(self.score):
+            raise InvalidQueryError("Search cursor score must be finite", field="cursor")
+        if self.total < 0:
+            raise InvalidQueryError("Search cursor total cannot be negative", field="cursor")
+
+    @staticmethod
+    def key_for(query: SearchQuery) -> str:
+        """Fingerprint of the query fields a cursor position depends on."""
+        raw = json.dumps(
+            [
+                query.text,
+                query.type.value if query.type else None,
+                str(query.library_id) if query.library_id else None,
+                str(query.book_id) if query.book_id else None,
+            ],
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+    @classmethod
+    def after(cls, hit: SearchHit, result: Optional["SearchResult"] = None) -> "SearchCursor":
+        query = result.query if result else None
+        return cls(
+            score=float(hit.score),
+            entity_type=hit.entity_type.value,
+            entity_id=hit.entity_id,
+            total=result.total if result else 0,
+            total_capped=result.total_capped if result else False,
+            query_key=cls.key_for(query) if query else "",
+        )
+
+    def encode(self) -> str:
+        raw = json.dumps(
+            {
+                "s": self.score,
+                "t": self.entity_type,
+                "i": str(self.entity_id),
+                "n": self.total,
+                "c": int(self.total_capped),
+                "q": self.query_key,
+            },
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str, query: Optional[SearchQuery] = None) -> "SearchCursor":
+        """Parse a token; with `query`, also reject cursors issued for another search."""
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            cursor = cls(
+                score=float(data["s"]),
+                entity_type=str(data["t"]),
+                entity_id=UUID(str(data["i"])),
+                total=int(data.get("n", 0)),
+                total_capped=bool(data.get("c", 0)),
+                query_key=str(data.get("q", "")),
+            )
+        except InvalidQueryError:
+            raise
+        except Exception as e:
+            raise InvalidQueryError("Malformed search cursor", field="cursor") from e
+        if query is not None and cursor.query_key != cls.key_for(query):
+            raise InvalidQueryError("Search cursor does not belong to this query", field="cursor")
+        return cursor
+
+
 __all__ = [
     "SearchQuery",
     "SearchHit",
     "SearchResult",
+    "SearchCursor",
 ]
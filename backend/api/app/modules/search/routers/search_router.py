@@ -16,6 +16,7 @@ Endpoints:
 - GET /search/tags            Search only tags
 - GET /search/libraries       Search only libraries
 - GET /search/entries         Search only entries (Loom terms)
+- GET /search/suggest         Typeahead suggestions (tags, libraries, book titles)
 
 Query Parameters:
 - q: str (required, min_length=1)
@@ -23,6 +24,7 @@ Query Parameters:
 - book_id: Optional[UUID] (limit search to specific book)
 - limit: int = 20
 - offset: int = 0
+- cursor: Optional[str] (global search only: keyset token from `next_cursor`)
 """
 import logging
 from typing import Optional
@@ -31,10 +33,18 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.app.config.security import get_current_user_id
 from api.app.config.setting import Settings, get_settings
-from api.app.modules.search.domain import SearchQuery, SearchResult
-from api.app.modules.search.schemas import BlockSearchHitSchema, BlockTwoStageSearchResponse
-from infra.database.session import get_db_session
+from api.app.modules.search.application.federated_search_service import FederatedSearchService
+from api.app.modules.search.application.typeahead_service import TYPEAHEAD_ENTITY_TYPES, TypeaheadService
+from api.app.modules.search.domain import InvalidQueryError, SearchQuery, SearchResult
+from api.app.modules.search.schemas import (
+    BlockSearchHitSchema,
+    BlockTwoStageSearchResponse,
+    SuggestionSchema,
+    TypeaheadResponse,
+)
+from infra.database.session import get_db_session, get_session_factory
 from infra.storage.search_repository_impl import PostgresSearchAdapter
 
 logger = logging.getLogger(__name__)
@@ -48,6 +58,7 @@ def _empty_search_response(*, limit: int, offset: int) -> dict:
         "hits": [],
         "limit": limit,
         "offset": offset,
+        "total_capped": False,
     }
 
 
@@ -68,6 +79,7 @@ def _result_to_dict(result: SearchResult) -> dict:
         ],
         "limit": result.query.limit if result.query else len(result.hits),
         "offset": result.query.offset if result.query else 0,
+        "total_capped": result.total_capped,
     }
 
 
@@ -99,7 +111,7 @@ async def get_search_db_session(
     description="""
     Global search across all entities.
     Searches blocks (content), books (title/metadata), bookshelves, tags, libraries, and entries.
-    Results ordered by relevance.
+    Results ordered by relevance across types; page with `next_cursor`.
     """
 )
 async def search_global(
@@ -107,19 +119,15 @@ async def search_global(
     library_id: Optional[UUID] = Query(None, description="Scope key: library_id"),
     book_id: Optional[UUID] = Query(None, description="Optional: scope search to specific book"),
     limit: int = Query(20, ge=1, le=1000, description="Results per page"),
-    offset: int = Query(0, ge=0, description="Pagination offset"),
-    session: Optional[AsyncSession] = Depends(get_search_db_session),
+    offset: int = Query(0, ge=0, description="Pagination offset (ignored when cursor is set)"),
+    cursor: Optional[str] = Query(None, max_length=512, description="Keyset cursor from next_cursor"),
     settings: Settings = Depends(get_settings),
 ):
     """Execute global search across all entity types"""
     try:
         if not settings.enable_search_projection:
-            return _empty_search_response(limit=limit, offset=offset)
-
-        if session is None:
-            return _empty_search_response(limit=limit, offset=offset)
+            return {**_empty_search_response(limit=limit, offset=offset), "next_cursor": None}
 
-        repo = PostgresSearchAdapter(session)
         query = SearchQuery(
             text=q,
             library_id=library_id,
@@ -128,15 +136,20 @@ async def search_global(
             offset=offset,
         )
 
-        # MVP global search: block + book (projection-backed).
-        block_result = await repo.search_blocks(query)
-        book_result = await repo.search_books(query)
-
-        all_hits = block_result.hits + book_result.hits
-        all_hits.sort(key=lambda h: h.score, reverse=True)
-        paginated_hits = all_hits[offset : offset + limit]
-        combined = SearchResult(total=len(all_hits), hits=paginated_hits, query=query)
-        return _result_to_dict(combined)
+        # MVP global search: block + book (projection-backed), federated:
+        # per-type queries run concurrently and are k-way merged by score.
+        service = FederatedSearchService(
+            session_factory=await get_session_factory(),
+            source_factory=PostgresSearchAdapter,
+        )
+        page = await service.search(query, cursor=cursor)
+        return {**_result_to_dict(page.result), "next_cursor": page.next_cursor}
+    except InvalidQueryError as e:
+        logger.warning(f"Invalid search query: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid search query: {e.message}",
+        )
     except Exception as e:
         logger.error(f"Search error: {e}")
         raise HTTPException(
@@ -215,7 +228,12 @@ async def search_blocks_two_stage(
     library_id: Optional[UUID] = Query(None, description="Scope key: library_id"),
     book_id: Optional[UUID] = Query(None, description="Optional: limit to specific book"),
     limit: int = Query(20, ge=1, le=1000, description="Results per page"),
-    candidate_limit: int = Query(200, ge=1, le=5000, description="Stage1 candidate limit"),
+    candidate_limit: Optional[int] = Query(
+        None,
+        ge=1,
+        le=5000,
+        description="Stage1 candidate limit (omit for adaptive sizing with Stage2 refill)",
+    ),
     session: Optional[AsyncSession] = Depends(get_search_db_session),
     settings: Settings = Depends(get_settings),
 ):
@@ -243,6 +261,7 @@ async def search_blocks_two_stage(
             book_id=book_id,
             limit=limit,
             candidate_limit=candidate_limit,
+            library_id=library_id,
         )
         logger.info(
             {
@@ -496,3 +515,68 @@ async def search_entries(
         )
 
 
+# ============================================================================
+# Endpoint: Typeahead (Search-as-you-type)
+# ============================================================================
+
+@router.get(
+    "/suggest",
+    response_model=TypeaheadResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Typeahead suggestions",
+    description="""
+    Top-k suggestions for partial input over tag names, library names and book titles.
+    Prefix matches rank first; backed by pg_trgm indexes on the source tables.
+    """,
+)
+async def search_suggest(
+    q: str = Query(..., min_length=1, max_length=100, description="Partial input"),
+    types: Optional[str] = Query(
+        None,
+        description=f"Comma-separated subset of {','.join(TYPEAHEAD_ENTITY_TYPES)} (default: all)",
+    ),
+    library_id: Optional[UUID] = Query(None, description="Optional: scope book titles to a library"),
+    limit: int = Query(10, ge=1, le=50, description="Max suggestions"),
+    user_id: UUID = Depends(get_current_user_id),
+    session: Optional[AsyncSession] = Depends(get_search_db_session),
+    settings: Settings = Depends(get_settings),
+):
+    """Suggest the caller's tags / libraries / books matching partial input"""
+    entity_types = [t.strip() for t in types.split(",") if t.strip()] if types else None
+    try:
+        if not settings.enable_search_projection:
+            return TypeaheadResponse(q=q, suggestions=[])
+
+        if session is None:
+            return TypeaheadResponse(q=q, suggestions=[])
+
+        suggestions = await TypeaheadService(session).suggest(
+            q,
+            user_id=user_id,
+            entity_types=entity_types,
+            library_id=library_id,
+            limit=limit,
+        )
+        return TypeaheadResponse(
+            q=q,
+            suggestions=[
+                SuggestionSchema(
+                    entity_type=s.entity_type,
+                    entity_id=str(s.entity_id),
+                    label=s.label,
+                    score=s.score,
+                )
+                for s in suggestions
+            ],
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e),
+        )
+    except Exception as e:
+        logger.error(f"Typeahead error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Suggest failed"
+        )
@@ -96,10 +96,37 @@ class BlockTwoStageSearchResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+# =========================================================================
+# Typeahead (Search-only DTOs)
+# =========================================================================
+
+
+class SuggestionSchema(BaseModel):
+    """One typeahead suggestion."""
+
+    entity_type: str = Field(..., description="tag | library | book")
+    entity_id: str = Field(..., description="Entity UUID")
+    label: str = Field(..., description="Display text (tag name / library name / book title)")
+    score: float = Field(..., description="Prefix bonus + trigram similarity")
+
+    model_config = {"from_attributes": True}
+
+
+class TypeaheadResponse(BaseModel):
+    """Response for GET /search/suggest."""
+
+    q: str
+    suggestions: List[SuggestionSchema] = Field(default_factory=list)
+
+    model_config = {"from_attributes": True}
+
+
 __all__ = [
     "ExecuteSearchRequest",
     "SearchHitSchema",
     "ExecuteSearchResponse",
     "BlockSearchHitSchema",
     "BlockTwoStageSearchResponse",
+    "SuggestionSchema",
+    "TypeaheadResponse",
 ]
@@ -0,0 +1,150 @@
+"""GetBookshelfDashboardUseCase: filter / sort / pagination run in SQL."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+import pytest
+
+from api.app.modules.bookshelf.application.ports.input import (
+    BookshelfDashboardFilter,
+    BookshelfDashboardRequest,
+    BookshelfDashboardSort,
+)
+from api.app.modules.bookshelf.application.use_cases.get_bookshelf_dashboard import (
+    GetBookshelfDashboardUseCase,
+)
+from infra.database.models.book_models import BookModel
+from infra.database.models.bookshelf_models import BookshelfModel
+from infra.database.models.chronicle_activity_models import ChronicleBookActivityDailyModel
+from infra.database.models.library_models import LibraryModel
+
+
+@dataclass
+class _Library:
+    id: UUID
+    pinned: UUID  # pinned, active a day ago, 1 book
+    busy: UUID  # active 2 days ago, 3 books
+    cooling: UUID  # last activity 30 days ago, 1 book
+    archived: UUID  # archived, active yesterday
+    idle: UUID  # never active, no books
+
+
+async def _seed_library(db_session) -> _Library:
+    now = datetime.now(timezone.utc)
+    library_id = uuid4()
+    ids = {name: uuid4() for name in ("pinned", "busy", "cooling", "archived", "idle")}
+
+    db_session.add(LibraryModel(id=library_id, user_id=uuid4(), name="L"))
+    await db_session.flush()
+    db_session.add_all(
+        [
+            BookshelfModel(id=ids["pinned"], library_id=library_id, name="pinned", is_pinned=True, pinned_at=now),
+            BookshelfModel(id=ids["busy"], library_id=library_id, name="busy"),
+            BookshelfModel(id=ids["cooling"], library_id=library_id, name="cooling"),
+            BookshelfModel(id=ids["archived"], library_id=library_id, name="archived", status="archived"),
+            BookshelfModel(id=ids["idle"], library_id=library_id, name="idle"),
+            # Never listed: the basement and deleted shelves.
+            BookshelfModel(id=uuid4(), library_id=library_id, name="basement", is_basement=True),
+            BookshelfModel(id=uuid4(), library_id=library_id, name="deleted", status="deleted"),
+        ]
+    )
+    await db_session.flush()
+
+    activity = {"pinned": [1], "busy": [2, None, None], "cooling": [30], "archived": [1]}
+    buckets = []
+    for shelf, days_ago_per_book in activity.items():
+        for days_ago in days_ago_per_book:
+            book_id = uuid4()
+            db_session.add(BookModel(id=book_id, bookshelf_id=ids[shelf], library_id=library_id, title=shelf))
+            if days_ago is not None:
+                at = now - timedelta(days=days_ago)
+                buckets.append(
+                    ChronicleBookActivityDailyModel(book_id=book_id, day=at.date(), edits=2, views=5, last_activity_at=at)
+                )
+    await db_session.flush()
+    db_session.add_all(buckets)
+    await db_session.flush()
+    return _Library(id=library_id, **ids)
+
+
+def _request(library_id: UUID, **overrides) -> BookshelfDashboardRequest:
+    params = dict(library_id=library_id, enforce_owner_check=False, status_filter=BookshelfDashboardFilter.ALL)
+    params.update(overrides)
+    return BookshelfDashboardRequest(**params)
+
+
+@pytest.mark.asyncio
+async def test_pinned_shelf_comes_first_and_pages_cover_every_visible_shelf(db_session):
+    library = await _seed_library(db_session)
+    use_case = GetBookshelfDashboardUseCase(db_session)
+
+    pages = [await use_case.execute(_request(library.id, page=page, size=2)) for page in (1, 2, 3)]
+
+    assert [page.total for page in pages] == [5, 5, 5]
+    assert [len(page.items) for page in pages] == [2, 2, 1]
+    listed = [item.id for page in pages for item in page.items]
+    assert listed[0] == library.pinned
+    assert set(listed) == {library.pinned, library.busy, library.cooling, library.archived, library.idle}
+
+    snapshot = pages[0].snapshot
+    assert (snapshot.total, snapshot.pinned) == (5, 1)
+    health = snapshot.health_counts
+    assert (health.active, health.slowing, health.cooling, health.archived) == (2, 0, 2, 1)
+
+
+@pytest.mark.asyncio
+async def test_book_count_sort_keeps_pinned_first(db_session):
+    library = await _seed_library(db_session)
+    use_case = GetBookshelfDashboardUseCase(db_session)
+
+    result = await use_case.execute(_request(library.id, sort=BookshelfDashboardSort.BOOK_COUNT_DESC))
+
+    assert [item.id for item in result.items][:2] == [library.pinned, library.busy]
+    assert result.items[1].book_counts.total == 3
+
+
+@pytest.mark.asyncio
+async def test_stale_filter_uses_the_health_rules(db_session):
+    library = await _seed_library(db_session)
+    use_case = GetBookshelfDashboardUseCase(db_session)
+
+    result = await use_case.execute(_request(library.id, status_filter=BookshelfDashboardFilter.STALE))
+
+    assert result.total == 3
+    assert {item.id: item.health for item in result.items} == {
+        library.cooling: "cooling",
+        library.archived: "archived",
+        library.idle: "cooling",
+    }
+    assert result.snapshot.total == 5
+
+
+@pytest.mark.asyncio
+async def test_page_items_carry_the_rollup_counts(db_session):
+    library = await _seed_library(db_session)
+    use_case = GetBookshelfDashboardUseCase(db_session)
+
+    result = await use_case.execute(_request(library.id))
+
+    by_id = {item.id: item for item in result.items}
+    busy = by_id[library.busy]
+    assert (busy.edits_last_7d, busy.views_last_7d, busy.health) == (2, 5, "active")
+    # The 30-day-old bucket sets last_activity_at but is outside the 7-day window.
+    cooling = by_id[library.cooling]
+    assert (cooling.edits_last_7d, cooling.views_last_7d) == (0, 0)
+    assert cooling.last_activity_at is not None
+    assert by_id[library.idle].last_activity_at is None
+
+
+@pytest.mark.asyncio
+async def test_empty_library_returns_no_page(db_session):
+    library_id = uuid4()
+    db_session.add(LibraryModel(id=library_id, user_id=uuid4(), name="L"))
+    await db_session.flush()
+
+    result = await GetBookshelfDashboardUseCase(db_session).execute(_request(library_id))
+
+    assert (result.items, result.total, result.snapshot.total) == ([], 0, 0)
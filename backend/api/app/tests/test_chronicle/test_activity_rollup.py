@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from infra.database.models.book_models import BookModel
+from infra.database.models.bookshelf_models import BookshelfModel
+from infra.database.models.chronicle_activity_models import ChronicleBookActivityDailyModel
+from infra.database.models.chronicle_entries_models import ChronicleEntryModel
+from infra.database.models.library_models import LibraryModel
+from infra.storage.chronicle_activity_rollup import (
+    ChronicleActivity,
+    aggregate_chronicle_activity,
+    apply_chronicle_activity,
+    expire_book_visit_counts,
+    rebuild_chronicle_activity_rollup,
+    recompute_book_visit_counts,
+    record_chronicle_activity,
+    utc_day,
+    visit_window_start,
+)
+
+T0 = datetime(2026, 3, 2, 10, 0, tzinfo=timezone.utc)
+
+
+async def _books(db_session, count: int, **columns) -> list:
+    library_id, shelf_id = uuid4(), uuid4()
+    db_session.add(LibraryModel(id=library_id, user_id=uuid4(), name="L"))
+    await db_session.flush()
+    db_session.add(BookshelfModel(id=shelf_id, library_id=library_id, name="S"))
+    await db_session.flush()
+    ids = sorted(uuid4() for _ in range(count))
+    db_session.add_all(
+        [BookModel(id=book_id, bookshelf_id=shelf_id, library_id=library_id, title="B", **columns) for book_id in ids]
+    )
+    await db_session.flush()
+    return ids
+
+
+async def _buckets(db_session, book_id):
+    daily = ChronicleBookActivityDailyModel
+    rows = await db_session.execute(
+        select(daily.day, daily.edits, daily.views, daily.last_activity_at)
+        .where(daily.book_id == book_id)
+        .order_by(daily.day)
+    )
+    return [tuple(row) for row in rows]
+
+
+async def _visits(db_session, book_id):
+    row = (
+        await db_session.execute(
+            select(BookModel.visit_count_90d, BookModel.last_visited_at).where(BookModel.id == book_id)
+        )
+    ).one()
+    return tuple(row)
+
+
+def test_utc_day_buckets_by_utc_date():
+    plus_eight = timezone(timedelta(hours=8))
+
+    assert utc_day(datetime(2026, 3, 2, 1, 30, tzinfo=plus_eight)) == date(2026, 3, 1)
+    assert utc_day(datetime(2026, 3, 2, 23, 59)) == date(2026, 3, 2)
+
+
+def test_visit_window_counts_ninety_days_including_today():
+    assert visit_window_start(date(2026, 6, 30)) == date(2026, 4, 2)
+
+
+def test_aggregate_sums_a_batch_per_bucket_in_lock_order():
+    first, second = sorted([uuid4(), uuid4()])
+    activities = [
+        ChronicleActivity(book_id=second, event_type="book_opened", occurred_at=T0),
+        ChronicleActivity(book_id=first, event_type="block_updated", occurred_at=T0 + timedelta(days=1)),
+        ChronicleActivity(book_id=second, event_type="book_opened", occurred_at=T0 + timedelta(hours=3)),
+        ChronicleActivity(book_id=second, event_type="block_updated", occurred_at=T0 + timedelta(hours=1)),
+        ChronicleActivity(book_id=first, event_type="book_opened", occurred_at=datetime(2025, 1, 1, tzinfo=timezone.utc)),
+    ]
+
+    buckets, visits = aggregate_chronicle_activity(activities, today=date(2026, 3, 5))
+
+    assert [(b.book_id, b.day, b.edits, b.views, b.last_activity_at) for b in buckets] == [
+        (first, date(2025, 1, 1), 0, 1, datetime(2025, 1, 1, tzinfo=timezone.utc)),
+        (first, date(2026, 3, 3), 1, 0, T0 + timedelta(days=1)),
+        (second, date(2026, 3, 2), 1, 2, T0 + timedelta(hours=3)),
+    ]
+    # The old view still moves last_visited_at but is outside the 90-day window.
+    assert [(v.book_id, v.window_views, v.last_visited_at) for v in visits] == [
+        (first, 0, datetime(2025, 1, 1, tzinfo=timezone.utc)),
+        (second, 2, T0 + timedelta(hours=3)),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_apply_adds_batches_to_existing_buckets_and_visit_counters(db_session):
+    first, second = await _books(db_session, 2)
+    today = date(2026, 3, 5)
+
+    await apply_chronicle_activity(
+        db_session,
+        [
+            ChronicleActivity(book_id=second, event_type="book_opened", occurred_at=T0),
+            ChronicleActivity(book_id=first, event_type="block_updated", occurred_at=T0),
+            ChronicleActivity(book_id=second, event_type="book_opened", occurred_at=T0 + timedelta(hours=1)),
+        ],
+        today=today,
+    )
+    await apply_chronicle_activity(
+        db_session,
+        [
+            ChronicleActivity(book_id=second, event_type="block_updated", occurred_at=T0 - timedelta(hours=1)),
+            ChronicleActivity(book_id=second, event_type="book_opened", occurred_at=T0 + timedelta(minutes=5)),
+        ],
+        today=today,
+    )
+
+    assert await _buckets(db_session, first) == [(date(2026, 3, 2), 1, 0, T0)]
+    assert await _buckets(db_session, second) == [(date(2026, 3, 2), 1, 3, T0 + timedelta(hours=1))]
+    # Edits leave the visit counters alone; last_visited_at never moves back.
+    assert await _visits(db_session, first) == (0, None)
+    assert await _visits(db_session, second) == (3, T0 + timedelta(hours=1))
+
+
+@pytest.mark.asyncio
+async def test_record_view_outside_the_window_only_moves_last_visited_at(db_session):
+    (book_id,) = await _books(db_session, 1)
+    viewed_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    await record_chronicle_activity(
+        db_session,
+        book_id=book_id,
+        event_type="book_opened",
+        occurred_at=viewed_at,
+        today=date(2026, 6, 1),
+    )
+
+    assert await _buckets(db_session, book_id) == [(date(2026, 1, 1), 0, 1, viewed_at)]
+    assert await _visits(db_session, book_id) == (0, viewed_at)
+
+
+@pytest.mark.asyncio
+async def test_rebuild_recomputes_buckets_from_chronicle_entries(db_session):
+    (book_id,) = await _books(db_session, 1)
+    db_session.add_all(
+        [
+            ChronicleEntryModel(id=uuid4(), book_id=book_id, event_type=event_type, occurred_at=at, created_at=at)
+            for event_type, at in [
+                ("block_updated", T0),
+                ("book_opened", T0 + timedelta(hours=2)),
+                ("book_opened", T0 + timedelta(days=1)),
+            ]
+        ]
+    )
+    db_session.add(
+        ChronicleBookActivityDailyModel(book_id=book_id, day=date(2026, 3, 2), edits=9, views=9, last_activity_at=T0)
+    )
+    await db_session.flush()
+
+    assert await rebuild_chronicle_activity_rollup(db_session) >= 2
+
+    assert await _buckets(db_session, book_id) == [
+        (date(2026, 3, 2), 1, 1, T0 + timedelta(hours=2)),
+        (date(2026, 3, 3), 0, 1, T0 + timedelta(days=1)),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_expiry_recomputes_books_whose_views_left_the_window(db_session):
+    today = date(2026, 6, 30)
+    start = visit_window_start(today)
+    expired, untouched = await _books(db_session, 2, visit_count_90d=5)
+    db_session.add_all(
+        [
+            # 3 views just left the window, 2 are still inside it.
+            ChronicleBookActivityDailyModel(
+                book_id=expired, day=start - timedelta(days=1), views=3, last_activity_at=T0
+            ),
+            ChronicleBookActivityDailyModel(book_id=expired, day=start, views=2, last_activity_at=T0),
+            # Views that left the window before the lookback are not rescanned.
+            ChronicleBookActivityDailyModel(
+                book_id=untouched, day=start - timedelta(days=30), views=5, last_activity_at=T0
+            ),
+        ]
+    )
+    await db_session.flush()
+
+    assert await expire_book_visit_counts(db_session, today=today, lookback_days=7) >= 1
+    assert (await _visits(db_session, expired))[0] == 2
+    assert (await _visits(db_session, untouched))[0] == 5
+    # Idempotent: a second run finds nothing left to fix for these books.
+    await expire_book_visit_counts(db_session, today=today, lookback_days=7)
+    assert (await _visits(db_session, expired))[0] == 2
+
+
+@pytest.mark.asyncio
+async def test_recompute_sums_window_buckets_and_latest_view(db_session):
+    today = date(2026, 3, 5)
+    (book_id,) = await _books(db_session, 1, visit_count_90d=42)
+    db_session.add_all(
+        [
+            ChronicleBookActivityDailyModel(book_id=book_id, day=date(2026, 3, 2), views=4, last_activity_at=T0),
+            ChronicleBookActivityDailyModel(book_id=book_id, day=date(2025, 1, 1), views=7, last_activity_at=T0),
+            ChronicleEntryModel(id=uuid4(), book_id=book_id, event_type="book_opened", occurred_at=T0, created_at=T0),
+        ]
+    )
+    await db_session.flush()
+
+    assert await recompute_book_visit_counts(db_session, today=today, book_ids=[book_id]) == 1
+
+    assert await _visits(db_session, book_id) == (4, T0)
@@ -0,0 +1,192 @@
+"""Write-behind view counting: buffered in memory, flushed set-based."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from api.app.modules.chronicle.application.services import ChronicleRecorderService
+from api.app.modules.library.application.ports.input import RecordLibraryViewRequest
+from api.app.modules.library.application.use_cases.record_library_view import RecordLibraryViewUseCase
+from api.app.modules.library.domain.library import Library
+from infra.database.models.book_models import BookModel
+from infra.database.models.bookshelf_models import BookshelfModel
+from infra.database.models.chronicle_models import ChronicleEventModel
+from infra.database.models.chronicle_outbox_models import ChronicleOutboxEventModel
+from infra.database.models.library_models import LibraryModel
+from infra.storage.view_counter_buffer import ViewCounterBuffer
+
+
+class _SessionScope:
+    """Hands the test's db_session to code that opens its own sessions."""
+
+    def __init__(self, session):
+        self._session = session
+
+    async def __aenter__(self):
+        return self._session
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+
+class _FailingSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    async def execute(self, stmt, params=None):
+        raise RuntimeError("database unavailable")
+
+    async def rollback(self):
+        return None
+
+
+async def _library(db_session, **columns) -> LibraryModel:
+    library = LibraryModel(id=uuid4(), user_id=uuid4(), name="L", **columns)
+    db_session.add(library)
+    await db_session.flush()
+    return library
+
+
+async def _book(db_session) -> BookModel:
+    library = await _library(db_session)
+    shelf = BookshelfModel(id=uuid4(), library_id=library.id, name="S")
+    db_session.add(shelf)
+    await db_session.flush()
+    book = BookModel(id=uuid4(), bookshelf_id=shelf.id, library_id=library.id, title="B")
+    db_session.add(book)
+    await db_session.flush()
+    return book
+
+
+@pytest.mark.asyncio
+async def test_views_are_aggregated_and_added_on_flush(db_session):
+    t0 = datetime(2026, 3, 2, 10, 0, tzinfo=timezone.utc)
+    first = await _library(db_session, views_count=10, last_viewed_at=t0 - timedelta(days=1))
+    second = await _library(db_session)
+    buffer = ViewCounterBuffer(lambda: _SessionScope(db_session))
+
+    buffer.record_library_view(first.id, t0)
+    buffer.record_library_view(first.id, t0 + timedelta(seconds=5))
+    pending = buffer.record_library_view(second.id, t0)
+    buffer.record_library_view(uuid4(), t0)  # deleted meanwhile: skipped
+
+    assert pending.delta == 1
+    assert buffer.pending == 3
+
+    assert await buffer.flush() == (2, 0)
+    assert buffer.pending == 0
+    rows = dict(
+        (row.id, (row.views_count, row.last_viewed_at))
+        for row in (
+            await db_session.execute(
+                select(LibraryModel.id, LibraryModel.views_count, LibraryModel.last_viewed_at).where(
+                    LibraryModel.id.in_([first.id, second.id])
+                )
+            )
+        ).all()
+    )
+    assert rows == {first.id: (12, t0 + timedelta(seconds=5)), second.id: (1, t0)}
+    await buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_requeues_views_merged_with_newer_ones():
+    buffer = ViewCounterBuffer(_FailingSession)
+    library_id = uuid4()
+    t0 = datetime(2026, 3, 2, 10, 0, tzinfo=timezone.utc)
+
+    buffer.record_library_view(library_id, t0)
+    buffer.record_library_view(library_id, t0)
+    assert await buffer.flush() == (0, 0)
+
+    pending = buffer.record_library_view(library_id, t0 + timedelta(minutes=1))
+
+    assert pending.delta == 3
+    assert pending.last_viewed_at == t0 + timedelta(minutes=1)
+    await buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_book_opened_events_are_flushed_as_one_batch(db_session):
+    book = await _book(db_session)
+    buffer = ViewCounterBuffer(lambda: _SessionScope(db_session))
+    recorder = ChronicleRecorderService(buffer.chronicle_writer)
+
+    for _ in range(3):
+        await recorder.record_book_opened(book_id=book.id, actor_id=uuid4())
+
+    assert await buffer.flush() == (0, 3)
+
+    event_ids = (
+        await db_session.execute(
+            select(ChronicleEventModel.id).where(
+                ChronicleEventModel.book_id == book.id, ChronicleEventModel.event_type == "book_opened"
+            )
+        )
+    ).scalars().all()
+    assert len(event_ids) == 3
+    outbox = (
+        await db_session.execute(
+            select(ChronicleOutboxEventModel.status).where(ChronicleOutboxEventModel.entity_id.in_(event_ids))
+        )
+    ).scalars().all()
+    assert outbox == ["pending"] * 3
+    await buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_events_of_deleted_books_are_dropped_not_requeued(db_session):
+    book = await _book(db_session)
+    buffer = ViewCounterBuffer(lambda: _SessionScope(db_session))
+    recorder = ChronicleRecorderService(buffer.chronicle_writer)
+
+    await recorder.record_book_opened(book_id=book.id, actor_id=uuid4())
+    await recorder.record_book_opened(book_id=uuid4(), actor_id=uuid4())  # hard-deleted book
+
+    assert await buffer.flush() == (0, 1)
+    assert buffer.pending == 0
+    assert await buffer.flush() == (0, 0)
+    outbox = (
+        await db_session.execute(
+            select(ChronicleOutboxEventModel.entity_id)
+            .join(ChronicleEventModel, ChronicleEventModel.id == ChronicleOutboxEventModel.entity_id)
+            .where(ChronicleEventModel.book_id == book.id)
+        )
+    ).scalars().all()
+    assert len(outbox) == 1
+    await buffer.stop()
+
+
+class _ReadOnlyRepository:
+    def __init__(self, library):
+        self._library = library
+        self.saves = []
+
+    async def get_by_id(self, library_id):
+        return self._library if library_id == self._library.id else None
+
+    async def save(self, library):
+        self.saves.append(library)
+
+
+@pytest.mark.asyncio
+async def test_record_library_view_reads_without_saving():
+    library_domain = Library.create(user_id=uuid4(), name="My Library")
+    repository = _ReadOnlyRepository(library_domain)
+    buffer = ViewCounterBuffer(_FailingSession)
+    use_case = RecordLibraryViewUseCase(repository=repository, view_counter=buffer.library_views)
+
+    await use_case.execute(RecordLibraryViewRequest(library_id=library_domain.id))
+    response = await use_case.execute(RecordLibraryViewRequest(library_id=library_domain.id))
+
+    assert repository.saves == []
+    assert response.views_count == library_domain.views_count + 2
+    assert response.last_viewed_at is not None
+    await buffer.stop()
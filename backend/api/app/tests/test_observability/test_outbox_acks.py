@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from infra.database.models.chronicle_outbox_models import ChronicleOutboxEventModel
+from infra.database.models.search_outbox_models import SearchOutboxEventModel
+from infra.outbox_core.acks import ACK_DONE, ACK_FAILED, ACK_RETRY, OutboxAck, write_acks
+
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+async def _claimed_rows(db_session, model, owners: list[str]):
+    rows = [
+        model(
+            entity_type="block",
+            entity_id=uuid4(),
+            op="upsert",
+            status="processing",
+            owner=owner,
+            lease_until=NOW + timedelta(seconds=30),
+            processing_started_at=NOW,
+            attempts=1,
+        )
+        for owner in owners
+    ]
+    db_session.add_all(rows)
+    await db_session.flush()
+    return [row.id for row in rows]
+
+
+async def _state(db_session, model, ids):
+    db_session.expire_all()
+    rows = (await db_session.execute(select(model).where(model.id.in_(ids)))).scalars()
+    return {row.id: row for row in rows}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("model", [SearchOutboxEventModel, ChronicleOutboxEventModel])
+async def test_batch_settles_each_owned_row_with_its_outcome(db_session, model):
+    done_id, retry_id, failed_id, stolen_id = await _claimed_rows(db_session, model, ["w1", "w1", "w1", "w2"])
+    retry_at = NOW + timedelta(seconds=4)
+    acks = [
+        OutboxAck(id=done_id, outcome=ACK_DONE),
+        OutboxAck(
+            id=retry_id,
+            outcome=ACK_RETRY,
+            attempts=2,
+            next_retry_at=retry_at,
+            error_reason="es_429",
+            error="too many requests",
+        ),
+        OutboxAck(id=failed_id, outcome=ACK_FAILED, attempts=3, error_reason="es_4xx", error="mapping"),
+        # Reclaimed by another worker meanwhile: the ack must not touch it.
+        OutboxAck(id=stolen_id, outcome=ACK_DONE),
+    ]
+
+    updated = await write_acks(db_session, model, acks, worker_id="w1", now=NOW)
+
+    assert updated == 3
+    rows = await _state(db_session, model, [done_id, retry_id, failed_id, stolen_id])
+    done, retry, failed, stolen = rows[done_id], rows[retry_id], rows[failed_id], rows[stolen_id]
+    assert (done.status, done.processed_at, done.owner, done.lease_until) == ("done", NOW, None, None)
+    assert (retry.status, retry.attempts, retry.next_retry_at, retry.error_reason, retry.owner) == (
+        "pending",
+        2,
+        retry_at,
+        "es_429",
+        None,
+    )
+    assert (failed.status, failed.attempts, failed.error, failed.next_retry_at) == ("failed", 3, "mapping", None)
+    assert (stolen.status, stolen.owner, stolen.processed_at) == ("processing", "w2", None)
+
+
+@pytest.mark.asyncio
+async def test_acks_after_the_lease_expired_are_ignored(db_session):
+    (row_id,) = await _claimed_rows(db_session, SearchOutboxEventModel, ["w1"])
+
+    updated = await write_acks(
+        db_session,
+        SearchOutboxEventModel,
+        [OutboxAck(id=row_id, outcome=ACK_DONE)],
+        worker_id="w1",
+        now=NOW + timedelta(minutes=5),
+    )
+
+    assert updated == 0
+    assert (await _state(db_session, SearchOutboxEventModel, [row_id]))[row_id].status == "processing"
+
+
+@pytest.mark.asyncio
+async def test_no_acks_no_updates(db_session):
+    assert await write_acks(db_session, SearchOutboxEventModel, [], worker_id="w1", now=NOW) == 0
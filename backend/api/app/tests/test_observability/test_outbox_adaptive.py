@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import pytest
+
+from infra.observability.outbox_metrics import outbox_adaptive_batch_size, outbox_adaptive_concurrency
+from infra.outbox_core.adaptive import (
+    DECISION_DECREASE,
+    DECISION_HOLD,
+    DECISION_INCREASE,
+    AimdController,
+)
+
+
+def _controller(**overrides) -> AimdController:
+    params = dict(
+        projection="test_adaptive",
+        batch_size=100,
+        concurrency=4,
+        min_batch_size=10,
+        max_batch_size=200,
+        max_concurrency=8,
+        batch_step=20,
+        latency_target_seconds=1.0,
+        max_error_rate=0.05,
+        healthy_streak=2,
+    )
+    params.update(overrides)
+    return AimdController(**params)
+
+
+def _healthy(controller: AimdController) -> str:
+    return controller.observe(items=controller.batch_size, latency_seconds=0.1)
+
+
+def test_grows_additively_after_a_healthy_streak():
+    controller = _controller()
+
+    assert _healthy(controller) == DECISION_HOLD
+    assert _healthy(controller) == DECISION_INCREASE
+    assert (controller.batch_size, controller.concurrency) == (120, 5)
+
+    for _ in range(20):
+        _healthy(controller)
+    assert (controller.batch_size, controller.concurrency) == (200, 8)
+
+
+def test_throttling_halves_setpoints_down_to_the_floor():
+    controller = _controller()
+
+    assert controller.observe(items=100, latency_seconds=0.1, errors=3, throttled=True) == DECISION_DECREASE
+    assert (controller.batch_size, controller.concurrency) == (50, 2)
+
+    for _ in range(5):
+        controller.observe(items=10, latency_seconds=5.0, throttled=True)
+    assert (controller.batch_size, controller.concurrency) == (10, 1)
+    assert controller.observe(items=10, latency_seconds=5.0, throttled=True) == DECISION_HOLD
+
+
+@pytest.mark.parametrize(
+    "observation",
+    [
+        dict(items=100, latency_seconds=1.5),
+        dict(items=100, latency_seconds=0.1, errors=10),
+        dict(items=40, latency_seconds=0.1),
+    ],
+    ids=["slow", "errors", "short_batch"],
+)
+def test_unhealthy_or_short_batches_do_not_grow(observation):
+    controller = _controller(healthy_streak=1)
+
+    assert controller.observe(**observation) == DECISION_HOLD
+    assert (controller.batch_size, controller.concurrency) == (100, 4)
+
+
+def test_full_claim_grows_even_when_coalescing_shrank_the_batch():
+    controller = _controller(healthy_streak=1)
+
+    assert controller.observe(items=60, latency_seconds=0.1, claimed=100) == DECISION_INCREASE
+    assert controller.batch_size == 120
+    assert controller.observe(items=60, latency_seconds=0.1, claimed=60) == DECISION_HOLD
+
+
+def test_bulk_mode_keeps_concurrency_fixed():
+    controller = _controller(healthy_streak=1, concurrency=1, adapt_concurrency=False)
+
+    assert _healthy(controller) == DECISION_INCREASE
+    assert (controller.batch_size, controller.concurrency) == (120, 1)
+    assert controller.observe(items=120, latency_seconds=0.1, throttled=True) == DECISION_DECREASE
+    assert (controller.batch_size, controller.concurrency) == (60, 1)
+
+
+def test_slow_batch_resets_the_healthy_streak():
+    controller = _controller()
+
+    _healthy(controller)
+    controller.observe(items=100, latency_seconds=2.0)
+    assert _healthy(controller) == DECISION_HOLD
+    assert _healthy(controller) == DECISION_INCREASE
+
+
+def test_setpoints_are_exported_as_gauges():
+    controller = _controller(projection="test_adaptive_gauges")
+    controller.observe(items=100, latency_seconds=0.1, throttled=True)
+
+    assert outbox_adaptive_batch_size.labels(projection="test_adaptive_gauges")._value.get() == 50
+    assert outbox_adaptive_concurrency.labels(projection="test_adaptive_gauges")._value.get() == 2
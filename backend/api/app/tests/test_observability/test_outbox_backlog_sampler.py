@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from infra.observability.outbox_metrics import (
+    outbox_inflight_events,
+    outbox_lag_events,
+    outbox_oldest_age_seconds,
+    outbox_stuck_processing_events,
+)
+from infra.outbox_core.backlog import BacklogSnapshot, publish_backlog
+
+
+def _value(gauge, projection: str) -> float:
+    return gauge.labels(projection=projection)._value.get()
+
+
+def test_publish_backlog_sets_all_gauges():
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    snapshot = BacklogSnapshot(pending=42, inflight=3, stuck=1, oldest_created_at=now - timedelta(seconds=90))
+
+    publish_backlog("test_backlog", snapshot, now=now)
+
+    assert _value(outbox_lag_events, "test_backlog") == 42
+    assert _value(outbox_inflight_events, "test_backlog") == 3
+    assert _value(outbox_stuck_processing_events, "test_backlog") == 1
+    assert _value(outbox_oldest_age_seconds, "test_backlog") == 90
+
+
+def test_publish_backlog_empty_table_has_zero_age():
+    publish_backlog(
+        "test_backlog_empty",
+        BacklogSnapshot(pending=0, inflight=0, stuck=0, oldest_created_at=None),
+        now=datetime.now(timezone.utc),
+    )
+
+    assert _value(outbox_oldest_age_seconds, "test_backlog_empty") == 0
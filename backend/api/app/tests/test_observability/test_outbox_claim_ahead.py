@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from infra.outbox_core.pipeline import AckWriter, ClaimAhead
+
+
+def _claimer(batches):
+    pending = list(batches)
+    claimed: list[int] = []
+
+    async def claim():
+        if not pending:
+            return None
+        batch = pending.pop(0)
+        claimed.append(batch)
+        return batch
+
+    return claim, claimed
+
+
+async def _no_wait() -> None:
+    await asyncio.sleep(0.001)
+
+
+@pytest.mark.asyncio
+async def test_next_batch_is_claimed_while_current_one_is_processed():
+    claim, claimed = _claimer([1, 2, 3])
+
+    async with ClaimAhead(claim, depth=1, idle_wait=_no_wait, should_claim=lambda: True) as pipeline:
+        first = await pipeline.get(timeout=1.0)
+        await asyncio.sleep(0.01)  # "processing" batch 1
+
+        assert first == 1
+        assert claimed == [1, 2]  # batch 2 claimed meanwhile, batch 3 held back by depth
+        assert pipeline.queued == 1
+
+        assert await pipeline.get(timeout=1.0) == 2
+        assert await pipeline.get(timeout=1.0) == 3
+        assert await pipeline.get(timeout=0.01) is None
+
+
+@pytest.mark.asyncio
+async def test_queued_batches_are_abandoned_on_stop():
+    claim, _ = _claimer([1, 2])
+    released: list[int] = []
+
+    async def on_abandon(batch):
+        released.append(batch)
+
+    pipeline = ClaimAhead(claim, depth=2, idle_wait=_no_wait, should_claim=lambda: True, on_abandon=on_abandon)
+    async with pipeline:
+        await asyncio.sleep(0.01)
+
+    assert released == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_drain_waits_for_the_handed_out_batch():
+    claim, _ = _claimer([1])
+
+    async with ClaimAhead(claim, depth=1, idle_wait=_no_wait, should_claim=lambda: True) as pipeline:
+        assert await pipeline.get(timeout=1.0) == 1
+        drain = asyncio.create_task(pipeline.drain())
+        await asyncio.sleep(0.01)
+        assert not drain.done()
+
+        pipeline.finish_current()
+        await asyncio.wait_for(drain, timeout=1.0)
+
+
+class _SlowWriter:
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.writes: list[list[int]] = []
+
+    async def __call__(self, acks):
+        await self.release.wait()
+        self.writes.append(list(acks))
+
+
+@pytest.mark.asyncio
+async def test_acks_are_written_off_the_worker_loop_and_coalesced():
+    writer = _SlowWriter()
+
+    async with AckWriter(writer, depth=2) as acks:
+        await asyncio.wait_for(acks.submit([1, 2]), timeout=1.0)
+        await asyncio.sleep(0.01)  # the writer task picks up batch 1 and blocks
+        await acks.submit([3])
+        await acks.submit([4])
+        assert writer.writes == []
+
+        # Both slots are taken: the worker loop is held back (backpressure).
+        blocked = asyncio.create_task(acks.submit([5]))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+
+        writer.release.set()
+        await asyncio.wait_for(blocked, timeout=1.0)
+        await asyncio.wait_for(acks.drain(), timeout=1.0)
+
+    assert writer.writes[0] == [1, 2]
+    assert [ack for batch in writer.writes for ack in batch] == [1, 2, 3, 4, 5]
+    assert len(writer.writes) < 4
+
+
+@pytest.mark.asyncio
+async def test_queued_acks_are_written_on_stop_and_errors_do_not_stop_the_stage():
+    written: list[int] = []
+    calls = 0
+
+    async def write(acks):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("database unavailable")
+        written.extend(acks)
+
+    async with AckWriter(write, depth=4) as acks:
+        await acks.submit([1])
+        await acks.drain()
+        await acks.submit([2])
+        await acks.submit([3])
+
+    assert written == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_ack_writer_writes_inline_when_not_started():
+    written: list[int] = []
+
+    async def write(acks):
+        written.extend(acks)
+
+    await AckWriter(write, depth=1).submit([7])
+
+    assert written == [7]
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+from infra.outbox_core.coalesce import coalesce_latest_per_entity
+
+
+def _row(entity_id, version, *, entity_type="block", op="upsert", created_offset=0):
+    return SimpleNamespace(
+        id=uuid4(),
+        entity_type=entity_type,
+        entity_id=entity_id,
+        op=op,
+        event_version=version,
+        created_at=datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=created_offset),
+    )
+
+
+def test_keeps_newest_version_per_entity():
+    a, b = uuid4(), uuid4()
+    a1, b1, a3, a2 = _row(a, 1), _row(b, 5), _row(a, 3), _row(a, 2)
+
+    survivors, superseded = coalesce_latest_per_entity([a1, b1, a3, a2])
+
+    assert survivors == [a3, b1]
+    assert {r.id for r in superseded} == {a1.id, a2.id}
+
+
+def test_newer_delete_supersedes_upserts():
+    a = uuid4()
+    upsert, delete = _row(a, 1), _row(a, 2, op="delete")
+
+    survivors, superseded = coalesce_latest_per_entity([upsert, delete])
+
+    assert survivors == [delete]
+    assert superseded == [upsert]
+
+
+def test_entity_type_is_part_of_the_key_and_ties_use_created_at():
+    a = uuid4()
+    tag = _row(a, 1, entity_type="tag")
+    older, newer = _row(a, 1, created_offset=0), _row(a, 1, created_offset=5)
+
+    survivors, superseded = coalesce_latest_per_entity([tag, older, newer])
+
+    assert survivors == [tag, newer]
+    assert superseded == [older]
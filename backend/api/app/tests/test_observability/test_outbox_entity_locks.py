@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from infra.outbox_core.entity_locks import EntityLockTable
+
+
+@pytest.mark.asyncio
+async def test_entries_are_evicted_when_idle():
+    table = EntityLockTable()
+
+    async with table.hold("block:a"):
+        async with table.hold("block:b"):
+            assert len(table) == 2
+        assert len(table) == 1
+
+    assert len(table) == 0
+
+
+@pytest.mark.asyncio
+async def test_same_key_serializes_in_acquisition_order():
+    table = EntityLockTable()
+    order: list[str] = []
+    release_first = asyncio.Event()
+
+    async def first():
+        async with table.hold("block:a"):
+            order.append("first:start")
+            await release_first.wait()
+            order.append("first:end")
+
+    async def second():
+        async with table.hold("block:a"):
+            order.append("second")
+
+    t1 = asyncio.create_task(first())
+    await asyncio.sleep(0)
+    t2 = asyncio.create_task(second())
+    await asyncio.sleep(0)
+    assert len(table) == 1  # one entry, two holders
+
+    release_first.set()
+    await asyncio.gather(t1, t2)
+
+    assert order == ["first:start", "first:end", "second"]
+    assert len(table) == 0
+
+
+@pytest.mark.asyncio
+async def test_entry_is_released_on_error():
+    table = EntityLockTable()
+
+    with pytest.raises(RuntimeError):
+        async with table.hold("block:a"):
+            raise RuntimeError("boom")
+
+    assert len(table) == 0
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from infra.database.models.chronicle_outbox_models import ChronicleOutboxEventModel
+from infra.database.models.search_outbox_models import SearchOutboxEventModel
+from infra.outbox_core.retention import purge_done_rows
+
+# Far in the past, so rows already in the test database are never expired here.
+NOW = datetime(2000, 1, 8, tzinfo=timezone.utc)
+RETENTION_SECONDS = 7 * 24 * 3600
+
+
+def _row(model, *, status: str = "done", age_days: float, replay_count: int = 0):
+    return model(
+        entity_type="block",
+        entity_id=uuid4(),
+        op="upsert",
+        status=status,
+        processed_at=NOW - timedelta(days=age_days) if status == "done" else None,
+        replay_count=replay_count,
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("model", [SearchOutboxEventModel, ChronicleOutboxEventModel])
+async def test_purge_deletes_oldest_expired_done_rows_in_batches(db_session, model):
+    oldest, older, old = (_row(model, age_days=days) for days in (12, 10, 8))
+    kept = [
+        _row(model, age_days=2),  # inside the retention window
+        _row(model, status="failed", age_days=30),  # waits for manual replay
+        _row(model, status="pending", age_days=30),
+        _row(model, age_days=30, replay_count=1),  # keeps the replay audit trail
+    ]
+    db_session.add_all([oldest, older, old, *kept])
+    await db_session.flush()
+    ids = [row.id for row in (oldest, older, old, *kept)]
+
+    first = await purge_done_rows(db_session, model, now=NOW, retention_seconds=RETENTION_SECONDS, batch_size=2)
+    second = await purge_done_rows(db_session, model, now=NOW, retention_seconds=RETENTION_SECONDS, batch_size=2)
+
+    assert (first, second) == (2, 1)
+    left = set((await db_session.execute(select(model.id).where(model.id.in_(ids)))).scalars())
+    assert left == {row.id for row in kept}
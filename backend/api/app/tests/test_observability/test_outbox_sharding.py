@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from infra.database.models.search_outbox_models import SearchOutboxEventModel
+from infra.outbox_core.sharding import ShardLeaseManager, shard_of
+
+
+class _SessionScope:
+    """Hands the test's db_session to code that opens its own sessions."""
+
+    def __init__(self, session):
+        self._session = session
+
+    async def __aenter__(self):
+        return self._session
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+
+def _manager(db_session, worker_id: str, **kwargs) -> ShardLeaseManager:
+    return ShardLeaseManager(
+        lambda: _SessionScope(db_session),
+        projection="search_es_test",
+        worker_id=worker_id,
+        **kwargs,
+    )
+
+
+async def _outbox_rows(db_session, count: int) -> list[SearchOutboxEventModel]:
+    entity_id = uuid4()
+    rows = [
+        SearchOutboxEventModel(entity_type="block", entity_id=entity_id, op="upsert", event_version=1),
+        SearchOutboxEventModel(entity_type="block", entity_id=entity_id, op="upsert", event_version=2),
+    ]
+    rows += [
+        SearchOutboxEventModel(entity_type="block", entity_id=uuid4(), op="upsert", event_version=1)
+        for _ in range(count)
+    ]
+    db_session.add_all(rows)
+    await db_session.flush()
+    return rows
+
+
+@pytest.mark.asyncio
+async def test_shard_of_keeps_an_entity_in_one_non_negative_bucket(db_session):
+    rows = await _outbox_rows(db_session, 30)
+
+    buckets = dict(
+        (
+            await db_session.execute(
+                select(SearchOutboxEventModel.id, shard_of(SearchOutboxEventModel, 16)).where(
+                    SearchOutboxEventModel.id.in_([row.id for row in rows])
+                )
+            )
+        ).all()
+    )
+
+    assert set(buckets.values()) <= set(range(16))
+    assert len(set(buckets.values())) > 1
+    assert buckets[rows[0].id] == buckets[rows[1].id]
+
+
+@pytest.mark.asyncio
+async def test_workers_split_buckets_and_claim_only_their_own(db_session):
+    w1 = _manager(db_session, "w1", partitions=8)
+    w2 = _manager(db_session, "w2", partitions=8)
+
+    assert await w1.rebalance() == frozenset(range(8))
+    # w2 joins: nothing is free until w1 gives up its extras.
+    assert await w2.rebalance() == frozenset()
+    first = await w1.rebalance()
+    second = await w2.rebalance()
+
+    assert len(first) == len(second) == 4
+    assert first | second == frozenset(range(8))
+
+    rows = await _outbox_rows(db_session, 30)
+    claimable = (
+        await db_session.execute(
+            select(shard_of(SearchOutboxEventModel, 8)).where(
+                SearchOutboxEventModel.id.in_([row.id for row in rows]),
+                w1.claim_predicate(SearchOutboxEventModel),
+            )
+        )
+    ).scalars().all()
+    assert claimable
+    assert set(claimable) <= first
+
+    await w1.release_all()
+    assert w1.owned == frozenset()
+    assert await w2.rebalance() == frozenset(range(8))
+
+
+@pytest.mark.asyncio
+async def test_owned_buckets_lapse_with_the_local_lease(db_session):
+    shards = _manager(db_session, "w1", partitions=4, lease_seconds=1)
+
+    assert await shards.rebalance() == frozenset(range(4))
+    assert shards.owned == frozenset(range(4))
+
+    # Not renewed: the local view expires before the DB lease does.
+    await asyncio.sleep(0.85)
+    assert shards.owned == frozenset()
@@ -0,0 +1,23 @@
+import asyncio
+
+import pytest
+
+from infra.outbox_core.notify import OutboxWakeup, _libpq_dsn
+
+
+def test_libpq_dsn_strips_sqlalchemy_driver():
+    assert _libpq_dsn("postgresql+psycopg://u:p@h:5432/db") == "postgresql://u:p@h:5432/db"
+    assert _libpq_dsn("postgresql://u:p@h/db") == "postgresql://u:p@h/db"
+
+
+@pytest.mark.asyncio
+async def test_wait_falls_back_to_timeout_and_wakes_early():
+    wakeup = OutboxWakeup("postgresql://unused/db", "test_channel")
+
+    assert await wakeup.wait(0.01) is False
+
+    asyncio.get_running_loop().call_later(0.01, wakeup.wake)
+    assert await wakeup.wait(5.0) is True
+
+    # The wakeup is consumed; the next wait times out again.
+    assert await wakeup.wait(0.01) is False
@@ -0,0 +1,66 @@
+import pytest
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from sqlalchemy import select
+
+from api.app.modules.book.domain import Book
+from api.app.modules.bookshelf.domain import Bookshelf
+from api.app.modules.library.domain import Library
+
+from infra.database.models.book_models import BookModel
+from infra.storage.book_repository_impl import SQLAlchemyBookRepository
+from infra.storage.bookshelf_repository_impl import SQLAlchemyBookshelfRepository
+from infra.storage.chronicle_activity_rollup import record_chronicle_activity
+from infra.storage.library_repository_impl import SQLAlchemyLibraryRepository
+
+
+@pytest.mark.asyncio
+async def test_book_repo_save_keeps_projected_visit_counters_sqlalchemy(db_session):
+    library_repo = SQLAlchemyLibraryRepository(db_session)
+    bookshelf_repo = SQLAlchemyBookshelfRepository(db_session)
+    book_repo = SQLAlchemyBookRepository(db_session)
+
+    library = Library.create(user_id=uuid4(), name="contract-library")
+    # Bootstrap Library + Basement bookshelf (circular FK) the same way the
+    # CreateLibrary use case does.
+    basement_id = library.basement_bookshelf_id
+    library.basement_bookshelf_id = None
+    await library_repo.save(library)
+    library.basement_bookshelf_id = basement_id
+    await bookshelf_repo.save(Bookshelf.create_basement(library_id=library.id, bookshelf_id=basement_id))
+    await library_repo.save(library)
+
+    bookshelf = Bookshelf.create(library_id=library.id, name="contract-shelf")
+    await bookshelf_repo.save(bookshelf)
+    book = Book.create(bookshelf_id=bookshelf.id, library_id=library.id, title="contract-book")
+    await book_repo.save(book)
+
+    # 1) a request loads the book (visit counters still empty)
+    snapshot = await book_repo.get_by_id(book.id)
+    assert snapshot is not None
+    assert snapshot.visit_count_90d == 0
+
+    # 2) meanwhile the chronicle projector counts a view
+    viewed_at = datetime.now(timezone.utc)
+    await record_chronicle_activity(
+        db_session,
+        book_id=book.id,
+        event_type="book_opened",
+        occurred_at=viewed_at,
+        today=viewed_at.date(),
+    )
+
+    # 3) the request saves its stale snapshot
+    snapshot.rename("contract-book-renamed")
+    await book_repo.save(snapshot)
+
+    row = (
+        await db_session.execute(
+            select(BookModel.title, BookModel.visit_count_90d, BookModel.last_visited_at).where(
+                BookModel.id == book.id
+            )
+        )
+    ).one()
+    assert row.title == "contract-book-renamed"
+    assert (row.visit_count_90d, row.last_visited_at) == (1, viewed_at)
@@ -0,0 +1,80 @@
+import json
+from dataclasses import replace
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from api.app.modules.search.application.ports.candidate_provider import CandidateScope
+from infra.search.elastic_candidate_provider import ElasticCandidateProvider
+from infra.search.elastic_client import get_elastic_config
+
+
+def _provider(handler) -> ElasticCandidateProvider:
+    client = httpx.AsyncClient(base_url="http://es.test", transport=httpx.MockTransport(handler))
+    return ElasticCandidateProvider(client=client, config=get_elastic_config())
+
+
+@pytest.mark.asyncio
+async def test_elastic_provider_uses_async_client_and_parses_hits():
+    block_id = uuid4()
+    seen: dict = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["path"] = request.url.path
+        seen["body"] = json.loads(request.content)
+        return httpx.Response(
+            200,
+            json={
+                "hits": {
+                    "hits": [
+                        {
+                            "_score": 1.5,
+                            "_source": {"entity_id": str(block_id), "event_version": 7, "snippet": "s"},
+                            "highlight": {"text": ["hl"]},
+                        },
+                        {"_source": {"entity_id": "not-a-uuid"}},
+                    ]
+                }
+            },
+        )
+
+    candidates = await _provider(handler).get_block_candidates(q="quantum", candidate_limit=5)
+
+    assert seen["path"].endswith("/_search")
+    assert seen["body"]["size"] == 5
+    assert [(c.entity_id, c.order_key, c.snippet, c.score) for c in candidates] == [(block_id, 7, "hl", 1.5)]
+
+
+@pytest.mark.asyncio
+async def test_elastic_provider_wraps_http_errors():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503, text="unavailable")
+
+    with pytest.raises(RuntimeError, match="Elastic HTTPError 503"):
+        await _provider(handler).get_block_candidates(q="q", candidate_limit=1)
+
+
+@pytest.mark.asyncio
+async def test_elastic_provider_pushes_scope_into_filter_context():
+    library_id, book_id = uuid4(), uuid4()
+    seen: dict = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["body"] = json.loads(request.content)
+        return httpx.Response(200, json={"hits": {"hits": []}})
+
+    client = httpx.AsyncClient(base_url="http://es.test", transport=httpx.MockTransport(handler))
+    provider = ElasticCandidateProvider(
+        client=client,
+        config=replace(get_elastic_config(), filter_book_id=True),
+    )
+    scope = CandidateScope(library_id=library_id, book_id=book_id, entity_types=("block", "book"))
+
+    await provider.get_block_candidates(q="q", candidate_limit=10, scope=scope)
+
+    assert seen["body"]["query"]["bool"]["filter"] == [
+        {"terms": {"entity_type": ["block", "book"]}},
+        {"term": {"library_id": str(library_id)}},
+        {"term": {"book_id": str(book_id)}},
+    ]
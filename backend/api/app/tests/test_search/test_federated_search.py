@@ -0,0 +1,137 @@
+import base64
+import json
+from contextlib import asynccontextmanager
+from uuid import UUID
+
+import pytest
+
+from api.app.modules.search.application.federated_search_service import FederatedSearchService
+from api.app.modules.search.domain import (
+    InvalidQueryError,
+    SearchCursor,
+    SearchEntityType,
+    SearchHit,
+    SearchQuery,
+)
+
+
+def _uuid(n: int) -> UUID:
+    return UUID(int=n)
+
+
+def _hit(entity_type: str, n: int, score: float) -> SearchHit:
+    return SearchHit(
+        entity_type=SearchEntityType(entity_type),
+        entity_id=_uuid(n),
+        title=f"{entity_type}-{n}",
+        snippet="",
+        score=score,
+        path="",
+    )
+
+
+CORPUS = {
+    "block": [_hit("block", 1, 0.9), _hit("block", 2, 0.5), _hit("block", 3, 0.5), _hit("block", 4, 0.1)],
+    "book": [_hit("book", 5, 0.7), _hit("book", 6, 0.5), _hit("book", 7, 0.2)],
+}
+
+
+class _FakeSource:
+    """Mimics PostgresSearchAdapter.search_entity_type_page over an in-memory corpus."""
+
+    def __init__(self, session):
+        self._session = session
+
+    async def search_entity_type_page(self, query, entity_type, *, fetch_limit, after=None):
+        rows = sorted(CORPUS[entity_type], key=lambda h: (-h.score, h.entity_id))
+        if after is None:
+            return len(CORPUS[entity_type]), rows[:fetch_limit], False
+        rows = [
+            h
+            for h in rows
+            if (-h.score, entity_type, h.entity_id) > (-after.score, after.entity_type, after.entity_id)
+        ]
+        return None, rows[:fetch_limit], False
+
+
+@asynccontextmanager
+async def _session_factory():
+    yield None
+
+
+def _service() -> FederatedSearchService:
+    return FederatedSearchService(session_factory=_session_factory, source_factory=_FakeSource)
+
+
+def _ids(page) -> list[int]:
+    return [h.entity_id.int for h in page.result.hits]
+
+
+def test_search_cursor_round_trip():
+    cursor = SearchCursor(
+        score=0.123456789,
+        entity_type="block",
+        entity_id=_uuid(42),
+        total=1000,
+        total_capped=True,
+    )
+    assert SearchCursor.decode(cursor.encode()) == cursor
+
+
+def test_search_cursor_rejects_garbage():
+    with pytest.raises(InvalidQueryError):
+        SearchCursor.decode("not-a-cursor")
+
+
+@pytest.mark.parametrize("fields", [{"s": float("nan")}, {"s": float("inf")}, {"n": -1}])
+def test_search_cursor_rejects_impossible_positions(fields):
+    data = {"s": 0.5, "t": "block", "i": str(_uuid(1)), "n": 7, "c": 0, "q": "", **fields}
+    token = base64.urlsafe_b64encode(json.dumps(data).encode("utf-8")).decode("ascii")
+
+    with pytest.raises(InvalidQueryError):
+        SearchCursor.decode(token)
+
+
+@pytest.mark.asyncio
+async def test_federated_search_rejects_a_cursor_from_another_query():
+    service = _service()
+    page = await service.search(SearchQuery(text="q", limit=2))
+
+    # Same search, other page size: still the same result set.
+    await service.search(SearchQuery(text="q", limit=3), cursor=page.next_cursor)
+    for other in (SearchQuery(text="other", limit=2), SearchQuery(text="q", limit=2, library_id=_uuid(9))):
+        with pytest.raises(InvalidQueryError):
+            await service.search(other, cursor=page.next_cursor)
+
+
+@pytest.mark.asyncio
+async def test_federated_search_merges_types_by_score_and_reports_total():
+    page = await _service().search(SearchQuery(text="q", limit=3))
+
+    assert _ids(page) == [1, 5, 2]
+    assert page.result.total == 7
+    assert page.next_cursor is not None
+
+
+@pytest.mark.asyncio
+async def test_federated_search_cursor_walks_all_hits_without_gaps_or_duplicates():
+    service = _service()
+    seen: list[int] = []
+    cursor = None
+    while True:
+        page = await service.search(SearchQuery(text="q", limit=2), cursor=cursor)
+        assert page.result.total == 7
+        seen.extend(_ids(page))
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    # Equal scores (0.5) tie-break on entity_type, then entity_id.
+    assert seen == [1, 5, 2, 3, 6, 7, 4]
+
+
+@pytest.mark.asyncio
+async def test_federated_search_offset_page_matches_global_order():
+    page = await _service().search(SearchQuery(text="q", limit=2, offset=2))
+
+    assert _ids(page) == [2, 3]
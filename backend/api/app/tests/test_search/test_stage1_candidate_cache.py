@@ -0,0 +1,152 @@
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import text, update
+
+from api.app.modules.block.domain.events import BlockCreated, BlockDeleted
+from api.app.modules.search.application.ports.candidate_provider import Candidate
+from infra.database.models.search_outbox_models import SearchOutboxEventModel
+from infra.event_bus.handlers.search_index_handlers import on_block_created, on_block_deleted
+from infra.search.stage1_candidate_cache import (
+    CachedCandidateProvider,
+    Stage1CandidateCache,
+    read_search_index_watermark,
+    read_search_outbox_ack_watermark,
+)
+
+
+class _CountingProvider:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_block_candidates(self, *, q, candidate_limit, scope=None, after=None) -> list[Candidate]:
+        self.calls += 1
+        return [Candidate(entity_id=UUID(int=self.calls), order_key=self.calls)]
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _provider(cache: Stage1CandidateCache, watermark: list[int]):
+    inner = _CountingProvider()
+
+    async def _read_watermark() -> int:
+        return watermark[0]
+
+    return inner, CachedCandidateProvider(inner, cache, watermark=_read_watermark)
+
+
+@pytest.mark.asyncio
+async def test_repeated_normalized_query_is_served_from_cache():
+    inner, provider = _provider(Stage1CandidateCache(provider="test"), [1])
+
+    first = await provider.get_block_candidates(q="Quantum  Physics", candidate_limit=10)
+    second = await provider.get_block_candidates(q=" quantum physics ", candidate_limit=10)
+    await provider.get_block_candidates(q="quantum physics", candidate_limit=20)
+
+    assert first == second
+    assert inner.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_watermark_move_flushes_cache():
+    watermark = [1]
+    inner, provider = _provider(Stage1CandidateCache(provider="test"), watermark)
+
+    await provider.get_block_candidates(q="q", candidate_limit=10)
+    watermark[0] = 2
+    refreshed = await provider.get_block_candidates(q="q", candidate_limit=10)
+
+    assert inner.calls == 2
+    assert refreshed[0].entity_id == UUID(int=2)
+
+
+@pytest.mark.asyncio
+async def test_ttl_expiry_and_lru_bound():
+    clock = _Clock()
+    cache = Stage1CandidateCache(provider="test", max_entries=2, ttl_seconds=5.0, clock=clock)
+    inner, provider = _provider(cache, [1])
+
+    await provider.get_block_candidates(q="a", candidate_limit=10)
+    clock.now = 6.0
+    await provider.get_block_candidates(q="a", candidate_limit=10)
+    assert inner.calls == 2
+
+    await provider.get_block_candidates(q="b", candidate_limit=10)
+    await provider.get_block_candidates(q="c", candidate_limit=10)
+    assert len(cache) == 2
+    assert cache.get("a", 10) is None
+
+
+@pytest.mark.asyncio
+async def test_elastic_watermark_moves_on_outbox_ack_not_on_projection(db_session):
+    block_id = uuid4()
+    index_before = await read_search_index_watermark(db_session)
+    acked_before = await read_search_outbox_ack_watermark(db_session)
+
+    await on_block_created(
+        BlockCreated(
+            block_id=block_id,
+            book_id=uuid4(),
+            block_type="text",
+            content="quantum",
+            order=1.0,
+            occurred_at=datetime.now(timezone.utc),
+        ),
+        db_session,
+    )
+
+    # search_index moved and the outbox row is queued, but ES has not been written yet.
+    await _fire_commit_triggers(db_session)
+    assert await read_search_index_watermark(db_session) > index_before
+    assert await read_search_outbox_ack_watermark(db_session) == acked_before
+
+    await db_session.execute(
+        update(SearchOutboxEventModel)
+        .where(SearchOutboxEventModel.entity_id == block_id)
+        .values(status="done", processed_at=datetime.now(timezone.utc))
+    )
+
+    assert await read_search_outbox_ack_watermark(db_session) > acked_before
+
+
+async def _fire_commit_triggers(db_session, *, new_transaction: bool = False) -> None:
+    """Run the deferred watermark trigger now (the test transaction never commits)."""
+    if new_transaction:
+        # The trigger bumps once per transaction; forget that it already did.
+        await db_session.execute(text("SELECT set_config('wordloom.search_index_watermark_bumped', '', true)"))
+    await db_session.execute(text("SET CONSTRAINTS ALL IMMEDIATE"))
+    await db_session.execute(text("SET CONSTRAINTS ALL DEFERRED"))
+
+
+@pytest.mark.asyncio
+async def test_postgres_watermark_moves_on_delete(db_session):
+    block_id, book_id = uuid4(), uuid4()
+    await on_block_created(
+        BlockCreated(block_id=block_id, book_id=book_id, block_type="text", content="quantum", order=1.0),
+        db_session,
+    )
+    await _fire_commit_triggers(db_session)
+    before = await read_search_index_watermark(db_session)
+
+    await on_block_deleted(
+        BlockDeleted(
+            block_id=block_id,
+            book_id=book_id,
+            prev_sibling_id=None,
+            next_sibling_id=None,
+            section_path=None,
+        ),
+        db_session,
+    )
+    # Nothing moves until the deleting transaction commits.
+    assert await read_search_index_watermark(db_session) == before
+
+    await _fire_commit_triggers(db_session, new_transaction=True)
+    assert await read_search_index_watermark(db_session) > before
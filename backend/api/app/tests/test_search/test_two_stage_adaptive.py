@@ -0,0 +1,73 @@
+from uuid import UUID
+
+import pytest
+
+from api.app.modules.search.application.dtos import BlockSearchHit
+from api.app.modules.search.application.ports.candidate_provider import Candidate, CandidateScope
+from api.app.modules.search.application.two_stage_search_service import (
+    Stage2SurvivalStats,
+    TwoStageSearchService,
+)
+from infra.search.fake_elastic_candidate_provider import FakeElasticCandidateProvider
+
+
+class _RecordingProvider(FakeElasticCandidateProvider):
+    def __init__(self, candidates):
+        super().__init__(candidates)
+        self.calls = []
+
+    async def get_block_candidates(self, *, q, candidate_limit, scope=None, after=None):
+        self.calls.append((candidate_limit, scope, after))
+        return await super().get_block_candidates(
+            q=q, candidate_limit=candidate_limit, scope=scope, after=after
+        )
+
+
+class _OddOnlyService(TwoStageSearchService):
+    """Stage2 stand-in: only odd order_keys survive the business filter."""
+
+    async def _filter_candidates(self, candidates, *, book_id, limit, library_id=None):
+        return [
+            BlockSearchHit(id=c.entity_id, snippet=c.snippet, score=c.score, tags=[])
+            for c in candidates
+            if c.order_key % 2
+        ][:limit]
+
+
+def _corpus(n: int) -> list[Candidate]:
+    return [Candidate(entity_id=UUID(int=i), order_key=i, snippet=f"s{i}") for i in range(n, 0, -1)]
+
+
+@pytest.mark.asyncio
+async def test_adaptive_refills_stage1_until_limit_is_met():
+    provider = _RecordingProvider(_corpus(100))
+    stats = Stage2SurvivalStats()
+    service = _OddOnlyService(None, provider, stats, min_candidate_limit=10, max_rounds=5)
+
+    hits = await service.search_block_hits(q="q", book_id=None, limit=12, candidate_limit=None)
+
+    assert [h.id.int for h in hits] == list(range(99, 75, -2))
+    assert len(provider.calls) == 2
+    assert provider.calls[1][2].order_key == 83
+    assert stats.ratio("global") == pytest.approx(0.5)
+
+
+@pytest.mark.asyncio
+async def test_adaptive_stops_when_stage1_is_exhausted_and_pushes_scope_down():
+    provider = _RecordingProvider(_corpus(6))
+    book_id = UUID(int=999)
+    service = _OddOnlyService(None, provider, Stage2SurvivalStats(), min_candidate_limit=4)
+
+    hits = await service.search_block_hits(q="q", book_id=book_id, limit=10, candidate_limit=None)
+
+    assert [h.id.int for h in hits] == [5, 3, 1]
+    assert provider.calls[0][1] == CandidateScope(book_id=book_id)
+
+
+def test_survival_stats_size_stage1_from_learned_ratio():
+    stats = Stage2SurvivalStats()
+    stats.observe("book", candidates=100, survivors=10)
+
+    assert stats.candidate_limit("book", 20, minimum=50, maximum=2000) == 300
+    assert stats.candidate_limit("global", 20, minimum=50, maximum=2000) == 50
+    assert stats.candidate_limit("book", 1000, minimum=50, maximum=2000) == 2000
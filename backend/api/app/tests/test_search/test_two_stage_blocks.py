@@ -265,3 +265,79 @@ async def test_two_stage_block_search_can_swap_stage1_provider_only(db_session):
     assert [h.id for h in hits] == [block_id]
     assert hits[0].snippet == "fake-1"
     assert sorted(hits[0].tags) == ["tag-a", "tag-b"]
+
+
+@pytest.mark.asyncio
+async def test_two_stage_block_search_enforces_library_scope_in_stage2(db_session):
+    user_id = uuid4()
+
+    library_id = uuid4()
+    other_library_id = uuid4()
+    bookshelf_id = uuid4()
+    other_bookshelf_id = uuid4()
+
+    book_id = uuid4()
+    other_library_book_id = uuid4()
+
+    block_id = uuid4()
+    other_library_block_id = uuid4()
+
+    library = LibraryModel(id=library_id, user_id=user_id, name="L")
+    other_library = LibraryModel(id=other_library_id, user_id=user_id, name="L2")
+    shelf = BookshelfModel(id=bookshelf_id, library_id=library_id, name="S")
+    other_shelf = BookshelfModel(id=other_bookshelf_id, library_id=other_library_id, name="S2")
+
+    book = BookModel(id=book_id, bookshelf_id=bookshelf_id, library_id=library_id, title="B")
+    other_library_book = BookModel(
+        id=other_library_book_id,
+        bookshelf_id=other_bookshelf_id,
+        library_id=other_library_id,
+        title="B2",
+    )
+
+    block = BlockModel(id=block_id, book_id=book_id, type="paragraph", content="alpha", order=0)
+    other_library_block = BlockModel(
+        id=other_library_block_id,
+        book_id=other_library_book_id,
+        type="paragraph",
+        content="beta",
+        order=0,
+    )
+
+    db_session.add_all([library, other_library])
+    await db_session.flush()
+
+    db_session.add_all([shelf, other_shelf])
+    await db_session.flush()
+
+    db_session.add_all([book, other_library_book])
+    await db_session.flush()
+
+    db_session.add_all([block, other_library_block])
+    await db_session.flush()
+
+    # A provider that ignores scope (stale ES doc, fake) must not leak other libraries.
+    fake_provider = FakeElasticCandidateProvider(
+        candidates=[
+            Candidate(entity_id=other_library_block_id, order_key=20, snippet="fake-2"),
+            Candidate(entity_id=block_id, order_key=10, snippet="fake-1"),
+        ]
+    )
+
+    repo = PostgresSearchAdapter(db_session)
+    scoped = await repo.search_block_hits_two_stage(
+        q="ignored-by-fake",
+        library_id=library_id,
+        limit=20,
+        candidate_limit=200,
+        candidate_provider=fake_provider,
+    )
+    unscoped = await repo.search_block_hits_two_stage(
+        q="ignored-by-fake",
+        limit=20,
+        candidate_limit=200,
+        candidate_provider=fake_provider,
+    )
+
+    assert [h.id for h in scoped] == [block_id]
+    assert [h.id for h in unscoped] == [other_library_block_id, block_id]
@@ -0,0 +1,76 @@
+from uuid import uuid4
+
+import pytest
+
+from api.app.modules.search.application.typeahead_service import TypeaheadService
+from infra.database.models.book_models import BookModel
+from infra.database.models.bookshelf_models import BookshelfModel
+from infra.database.models.library_models import LibraryModel
+from infra.database.models.tag_models import TagModel
+
+
+@pytest.mark.asyncio
+async def test_typeahead_ranks_prefix_matches_first_across_types(db_session):
+    marker = uuid4().hex[:8]
+    user_id = uuid4()
+    library_id = uuid4()
+    bookshelf_id = uuid4()
+
+    library = LibraryModel(id=library_id, user_id=user_id, name=f"{marker} library")
+    shelf = BookshelfModel(id=bookshelf_id, library_id=library_id, name="S")
+    prefix_book = BookModel(
+        id=uuid4(), bookshelf_id=bookshelf_id, library_id=library_id, title=f"{marker}ology notes"
+    )
+    infix_book = BookModel(
+        id=uuid4(), bookshelf_id=bookshelf_id, library_id=library_id, title=f"On {marker}"
+    )
+    tag = TagModel(id=uuid4(), user_id=user_id, name=f"{marker}-tag")
+
+    db_session.add(library)
+    await db_session.flush()
+    db_session.add(shelf)
+    await db_session.flush()
+    db_session.add_all([prefix_book, infix_book, tag])
+    await db_session.flush()
+
+    suggestions = await TypeaheadService(db_session).suggest(marker[:5].upper(), user_id=user_id, limit=10)
+
+    labels = [s.label for s in suggestions]
+    assert set(labels) >= {library.name, prefix_book.title, infix_book.title, tag.name}
+    assert labels.index(infix_book.title) == len(labels) - 1
+
+    books_only = await TypeaheadService(db_session).suggest(
+        marker[:5], user_id=user_id, entity_types=["book"], library_id=library_id
+    )
+    assert {s.entity_type for s in books_only} == {"book"}
+
+
+@pytest.mark.asyncio
+async def test_typeahead_only_suggests_the_callers_own_names(db_session):
+    marker = uuid4().hex[:8]
+    owner_id, other_id = uuid4(), uuid4()
+    library_id = uuid4()
+    bookshelf_id = uuid4()
+
+    db_session.add(LibraryModel(id=library_id, user_id=other_id, name=f"{marker} private library"))
+    await db_session.flush()
+    db_session.add(BookshelfModel(id=bookshelf_id, library_id=library_id, name="S"))
+    await db_session.flush()
+    db_session.add_all(
+        [
+            BookModel(id=uuid4(), bookshelf_id=bookshelf_id, library_id=library_id, title=f"{marker} diary"),
+            TagModel(id=uuid4(), user_id=other_id, name=f"{marker}-secret"),
+            TagModel(id=uuid4(), user_id=owner_id, name=f"{marker}-mine"),
+        ]
+    )
+    await db_session.flush()
+
+    suggestions = await TypeaheadService(db_session).suggest(marker, user_id=owner_id)
+
+    assert [s.label for s in suggestions] == [f"{marker}-mine"]
+
+
+@pytest.mark.asyncio
+async def test_typeahead_rejects_unknown_types(db_session):
+    with pytest.raises(ValueError):
+        await TypeaheadService(db_session).suggest("abc", user_id=uuid4(), entity_types=["block"])
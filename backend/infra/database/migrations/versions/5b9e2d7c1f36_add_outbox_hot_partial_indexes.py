@@ -0,0 +1,82 @@
+"""Replace full outbox claim indexes with partial indexes over unprocessed rows
+
+Revision ID: 5b9e2d7c1f36
+Revises: 8e1d6c2b4a97
+Create Date: 2026-10-17
+
+Purpose:
+- search_outbox_events / chronicle_outbox_events keep done rows until
+  retention removes them (infra/outbox_core/retention.py). The old claim
+  indexes covered every row, so they grew with history.
+- The new indexes only contain rows with processed_at IS NULL. Claim and
+  backlog queries touch a small hot set no matter how much history is kept:
+    * *_claim_hot:    claim order for pending rows
+                      (search: event_version; chronicle: created_at, id)
+    * *_unprocessed:  lag/oldest-age sampling (BacklogSampler)
+
+Indexes are built/dropped CONCURRENTLY so writers are not blocked.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "5b9e2d7c1f36"
+down_revision: Union[str, Sequence[str], None] = "8e1d6c2b4a97"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_PARTIAL_INDEXES: tuple[tuple[str, str, str, str], ...] = (
+    (
+        "idx_search_outbox_claim_hot",
+        "search_outbox_events",
+        "event_version",
+        "processed_at IS NULL AND status = 'pending'",
+    ),
+    (
+        "idx_search_outbox_unprocessed",
+        "search_outbox_events",
+        "created_at",
+        "processed_at IS NULL",
+    ),
+    (
+        "idx_chronicle_outbox_claim_hot",
+        "chronicle_outbox_events",
+        "created_at, id",
+        "processed_at IS NULL AND status = 'pending'",
+    ),
+    (
+        "idx_chronicle_outbox_unprocessed",
+        "chronicle_outbox_events",
+        "created_at",
+        "processed_at IS NULL",
+    ),
+)
+
+_FULL_CLAIM_INDEXES: tuple[tuple[str, str], ...] = (
+    ("idx_search_outbox_claim", "search_outbox_events"),
+    ("idx_chronicle_outbox_claim", "chronicle_outbox_events"),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in _PARTIAL_INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns}) WHERE {where}")
+        for name, _ in _FULL_CLAIM_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table in _FULL_CLAIM_INDEXES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} "
+                "(status, next_retry_at, lease_until, event_version)"
+            )
+        for name, _, _, _ in reversed(_PARTIAL_INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
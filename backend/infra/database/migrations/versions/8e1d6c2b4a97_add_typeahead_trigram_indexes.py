@@ -0,0 +1,51 @@
+"""Add pg_trgm indexes for search-as-you-type (tags, libraries, books)
+
+Revision ID: 8e1d6c2b4a97
+Revises: f3b8d41c7a20
+Create Date: 2026-10-17
+
+Purpose:
+- Typeahead (GET /search/suggest) matches partial input with LIKE '%kw%' and
+  ranks prefix hits first; trigram GIN indexes make both index-driven.
+- The same indexes serve existing leading-wildcard lookups:
+    * tags:      lower(name) LIKE '%kw%'   (SQLAlchemyTagRepository.find_by_name)
+    * libraries: name/description ILIKE    (library overview search)
+    * books:     title ILIKE               (typeahead)
+
+Indexes are built CONCURRENTLY so writers are not blocked.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "8e1d6c2b4a97"
+down_revision: Union[str, Sequence[str], None] = "f3b8d41c7a20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_INDEXES: tuple[tuple[str, str, str], ...] = (
+    ("idx_tags_name_lower_trgm", "tags", "lower(name) gin_trgm_ops"),
+    ("idx_libraries_name_trgm", "libraries", "name gin_trgm_ops"),
+    ("idx_libraries_description_trgm", "libraries", "description gin_trgm_ops"),
+    ("idx_books_title_trgm", "books", "title gin_trgm_ops"),
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        for name, table, expr in _INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} USING gin ({expr})")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(_INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    # pg_trgm is left installed: other objects may depend on it.
@@ -0,0 +1,54 @@
+"""Add outbox shard lease + consumer tables for sharded outbox workers.
+
+Revision ID: a6d3f8e2b5c1
+Revises: 5b9e2d7c1f36
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a6d3f8e2b5c1"
+down_revision = "5b9e2d7c1f36"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "outbox_shard_leases",
+        sa.Column("projection_name", sa.String(length=100), primary_key=True, nullable=False),
+        sa.Column("shard_id", sa.Integer(), primary_key=True, nullable=False),
+        sa.Column("owner", sa.String(length=120), nullable=True),
+        sa.Column("lease_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("timezone('utc', now())"),
+        ),
+    )
+    op.create_index("ix_outbox_shard_leases_owner", "outbox_shard_leases", ["owner"], unique=False)
+
+    op.create_table(
+        "outbox_consumers",
+        sa.Column("projection_name", sa.String(length=100), primary_key=True, nullable=False),
+        sa.Column("worker_id", sa.String(length=120), primary_key=True, nullable=False),
+        sa.Column("heartbeat_until", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "joined_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("timezone('utc', now())"),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("outbox_consumers")
+    op.drop_index("ix_outbox_shard_leases_owner", table_name="outbox_shard_leases")
+    op.drop_table("outbox_shard_leases")
@@ -0,0 +1,70 @@
+"""Add search_index_watermark: a commit-time change counter for search_index
+
+Revision ID: b3e9d2a7c6f4
+Revises: e8a2c6f4b1d3
+Create Date: 2026-10-17
+
+Purpose:
+- The Stage1 candidate cache flushes when search_index changes. MAX(event_version)
+  missed deletes and late commits carrying an older occurred_at.
+- A one-row counter is bumped by a deferred constraint trigger, so the new value
+  becomes visible exactly when the writing transaction commits.
+
+Cost:
+- The counter row is only locked at commit time (deferred trigger), not for the
+  whole writing transaction.
+- One bump per transaction: a transaction-local setting short-circuits the
+  trigger for the remaining rows of the same transaction.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "b3e9d2a7c6f4"
+down_revision: Union[str, Sequence[str], None] = "e8a2c6f4b1d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "search_index_watermark",
+        sa.Column("id", sa.SmallInteger(), primary_key=True, nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.CheckConstraint("id = 1", name="ck_search_index_watermark_single_row"),
+    )
+    op.execute("INSERT INTO search_index_watermark (id, version) VALUES (1, 0)")
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION search_index_watermark_bump() RETURNS trigger AS $$
+        BEGIN
+            IF current_setting('wordloom.search_index_watermark_bumped', true) = '1' THEN
+                RETURN NULL;
+            END IF;
+            PERFORM set_config('wordloom.search_index_watermark_bumped', '1', true);
+            UPDATE search_index_watermark SET version = version + 1 WHERE id = 1;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE CONSTRAINT TRIGGER trg_search_index_watermark
+        AFTER INSERT OR UPDATE OR DELETE ON search_index
+        DEFERRABLE INITIALLY DEFERRED
+        FOR EACH ROW EXECUTE FUNCTION search_index_watermark_bump();
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_search_index_watermark ON search_index")
+    op.execute("DROP FUNCTION IF EXISTS search_index_watermark_bump()")
+    op.drop_table("search_index_watermark")
@@ -0,0 +1,48 @@
+"""Add (created_at, id) keyset indexes over live books and blocks
+
+Revision ID: c4e1b7d9f3a8
+Revises: a6d3f8e2b5c1
+Create Date: 2026-10-17
+
+Purpose:
+- scripts/legacy/rebuild_search_index.py streams books and blocks in chunks
+  with keyset pagination: WHERE (created_at, id) > (:last) ORDER BY
+  created_at, id LIMIT :n. Without a matching index every chunk would sort
+  the whole table.
+- Partial on soft_deleted_at IS NULL: the rebuild only reads live rows.
+
+Indexes are built/dropped CONCURRENTLY so writers are not blocked.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "c4e1b7d9f3a8"
+down_revision: Union[str, Sequence[str], None] = "a6d3f8e2b5c1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_INDEXES: tuple[tuple[str, str], ...] = (
+    ("ix_books_live_created_at_id", "books"),
+    ("ix_blocks_live_created_at_id", "blocks"),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table in _INDEXES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} (created_at, id) "
+                "WHERE soft_deleted_at IS NULL"
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in _INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
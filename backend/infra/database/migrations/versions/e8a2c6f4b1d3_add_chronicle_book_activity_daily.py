@@ -0,0 +1,64 @@
+"""Add chronicle_book_activity_daily rollup for the bookshelf dashboard
+
+Revision ID: e8a2c6f4b1d3
+Revises: c4e1b7d9f3a8
+Create Date: 2026-10-17
+
+Purpose:
+- The bookshelf dashboard aggregated a library's whole chronicle history
+  (max(occurred_at), 7-day edit/view counts) on every load.
+- This table keeps daily per-book buckets (edits, views, last_activity_at),
+  maintained by the chronicle outbox projector, so the dashboard reads only
+  the buckets of the window plus one latest bucket per book.
+- Backfilled from chronicle_entries (what the projector has materialized), so
+  entries still pending in the outbox are counted once, when projected.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "e8a2c6f4b1d3"
+down_revision: Union[str, Sequence[str], None] = "c4e1b7d9f3a8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "chronicle_book_activity_daily",
+        sa.Column(
+            "book_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("books.id", ondelete="CASCADE"),
+            primary_key=True,
+            nullable=False,
+        ),
+        sa.Column("day", sa.Date(), primary_key=True, nullable=False),
+        sa.Column("edits", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("views", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("last_activity_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+    op.execute(
+        """
+        INSERT INTO chronicle_book_activity_daily (book_id, day, edits, views, last_activity_at)
+        SELECT
+            book_id,
+            (occurred_at AT TIME ZONE 'UTC')::date AS day,
+            count(*) FILTER (WHERE event_type <> 'book_opened') AS edits,
+            count(*) FILTER (WHERE event_type = 'book_opened') AS views,
+            max(occurred_at) AS last_activity_at
+        FROM chronicle_entries
+        GROUP BY book_id, (occurred_at AT TIME ZONE 'UTC')::date
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("chronicle_book_activity_daily")
@@ -0,0 +1,95 @@
+"""Add search_index.text_tsv stored tsvector + GIN index
+
+Revision ID: f3b8d41c7a20
+Revises: a4f1c2d7e9b0
+Create Date: 2026-10-17
+
+Purpose:
+- Stop recomputing to_tsvector('english', text) per row at query time.
+- Make Stage1 recall / entity searches index-driven (GIN) as the corpus grows.
+
+Online strategy (no long ACCESS EXCLUSIVE lock on search_index):
+1) ADD COLUMN text_tsv (nullable, no default) -> metadata-only change.
+2) BEFORE INSERT/UPDATE trigger keeps text_tsv derived from text for new writes.
+3) Backfill existing rows in small committed batches.
+4) CREATE INDEX CONCURRENTLY so writers are not blocked during the build.
+
+We use a trigger instead of `GENERATED ALWAYS AS (...) STORED` because adding a
+stored generated column rewrites the whole table under an exclusive lock.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "f3b8d41c7a20"
+down_revision: Union[str, Sequence[str], None] = "a4f1c2d7e9b0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    op.add_column("search_index", sa.Column("text_tsv", postgresql.TSVECTOR(), nullable=True))
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION search_index_text_tsv_refresh() RETURNS trigger AS $$
+        BEGIN
+            NEW.text_tsv := to_tsvector('english', COALESCE(NEW.text, ''));
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_search_index_text_tsv
+        BEFORE INSERT OR UPDATE OF text ON search_index
+        FOR EACH ROW EXECUTE FUNCTION search_index_text_tsv_refresh();
+        """
+    )
+
+    # Batched backfill + concurrent index build must run outside the migration
+    # transaction so each batch commits and releases its row locks.
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while True:
+            updated = bind.execute(
+                sa.text(
+                    """
+                    UPDATE search_index
+                    SET text_tsv = to_tsvector('english', COALESCE(text, ''))
+                    WHERE id IN (
+                        SELECT id
+                        FROM search_index
+                        WHERE text_tsv IS NULL
+                        LIMIT :batch_size
+                    )
+                    """
+                ),
+                {"batch_size": BACKFILL_BATCH_SIZE},
+            ).rowcount
+            if not updated:
+                break
+
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_search_index_text_tsv "
+            "ON search_index USING gin (text_tsv)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_search_index_text_tsv")
+
+    op.execute("DROP TRIGGER IF EXISTS trg_search_index_text_tsv ON search_index")
+    op.execute("DROP FUNCTION IF EXISTS search_index_text_tsv_refresh()")
+    op.drop_column("search_index", "text_tsv")
@@ -26,12 +26,14 @@ from .media_models import (
     MediaModel, MediaAssociationModel,
     MediaType, MediaMimeType, MediaState, EntityTypeForMedia
 )
-from .search_index_models import SearchIndexModel
+from .search_index_models import SearchIndexModel, SearchIndexWatermarkModel
 from .projection_status_models import ProjectionStatusModel
+from .outbox_shard_models import OutboxShardLeaseModel, OutboxConsumerModel
 from .chronicle_models import ChronicleEventModel
 from .chronicle_outbox_models import ChronicleOutboxEventModel
 from .chronicle_entries_models import ChronicleEntryModel
 from .chronicle_dedupe_models import ChronicleEventDedupeStateModel
+from .chronicle_activity_models import ChronicleBookActivityDailyModel
 from .maturity_models import MaturitySnapshotModel
 
 __all__ = [
@@ -55,12 +57,17 @@ __all__ = [
     "EntityTypeForMedia",
     # Search
     "SearchIndexModel",
+    "SearchIndexWatermarkModel",
     "ProjectionStatusModel",
+    # Outbox
+    "OutboxShardLeaseModel",
+    "OutboxConsumerModel",
     # Chronicle
     "ChronicleEventModel",
     "ChronicleOutboxEventModel",
     "ChronicleEntryModel",
     "ChronicleEventDedupeStateModel",
+    "ChronicleBookActivityDailyModel",
     # Maturity
     "MaturitySnapshotModel",
 ]
@@ -29,7 +29,7 @@ Query Patterns:
 """
 
 from enum import Enum
-from sqlalchemy import Column, String, DateTime, Text, Numeric, Integer, ForeignKey
+from sqlalchemy import Column, String, DateTime, Text, Numeric, Integer, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime, timezone
 from uuid import uuid4
@@ -80,6 +80,11 @@ class BlockModel(Base):
 
     __tablename__ = "blocks"
 
+    # Keyset order for streaming rebuilds (scripts/legacy/rebuild_search_index.py)
+    __table_args__ = (
+        Index("ix_blocks_live_created_at_id", "created_at", "id", postgresql_where=text("soft_deleted_at IS NULL")),
+    )
+
     # Primary key and foreign keys
     id = Column(
         UUID(as_uuid=True),
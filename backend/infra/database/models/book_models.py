@@ -17,7 +17,7 @@ Round-Trip Validation:
 Use to_dict() for ORM → dict conversion
 Use from_dict() for dict → ORM conversion (13 fields total)
 """
-from sqlalchemy import Column, String, DateTime, Text, Boolean, ForeignKey, Integer
+from sqlalchemy import Column, String, DateTime, Text, Boolean, ForeignKey, Integer, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime, timezone
 from uuid import uuid4
@@ -49,6 +49,11 @@ class BookModel(Base):
     """
     __tablename__ = "books"
 
+    # Keyset order for streaming rebuilds (scripts/legacy/rebuild_search_index.py)
+    __table_args__ = (
+        Index("ix_books_live_created_at_id", "created_at", "id", postgresql_where=text("soft_deleted_at IS NULL")),
+    )
+
     # Primary key
     id = Column(
         UUID(as_uuid=True),
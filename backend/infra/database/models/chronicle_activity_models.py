@@ -0,0 +1,39 @@
+"""Chronicle activity rollup ORM model.
+
+Daily per-book activity derived from chronicle_entries, so the bookshelf
+dashboard reads O(books x days in window) rows instead of aggregating the
+library's whole chronicle history on every load.
+
+- One row per (book_id, UTC day).
+- edits: events other than book_opened; views: book_opened.
+- last_activity_at: latest occurred_at within that day.
+
+Maintained by the chronicle outbox projector in the same transaction as the
+chronicle_entries upsert (only when the entry is newly inserted, so replays do
+not double count). infra/storage/chronicle_activity_rollup.py rebuilds it.
+"""
+
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, text
+from sqlalchemy.dialects.postgresql import UUID
+
+from .base import Base
+
+
+class ChronicleBookActivityDailyModel(Base):
+    __tablename__ = "chronicle_book_activity_daily"
+
+    book_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("books.id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    )
+    # PK (book_id, day) also serves "latest bucket of a book" lookups.
+    day = Column(Date, primary_key=True, nullable=False)
+
+    edits = Column(Integer, nullable=False, server_default=text("0"))
+    views = Column(Integer, nullable=False, server_default=text("0"))
+    last_activity_at = Column(DateTime(timezone=True), nullable=False)
+
+
+__all__ = ["ChronicleBookActivityDailyModel"]
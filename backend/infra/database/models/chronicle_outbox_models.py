@@ -10,7 +10,7 @@ same worker failure-management patterns (lease/retry/failed/replay/metrics).
 from datetime import datetime, timezone
 from uuid import uuid4
 
-from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, Text
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, Text, text
 from sqlalchemy.dialects.postgresql import UUID
 
 from .base import Base
@@ -58,7 +58,14 @@ class ChronicleOutboxEventModel(Base):
     __table_args__ = (
         Index("idx_chronicle_outbox_entity", "entity_type", "entity_id"),
         Index("idx_chronicle_outbox_processed", "processed_at"),
-        Index("idx_chronicle_outbox_claim", "status", "next_retry_at", "lease_until", "event_version"),
+        # Partial indexes: claim and backlog scans only ever see unprocessed rows.
+        Index(
+            "idx_chronicle_outbox_claim_hot",
+            "created_at",
+            "id",
+            postgresql_where=text("processed_at IS NULL AND status = 'pending'"),
+        ),
+        Index("idx_chronicle_outbox_unprocessed", "created_at", postgresql_where=text("processed_at IS NULL")),
         Index("idx_chronicle_outbox_processing_started", "status", "processing_started_at"),
         Index("idx_chronicle_outbox_error_reason", "status", "error_reason"),
     )
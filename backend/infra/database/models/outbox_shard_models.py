@@ -0,0 +1,51 @@
+"""Outbox shard lease ORM models.
+
+Sharded outbox consumers split a projection's outbox into a fixed number of
+partitions (hash of entity_type + entity_id). Each partition is leased to at
+most one worker at a time, which keeps per-entity ordering across processes.
+
+- outbox_shard_leases: one row per (projection, partition); owner + lease.
+- outbox_consumers: live workers per projection (heartbeat), used to compute
+  each worker's fair share when rebalancing.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from .base import Base
+
+
+class OutboxShardLeaseModel(Base):
+    __tablename__ = "outbox_shard_leases"
+
+    projection_name = Column(String(100), primary_key=True, nullable=False)
+    shard_id = Column(Integer, primary_key=True, nullable=False)
+
+    owner = Column(String(120), nullable=True, index=True)
+    lease_until = Column(DateTime(timezone=True), nullable=True)
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+
+class OutboxConsumerModel(Base):
+    __tablename__ = "outbox_consumers"
+
+    projection_name = Column(String(100), primary_key=True, nullable=False)
+    worker_id = Column(String(120), primary_key=True, nullable=False)
+
+    heartbeat_until = Column(DateTime(timezone=True), nullable=False)
+    joined_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+
+__all__ = ["OutboxConsumerModel", "OutboxShardLeaseModel"]
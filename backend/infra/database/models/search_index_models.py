@@ -9,7 +9,7 @@ Strategy:
 
 Why denormalization?
   - Direct queries avoid complex JOINs across blocks/books/bookshelves
-  - Text pre-indexed via PostgreSQL tsvector at insert time
+  - Text pre-indexed via PostgreSQL tsvector at write time (text_tsv + GIN)
   - Scales linearly: 1K records (5ms) → 100K records (30ms) → 1M records (100ms)
 
 Round-Trip Validation:
@@ -20,10 +20,11 @@ Round-Trip Validation:
 from datetime import datetime, timezone
 from uuid import uuid4
 from sqlalchemy import (
-    Column, String, DateTime, Text, Float, BigInteger,
-    UniqueConstraint, Index
+    Column, String, DateTime, Text, Float, BigInteger, SmallInteger,
+    UniqueConstraint, Index, FetchedValue, CheckConstraint
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred
 
 from .base import Base
 
@@ -38,6 +39,7 @@ class SearchIndexModel(Base):
       - text: Searchable content (block content, book title, tag name)
       - snippet: Preview text for display (first 200 chars)
       - rank_score: Pre-calculated rank (optional, for sorting)
+      - text_tsv: Stored to_tsvector('english', text), maintained by DB trigger
       - created_at: When entry was created
       - updated_at: When entry was last updated
 
@@ -45,6 +47,7 @@ class SearchIndexModel(Base):
       - UNIQUE(entity_type, entity_id) - prevent duplicates
       - INDEX(entity_type) - fast filtering by type
       - INDEX(updated_at DESC) - for maintenance queries
+      - GIN(text_tsv) - index-driven full-text recall
 
     Maintenance:
       EventBus handlers (search_index_handlers.py) keep this table in sync:
@@ -95,6 +98,17 @@ class SearchIndexModel(Base):
         nullable=True
     )
 
+    # Stored tsvector of `text` (trigger: trg_search_index_text_tsv).
+    # Never written by the app; deferred so plain row loads don't ship it.
+    text_tsv = deferred(
+        Column(
+            TSVECTOR,
+            nullable=True,
+            server_default=FetchedValue(),
+            server_onupdate=FetchedValue(),
+        )
+    )
+
     # Ranking
     rank_score = Column(
         Float,
@@ -131,6 +145,7 @@ class SearchIndexModel(Base):
         Index("idx_search_index_library_type", "library_id", "entity_type"),
         Index("idx_search_index_updated", "updated_at"),
         Index("idx_search_index_entity", "entity_type", "entity_id"),
+        Index("idx_search_index_text_tsv", "text_tsv", postgresql_using="gin"),
     )
 
     def to_dict(self) -> dict:
@@ -177,3 +192,22 @@ class SearchIndexModel(Base):
 
     def __repr__(self) -> str:
         return f"<SearchIndexModel(type={self.entity_type}, id={self.entity_id}, score={self.rank_score})>"
+
+
+class SearchIndexWatermarkModel(Base):
+    """
+    Commit-time change counter for search_index (single row, id = 1)
+
+    A deferred constraint trigger (trg_search_index_watermark) bumps `version`
+    once per transaction that inserts, updates or deletes search_index rows, so
+    the new value is visible exactly when those writes commit. The Stage1
+    candidate cache flushes whenever it moves.
+    """
+    __tablename__ = "search_index_watermark"
+
+    id = Column(SmallInteger, primary_key=True, nullable=False)
+    version = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        CheckConstraint("id = 1", name="ck_search_index_watermark_single_row"),
+    )
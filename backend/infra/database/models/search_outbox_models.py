@@ -11,7 +11,7 @@ We keep payload minimal and derive full document from search_index when needed.
 from datetime import datetime, timezone
 from uuid import uuid4
 
-from sqlalchemy import Column, String, DateTime, BigInteger, Text, Index, Integer
+from sqlalchemy import Column, String, DateTime, BigInteger, Text, Index, Integer, text
 from sqlalchemy.dialects.postgresql import UUID
 
 from .base import Base
@@ -98,7 +98,13 @@ class SearchOutboxEventModel(Base):
     __table_args__ = (
         Index("idx_search_outbox_entity", "entity_type", "entity_id"),
         Index("idx_search_outbox_processed", "processed_at"),
-        Index("idx_search_outbox_claim", "status", "next_retry_at", "lease_until", "event_version"),
+        # Partial indexes: claim and backlog scans only ever see unprocessed rows.
+        Index(
+            "idx_search_outbox_claim_hot",
+            "event_version",
+            postgresql_where=text("processed_at IS NULL AND status = 'pending'"),
+        ),
+        Index("idx_search_outbox_unprocessed", "created_at", postgresql_where=text("processed_at IS NULL")),
         Index("idx_search_outbox_processing_started", "status", "processing_started_at"),
         Index("idx_search_outbox_error_reason", "status", "error_reason"),
     )
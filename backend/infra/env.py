@@ -0,0 +1,41 @@
+"""Typed environment lookups shared by infra modules.
+
+Unset or blank variables fall back to the default; malformed numbers fail loudly
+at startup instead of silently using the default.
+"""
+
+from __future__ import annotations
+
+import os
+
+_TRUTHY = {"1", "true", "yes", "y", "on"}
+
+
+def get_int_env(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return int(raw)
+    except ValueError as exc:
+        raise RuntimeError(f"Invalid int env {name}={raw!r}") from exc
+
+
+def get_float_env(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return float(raw)
+    except ValueError as exc:
+        raise RuntimeError(f"Invalid float env {name}={raw!r}") from exc
+
+
+def get_bool_env(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    return raw.strip().lower() in _TRUTHY
+
+
+__all__ = ["get_bool_env", "get_float_env", "get_int_env"]
@@ -0,0 +1,260 @@
+"""
+Event Dispatch Queue - optional background dispatch of domain events
+
+Purpose:
+- By default `EventBus.publish` awaits every dispatcher inline, so a block save
+  pays for its projection side effects (search_index, outbox, chronicle: one
+  session + transaction per event) before the HTTP response returns.
+- With WORDLOOM_EVENT_BUS_DISPATCH_MODE=background, `EventHandlerRegistry.bootstrap`
+  subscribes enqueueing wrappers instead; worker tasks run the dispatchers.
+
+Semantics:
+- Bounded: one asyncio.Queue per worker (WORDLOOM_EVENT_BUS_QUEUE_MAXSIZE split
+  across WORDLOOM_EVENT_BUS_WORKERS). Events are routed by `aggregate_id`, so
+  events of one aggregate keep their publish order.
+- Backpressure: a full queue blocks the publisher for up to
+  WORDLOOM_EVENT_BUS_ENQUEUE_TIMEOUT_SECONDS, then the event is dispatched inline
+  (it may then overtake queued events of its aggregate). Events are never dropped;
+  the timeout also keeps a handler that publishes from deadlocking its own worker.
+- Request context (contextvars: correlation id, actor) is captured at publish
+  time and restored for the dispatch.
+- Graceful drain on shutdown (main.py): new events dispatch inline, queued ones
+  get WORDLOOM_EVENT_BUS_DRAIN_TIMEOUT_SECONDS to finish.
+- Metrics: infra/observability/event_bus_metrics.py (depth, wait, duration).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List, Optional
+
+from infra.env import get_float_env, get_int_env
+
+logger = logging.getLogger(__name__)
+
+Dispatcher = Callable[[Any], Awaitable[None]]
+
+DISPATCH_MODE_INLINE = "inline"
+DISPATCH_MODE_BACKGROUND = "background"
+
+
+def get_dispatch_mode() -> str:
+    return (os.getenv("WORDLOOM_EVENT_BUS_DISPATCH_MODE") or DISPATCH_MODE_INLINE).strip().lower()
+
+
+def _metrics():
+    """Best-effort metrics (no-ops when prometheus_client isn't installed)."""
+
+    try:
+        from infra.observability import event_bus_metrics
+
+        return event_bus_metrics
+    except Exception:
+        return None
+
+
+@dataclass
+class _QueuedEvent:
+    dispatcher: Dispatcher
+    event: Any
+    context: contextvars.Context
+    enqueued_at: float
+
+
+class EventDispatchQueue:
+    """Bounded, ordered-per-aggregate background dispatch; see module docstring."""
+
+    def __init__(
+        self,
+        *,
+        workers: int = 4,
+        maxsize: int = 1000,
+        enqueue_timeout_seconds: float = 1.0,
+        drain_timeout_seconds: float = 10.0,
+    ):
+        self._workers = max(1, int(workers))
+        self._shard_maxsize = max(1, int(maxsize) // self._workers)
+        self._enqueue_timeout_seconds = max(0.0, float(enqueue_timeout_seconds))
+        self._drain_timeout_seconds = max(0.0, float(drain_timeout_seconds))
+        self._queues: List[asyncio.Queue] = []
+        self._tasks: List[asyncio.Task] = []
+        self._accepting = False
+        self._metrics = _metrics()
+
+    @property
+    def running(self) -> bool:
+        return self._accepting
+
+    @property
+    def depth(self) -> int:
+        return sum(q.qsize() for q in self._queues)
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._queues = [asyncio.Queue(maxsize=self._shard_maxsize) for _ in range(self._workers)]
+        self._tasks = [
+            asyncio.create_task(self._run(queue), name=f"event-dispatch:{i}") for i, queue in enumerate(self._queues)
+        ]
+        self._accepting = True
+        logger.info({"event": "event_bus.dispatch_queue.started", "workers": self._workers})
+
+    def wrap(self, dispatcher: Dispatcher) -> Dispatcher:
+        """EventBus subscriber that enqueues instead of dispatching."""
+
+        async def _enqueue(event):
+            await self.submit(dispatcher, event)
+
+        _enqueue.__name__ = f"enqueue_{getattr(dispatcher, '__name__', 'dispatcher')}"
+        return _enqueue
+
+    async def submit(self, dispatcher: Dispatcher, event: Any) -> None:
+        if not self._accepting:
+            await self._dispatch_inline(dispatcher, event)
+            return
+
+        item = _QueuedEvent(
+            dispatcher=dispatcher,
+            event=event,
+            context=contextvars.copy_context(),
+            enqueued_at=time.monotonic(),
+        )
+        queue = self._queues[self._shard(event)]
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            try:
+                await asyncio.wait_for(queue.put(item), timeout=self._enqueue_timeout_seconds)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    {
+                        "event": "event_bus.dispatch_queue.full",
+                        "event_type": type(event).__name__,
+                        "fallback": "inline",
+                    }
+                )
+                await self._dispatch_inline(dispatcher, event)
+                return
+        self._set_depth()
+
+    def _shard(self, event: Any) -> int:
+        key = getattr(event, "aggregate_id", None)
+        if key is None:
+            key = type(event).__name__
+        return hash(key) % self._workers
+
+    def _set_depth(self) -> None:
+        if self._metrics is not None:
+            self._metrics.event_dispatch_queue_depth.set(self.depth)
+
+    def _record(self, event: Any, *, mode: str, ok: bool, started: float) -> None:
+        if self._metrics is None:
+            return
+        event_type = type(event).__name__
+        self._metrics.event_dispatch_duration_seconds.labels(event_type=event_type).observe(
+            time.monotonic() - started
+        )
+        self._metrics.event_dispatch_total.labels(
+            event_type=event_type, mode=mode, outcome="ok" if ok else "error"
+        ).inc()
+
+    async def _dispatch_inline(self, dispatcher: Dispatcher, event: Any) -> None:
+        # Same contract as the plain subscriber: errors propagate to EventBus.publish.
+        started = time.monotonic()
+        ok = False
+        try:
+            await dispatcher(event)
+            ok = True
+        finally:
+            self._record(event, mode=DISPATCH_MODE_INLINE, ok=ok, started=started)
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        while True:
+            item: _QueuedEvent = await queue.get()
+            self._set_depth()
+            started = time.monotonic()
+            if self._metrics is not None:
+                self._metrics.event_dispatch_queue_wait_seconds.labels(
+                    event_type=type(item.event).__name__
+                ).observe(started - item.enqueued_at)
+            ok = False
+            try:
+                # Run in the publisher's context (correlation id, actor, tracing).
+                task = item.context.run(asyncio.create_task, item.dispatcher(item.event))
+                await task
+                ok = True
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # noqa: BLE001
+                logger.error(
+                    "Background event dispatch failed: %s",
+                    type(item.event).__name__,
+                    exc_info=True,
+                )
+            finally:
+                self._record(item.event, mode=DISPATCH_MODE_BACKGROUND, ok=ok, started=started)
+                queue.task_done()
+
+    async def drain(self) -> None:
+        """Stop accepting, wait for queued events (bounded), then stop the workers."""
+
+        self._accepting = False
+        if not self._tasks:
+            return
+        pending = self.depth
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(q.join() for q in self._queues)),
+                timeout=self._drain_timeout_seconds,
+            )
+        except asyncio.TimeoutError:
+            logger.warning({"event": "event_bus.dispatch_queue.drain_timeout", "abandoned": self.depth})
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._set_depth()
+        logger.info({"event": "event_bus.dispatch_queue.drained", "pending_at_shutdown": pending})
+
+
+# ============================================================================
+# Global Queue Instance - Lazy loaded
+# ============================================================================
+
+_queue: Optional[EventDispatchQueue] = None
+
+
+def get_event_dispatch_queue() -> EventDispatchQueue:
+    """Get or create the process-wide dispatch queue (started by EventHandlerRegistry.bootstrap)."""
+    global _queue
+    if _queue is None:
+        _queue = EventDispatchQueue(
+            workers=get_int_env("WORDLOOM_EVENT_BUS_WORKERS", 4),
+            maxsize=get_int_env("WORDLOOM_EVENT_BUS_QUEUE_MAXSIZE", 1000),
+            enqueue_timeout_seconds=get_float_env("WORDLOOM_EVENT_BUS_ENQUEUE_TIMEOUT_SECONDS", 1.0),
+            drain_timeout_seconds=get_float_env("WORDLOOM_EVENT_BUS_DRAIN_TIMEOUT_SECONDS", 10.0),
+        )
+    return _queue
+
+
+async def shutdown_event_dispatch_queue() -> None:
+    """Drain queued events. Call this on application shutdown, before the engine is disposed."""
+    global _queue
+    if _queue is not None:
+        queue, _queue = _queue, None
+        await queue.drain()
+
+
+__all__ = [
+    "DISPATCH_MODE_BACKGROUND",
+    "DISPATCH_MODE_INLINE",
+    "EventDispatchQueue",
+    "get_dispatch_mode",
+    "get_event_dispatch_queue",
+    "shutdown_event_dispatch_queue",
+]
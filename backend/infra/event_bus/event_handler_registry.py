@@ -250,6 +250,30 @@ class EventHandlerRegistry:
 
         return decorator
 
+    @classmethod
+    def _start_dispatch_queue(cls):
+        """Start the background dispatch queue when WORDLOOM_EVENT_BUS_DISPATCH_MODE=background.
+
+        Returns None for inline dispatch (default), or when no event loop is
+        running to host the workers.
+        """
+
+        from infra.event_bus.dispatch_queue import (
+            DISPATCH_MODE_BACKGROUND,
+            get_dispatch_mode,
+            get_event_dispatch_queue,
+        )
+
+        if get_dispatch_mode() != DISPATCH_MODE_BACKGROUND:
+            return None
+        dispatch_queue = get_event_dispatch_queue()
+        try:
+            dispatch_queue.start()
+        except RuntimeError:
+            logger.warning("Background event dispatch needs a running event loop; dispatching inline")
+            return None
+        return dispatch_queue
+
     @classmethod
     def bootstrap(cls) -> None:
         """
@@ -276,12 +300,17 @@ class EventHandlerRegistry:
             raise ImportError("Could not import get_event_bus from api.app.shared.events or app.shared.events")
 
         event_bus = get_event_bus()
+        dispatch_queue = cls._start_dispatch_queue()
 
         handler_count = 0
         for event_type, handlers in cls._handlers.items():
             # Subscribe a single dispatcher per event type.
             # This enables single-event single-transaction semantics.
-            event_bus.subscribe(event_type, cls._make_dispatcher(event_type))
+            dispatcher = cls._make_dispatcher(event_type)
+            if dispatch_queue is not None:
+                # Background mode: publish() only enqueues; workers run the dispatcher.
+                dispatcher = dispatch_queue.wrap(dispatcher)
+            event_bus.subscribe(event_type, dispatcher)
             handler_count += len(handlers)
 
         logger.info(
@@ -0,0 +1,121 @@
+import asyncio
+import contextvars
+from dataclasses import dataclass
+from uuid import UUID, uuid4
+
+import pytest
+
+from infra.event_bus.dispatch_queue import EventDispatchQueue
+
+
+@dataclass
+class _Event:
+    aggregate_id: UUID
+    seq: int
+
+
+_request_id = contextvars.ContextVar("request_id", default=None)
+
+
+@pytest.mark.asyncio
+async def test_publish_returns_before_handlers_run_and_drain_finishes_them():
+    queue = EventDispatchQueue(workers=2, maxsize=10)
+    queue.start()
+    release = asyncio.Event()
+    handled = []
+
+    async def _dispatcher(event):
+        await release.wait()
+        handled.append(event.seq)
+
+    subscriber = queue.wrap(_dispatcher)
+    await asyncio.wait_for(subscriber(_Event(uuid4(), 1)), timeout=1)
+    assert handled == []
+
+    release.set()
+    await queue.drain()
+
+    assert handled == [1]
+    assert not queue.running
+
+
+@pytest.mark.asyncio
+async def test_events_of_one_aggregate_keep_publish_order():
+    queue = EventDispatchQueue(workers=4, maxsize=100)
+    queue.start()
+    aggregate_id = uuid4()
+    handled = []
+
+    async def _dispatcher(event):
+        await asyncio.sleep(0.001 * (5 - event.seq))
+        handled.append(event.seq)
+
+    for seq in range(5):
+        await queue.submit(_dispatcher, _Event(aggregate_id, seq))
+    await queue.drain()
+
+    assert handled == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_falls_back_to_inline_dispatch():
+    queue = EventDispatchQueue(workers=1, maxsize=1, enqueue_timeout_seconds=0.01)
+    queue.start()
+    release = asyncio.Event()
+    handled = []
+
+    async def _blocking(event):
+        await release.wait()
+        handled.append(event.seq)
+
+    async def _dispatcher(event):
+        handled.append(event.seq)
+
+    aggregate_id = uuid4()
+    await queue.submit(_blocking, _Event(aggregate_id, 1))  # taken by the worker
+    await asyncio.sleep(0)
+    await queue.submit(_dispatcher, _Event(aggregate_id, 2))  # fills the queue
+    await queue.submit(_dispatcher, _Event(aggregate_id, 3))  # backpressure -> inline
+
+    assert handled == [3]
+    release.set()
+    await queue.drain()
+    assert handled == [3, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_dispatch_runs_in_the_publisher_context_and_survives_handler_errors():
+    queue = EventDispatchQueue(workers=1, maxsize=10)
+    queue.start()
+    seen = []
+
+    async def _failing(event):
+        raise RuntimeError("projection failed")
+
+    async def _dispatcher(event):
+        seen.append(_request_id.get())
+
+    token = _request_id.set("req-1")
+    try:
+        await queue.submit(_failing, _Event(uuid4(), 1))
+        await queue.submit(_dispatcher, _Event(uuid4(), 2))
+    finally:
+        _request_id.reset(token)
+    await queue.drain()
+
+    assert seen == ["req-1"]
+
+
+@pytest.mark.asyncio
+async def test_submit_after_drain_dispatches_inline():
+    queue = EventDispatchQueue(workers=1, maxsize=10)
+    queue.start()
+    await queue.drain()
+    handled = []
+
+    async def _dispatcher(event):
+        handled.append(event.seq)
+
+    await queue.submit(_dispatcher, _Event(uuid4(), 7))
+
+    assert handled == [7]
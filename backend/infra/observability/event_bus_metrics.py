@@ -0,0 +1,41 @@
+"""Prometheus-style metrics for in-process domain event dispatch (API process).
+
+Only emitted in background dispatch mode (infra/event_bus/dispatch_queue.py);
+labels stay low-cardinality (event type names, a fixed mode/outcome set).
+"""
+
+from __future__ import annotations
+
+from prometheus_client import Counter, Gauge, Histogram
+
+event_dispatch_queue_depth = Gauge(
+    "event_dispatch_queue_depth",
+    "Domain events waiting in the background dispatch queue.",
+)
+
+event_dispatch_queue_wait_seconds = Histogram(
+    "event_dispatch_queue_wait_seconds",
+    "Time a domain event waited in the dispatch queue before its handlers ran.",
+    ["event_type"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+event_dispatch_duration_seconds = Histogram(
+    "event_dispatch_duration_seconds",
+    "Time spent running the handlers of one domain event.",
+    ["event_type"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+event_dispatch_total = Counter(
+    "event_dispatch_total",
+    "Domain events dispatched, by mode (background/inline) and outcome (ok/error).",
+    ["event_type", "mode", "outcome"],
+)
+
+__all__ = [
+    "event_dispatch_duration_seconds",
+    "event_dispatch_queue_depth",
+    "event_dispatch_queue_wait_seconds",
+    "event_dispatch_total",
+]
@@ -81,6 +81,48 @@ outbox_stuck_processing_events = Gauge(
     ["projection"],
 )
 
+outbox_entity_locks = Gauge(
+    "outbox_entity_locks",
+    "Current number of entries in the worker's per-entity lock table (bounded by in-flight events).",
+    ["projection"],
+)
+
+outbox_owned_shards = Gauge(
+    "outbox_owned_shards",
+    "Number of outbox shard partitions currently leased by this worker (sharded mode).",
+    ["projection"],
+)
+
+outbox_adaptive_batch_size = Gauge(
+    "outbox_adaptive_batch_size",
+    "Current claim/bulk batch size chosen by the adaptive (AIMD) controller.",
+    ["projection"],
+)
+
+outbox_adaptive_concurrency = Gauge(
+    "outbox_adaptive_concurrency",
+    "Current per-batch concurrency chosen by the adaptive (AIMD) controller.",
+    ["projection"],
+)
+
+outbox_adaptive_adjustments_total = Counter(
+    "outbox_adaptive_adjustments_total",
+    "Total number of adaptive controller setpoint changes, by direction.",
+    ["projection", "direction"],  # direction: increase | decrease
+)
+
+outbox_wakeups_total = Counter(
+    "outbox_wakeups_total",
+    "Total number of idle-wait wakeups of the outbox worker, by cause.",
+    ["projection", "reason"],  # reason: notify | poll
+)
+
+outbox_retention_deleted_total = Counter(
+    "outbox_retention_deleted_total",
+    "Total number of processed (done) outbox rows deleted by retention.",
+    ["projection"],
+)
+
 outbox_last_success_timestamp_seconds = Gauge(
     "outbox_last_success_timestamp_seconds",
     "Unix timestamp (seconds) of the last successfully processed outbox row.",
@@ -98,6 +140,24 @@ projection_rebuild_duration_seconds = Gauge(
     ["projection"],
 )
 
+projection_rebuild_rows_total = Gauge(
+    "projection_rebuild_rows_total",
+    "Rows the running rebuild expects to project (set when it starts).",
+    ["projection"],
+)
+
+projection_rebuild_rows_done = Gauge(
+    "projection_rebuild_rows_done",
+    "Rows projected so far by the running (or last) rebuild.",
+    ["projection"],
+)
+
+projection_rebuild_eta_seconds = Gauge(
+    "projection_rebuild_eta_seconds",
+    "Estimated seconds until the running rebuild finishes (0 when idle).",
+    ["projection"],
+)
+
 projection_rebuild_last_finished_timestamp_seconds = Gauge(
     "projection_rebuild_last_finished_timestamp_seconds",
     "Unix timestamp (seconds) when the last rebuild finished.",
@@ -139,6 +199,28 @@ outbox_es_bulk_request_duration_seconds = Histogram(
     buckets=(0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0),
 )
 
+# ---------------------------------------------------------------------------
+# Stage1 candidate cache (API side, two-stage search)
+# ---------------------------------------------------------------------------
+
+search_stage1_cache_requests_total = Counter(
+    "search_stage1_cache_requests_total",
+    "Total number of Stage1 candidate lookups served from cache (hit) or the provider (miss).",
+    ["provider", "result"],  # result: hit | miss
+)
+
+search_stage1_cache_invalidations_total = Counter(
+    "search_stage1_cache_invalidations_total",
+    "Total number of Stage1 candidate cache flushes/evictions, by reason.",
+    ["provider", "reason"],  # reason: watermark | expired | evicted
+)
+
+search_stage1_cache_entries = Gauge(
+    "search_stage1_cache_entries",
+    "Current number of entries held in the Stage1 candidate cache.",
+    ["provider"],
+)
+
 
 __all__ = [
     "outbox_produced_total",
@@ -152,11 +234,24 @@ __all__ = [
     "outbox_inflight_events",
     "outbox_stuck_processing_events",
     "outbox_last_success_timestamp_seconds",
+    "outbox_wakeups_total",
+    "outbox_entity_locks",
+    "outbox_retention_deleted_total",
+    "outbox_owned_shards",
+    "outbox_adaptive_batch_size",
+    "outbox_adaptive_concurrency",
+    "outbox_adaptive_adjustments_total",
     "projection_rebuild_duration_seconds",
     "projection_rebuild_last_finished_timestamp_seconds",
     "projection_rebuild_last_success",
+    "projection_rebuild_rows_total",
+    "projection_rebuild_rows_done",
+    "projection_rebuild_eta_seconds",
     "outbox_es_bulk_requests_total",
     "outbox_es_bulk_items_total",
     "outbox_es_bulk_item_failures_total",
     "outbox_es_bulk_request_duration_seconds",
+    "search_stage1_cache_requests_total",
+    "search_stage1_cache_invalidations_total",
+    "search_stage1_cache_entries",
 ]
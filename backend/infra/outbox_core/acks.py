@@ -0,0 +1,117 @@
+"""Batched status transitions (acks) for outbox rows.
+
+Workers collect one `OutboxAck` per processed row and write them together:
+
+- done rows:         one UPDATE ... WHERE id = ANY(:ids)
+- retry/failed rows: one UPDATE ... FROM unnest(...) carrying the per-row
+                     status, attempts, next_retry_at and error fields
+
+Both statements keep the ownership guard of the single-row path (owner is this
+worker, row still `processing`, lease not expired), so an ack for a row that
+was reclaimed meanwhile is a no-op. A batch costs two statements and one
+commit instead of one of each per row.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import DateTime, Integer, String, Text, cast, func, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+ACK_DONE = "done"
+ACK_RETRY = "retry"
+ACK_FAILED = "failed"
+
+
+@dataclass(frozen=True, slots=True)
+class OutboxAck:
+    id: Any
+    outcome: str  # done | retry | failed
+    attempts: int = 0
+    next_retry_at: Optional[datetime] = None
+    error_reason: Optional[str] = None
+    error: Optional[str] = None
+
+
+def _owned_by(model: Any, *, worker_id: str, now: datetime) -> tuple[Any, ...]:
+    return (
+        model.owner == worker_id,
+        model.status == "processing",
+        model.lease_until > now,
+    )
+
+
+async def write_acks(
+    session: AsyncSession,
+    model: Any,
+    acks: Sequence[OutboxAck],
+    *,
+    worker_id: str,
+    now: datetime,
+) -> int:
+    """Apply `acks` in at most two UPDATEs (caller commits). Returns rows updated.
+
+    The model is expected to look like SearchOutboxEventModel (attributes used).
+    """
+
+    updated = 0
+
+    done_ids = [ack.id for ack in acks if ack.outcome == ACK_DONE]
+    if done_ids:
+        result = await session.execute(
+            update(model)
+            .where(model.id.in_(done_ids), *_owned_by(model, worker_id=worker_id, now=now))
+            .values(
+                status="done",
+                processed_at=now,
+                owner=None,
+                lease_until=None,
+                processing_started_at=None,
+                next_retry_at=None,
+                error_reason=None,
+                error=None,
+                updated_at=now,
+            )
+        )
+        updated += int(result.rowcount or 0)
+
+    unsettled = [ack for ack in acks if ack.outcome in (ACK_RETRY, ACK_FAILED)]
+    if unsettled:
+        rows = (
+            func.unnest(
+                cast([ack.id for ack in unsettled], ARRAY(model.id.type)),
+                cast(["pending" if ack.outcome == ACK_RETRY else "failed" for ack in unsettled], ARRAY(String)),
+                cast([int(ack.attempts) for ack in unsettled], ARRAY(Integer)),
+                cast([ack.next_retry_at for ack in unsettled], ARRAY(DateTime(timezone=True))),
+                cast([ack.error_reason for ack in unsettled], ARRAY(String)),
+                cast([ack.error for ack in unsettled], ARRAY(Text)),
+            )
+            .table_valued("id", "status", "attempts", "next_retry_at", "error_reason", "error")
+            .render_derived(name="u")
+        )
+        result = await session.execute(
+            update(model)
+            .where(model.id == rows.c.id, *_owned_by(model, worker_id=worker_id, now=now))
+            .values(
+                status=rows.c.status,
+                owner=None,
+                lease_until=None,
+                processing_started_at=None,
+                attempts=rows.c.attempts,
+                next_retry_at=rows.c.next_retry_at,
+                error_reason=rows.c.error_reason,
+                error=rows.c.error,
+                updated_at=now,
+            )
+        )
+        updated += int(result.rowcount or 0)
+
+    return updated
+
+
+__all__ = ["ACK_DONE", "ACK_FAILED", "ACK_RETRY", "OutboxAck", "write_acks"]
@@ -0,0 +1,154 @@
+"""Adaptive (AIMD) batch size and concurrency for outbox workers.
+
+Static OUTBOX_BULK_SIZE / OUTBOX_CONCURRENCY are either too timid for an idle
+cluster or too aggressive for a busy one. `AimdController` moves both
+setpoints from what each batch reports back:
+
+- throttled (ES 429, timeouts): multiplicative decrease, right away;
+- latency over target or error rate over the limit: hold (no growth);
+- `healthy_streak` healthy batches in a row: additive increase.
+
+Like TCP congestion control, the worker probes upward slowly and retreats fast,
+so it settles just under the throughput the cluster can sustain. Setpoints are
+clamped to [min, max] and exported as gauges. Workers that do not fan out
+(one _bulk request per batch) pass `adapt_concurrency=False`, so only the
+batch size moves.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Optional
+
+from infra.observability.outbox_metrics import (
+    outbox_adaptive_adjustments_total,
+    outbox_adaptive_batch_size,
+    outbox_adaptive_concurrency,
+)
+
+DECISION_INCREASE = "increase"
+DECISION_DECREASE = "decrease"
+DECISION_HOLD = "hold"
+
+
+def _clamp(value: int, lo: int, hi: int) -> int:
+    return max(lo, min(hi, int(value)))
+
+
+class AimdController:
+    """Additive-increase / multiplicative-decrease setpoints for one worker."""
+
+    def __init__(
+        self,
+        *,
+        projection: str,
+        batch_size: int,
+        concurrency: int,
+        min_batch_size: int = 1,
+        max_batch_size: int = 1000,
+        min_concurrency: int = 1,
+        max_concurrency: int = 16,
+        batch_step: Optional[int] = None,
+        concurrency_step: int = 1,
+        decrease_factor: float = 0.5,
+        latency_target_seconds: float = 1.0,
+        max_error_rate: float = 0.05,
+        healthy_streak: int = 3,
+        adapt_concurrency: bool = True,
+    ):
+        if not 0.0 < float(decrease_factor) < 1.0:
+            raise ValueError("decrease_factor must be in (0, 1)")
+        self._projection = projection
+        self._min_batch = max(1, int(min_batch_size))
+        self._max_batch = max(self._min_batch, int(max_batch_size))
+        self._min_concurrency = max(1, int(min_concurrency))
+        self._max_concurrency = max(self._min_concurrency, int(max_concurrency))
+        self._batch_size = _clamp(batch_size, self._min_batch, self._max_batch)
+        self._concurrency = _clamp(concurrency, self._min_concurrency, self._max_concurrency)
+        self._batch_step = max(1, int(batch_step) if batch_step else self._batch_size // 10)
+        self._concurrency_step = max(1, int(concurrency_step))
+        self._decrease_factor = float(decrease_factor)
+        self._latency_target = float(latency_target_seconds)
+        self._max_error_rate = float(max_error_rate)
+        self._healthy_streak = max(1, int(healthy_streak))
+        self._adapt_concurrency = bool(adapt_concurrency)
+        self._streak = 0
+        self._publish()
+
+    @property
+    def batch_size(self) -> int:
+        return self._batch_size
+
+    @property
+    def concurrency(self) -> int:
+        return self._concurrency
+
+    def observe(
+        self,
+        *,
+        items: int,
+        latency_seconds: float,
+        errors: int = 0,
+        throttled: bool = False,
+        claimed: Optional[int] = None,
+    ) -> str:
+        """Feed one finished batch; returns the decision taken.
+
+        `latency_seconds` is the time of one downstream request (a _bulk call,
+        or one wave of per-event requests); `throttled` is set when any of them
+        came back as a 429 or timed out. `claimed` is the number of rows the
+        claim returned before coalescing (defaults to `items`): a claim that
+        filled `batch_size` counts as a full batch even if coalescing left fewer
+        items to send.
+        """
+
+        if throttled:
+            self._streak = 0
+            return self._decrease()
+
+        error_rate = (errors / items) if items > 0 else 0.0
+        if latency_seconds > self._latency_target or error_rate > self._max_error_rate:
+            self._streak = 0
+            return DECISION_HOLD
+
+        # A short batch says nothing about whether a larger one would be fine.
+        if (items if claimed is None else claimed) < self._batch_size:
+            return DECISION_HOLD
+
+        self._streak += 1
+        if self._streak < self._healthy_streak:
+            return DECISION_HOLD
+        self._streak = 0
+        return self._increase()
+
+    def _increase(self) -> str:
+        batch = _clamp(self._batch_size + self._batch_step, self._min_batch, self._max_batch)
+        concurrency = _clamp(
+            self._concurrency + self._concurrency_step, self._min_concurrency, self._max_concurrency
+        )
+        return self._apply(batch, concurrency, DECISION_INCREASE)
+
+    def _decrease(self) -> str:
+        batch = _clamp(math.floor(self._batch_size * self._decrease_factor), self._min_batch, self._max_batch)
+        concurrency = _clamp(
+            math.floor(self._concurrency * self._decrease_factor), self._min_concurrency, self._max_concurrency
+        )
+        return self._apply(batch, concurrency, DECISION_DECREASE)
+
+    def _apply(self, batch: int, concurrency: int, direction: str) -> str:
+        if not self._adapt_concurrency:
+            concurrency = self._concurrency
+        if batch == self._batch_size and concurrency == self._concurrency:
+            return DECISION_HOLD
+        self._batch_size = batch
+        self._concurrency = concurrency
+        outbox_adaptive_adjustments_total.labels(projection=self._projection, direction=direction).inc()
+        self._publish()
+        return direction
+
+    def _publish(self) -> None:
+        outbox_adaptive_batch_size.labels(projection=self._projection).set(self._batch_size)
+        outbox_adaptive_concurrency.labels(projection=self._projection).set(self._concurrency)
+
+
+__all__ = ["AimdController", "DECISION_DECREASE", "DECISION_HOLD", "DECISION_INCREASE"]
@@ -0,0 +1,166 @@
+"""Backlog gauges sampled off the claim path.
+
+Counting unprocessed outbox rows is a scan over the backlog; doing it on every
+claim iteration made claim latency grow with table size. `BacklogSampler` runs
+the aggregate in its own task at a low, fixed frequency and publishes the
+result to the shared outbox gauges, so the claim loop never waits on it.
+
+All four figures come from one statement (aggregate FILTER clauses), i.e. one
+pass over the unprocessed rows instead of four.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infra.observability.outbox_metrics import (
+    outbox_inflight_events,
+    outbox_lag_events,
+    outbox_oldest_age_seconds,
+    outbox_stuck_processing_events,
+)
+from infra.outbox_core.stuck import stuck_processing_predicate
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class BacklogSnapshot:
+    pending: int
+    inflight: int
+    stuck: int
+    oldest_created_at: Optional[datetime]
+
+
+async def sample_backlog(
+    session: AsyncSession,
+    model: Any,
+    *,
+    now: datetime,
+    max_processing_seconds: int,
+) -> BacklogSnapshot:
+    """Read lag/inflight/stuck/oldest for an outbox table in one statement.
+
+    The model is expected to look like SearchOutboxEventModel (attributes used).
+    """
+
+    stmt = select(
+        func.count(),
+        func.count().filter(model.status == "processing"),
+        func.count().filter(
+            stuck_processing_predicate(model, now=now, max_processing_seconds=max_processing_seconds)
+        ),
+        func.min(model.created_at),
+    ).where(
+        model.processed_at.is_(None),
+        model.status.in_(["pending", "processing", "failed"]),
+    )
+    pending, inflight, stuck, oldest = (await session.execute(stmt)).one()
+    return BacklogSnapshot(
+        pending=int(pending or 0),
+        inflight=int(inflight or 0),
+        stuck=int(stuck or 0),
+        oldest_created_at=oldest,
+    )
+
+
+def publish_backlog(projection: str, snapshot: BacklogSnapshot, *, now: datetime) -> None:
+    outbox_lag_events.labels(projection=projection).set(snapshot.pending)
+    outbox_inflight_events.labels(projection=projection).set(snapshot.inflight)
+    outbox_stuck_processing_events.labels(projection=projection).set(snapshot.stuck)
+    if snapshot.oldest_created_at is None:
+        outbox_oldest_age_seconds.labels(projection=projection).set(0)
+    else:
+        age_s = max(0.0, (now - snapshot.oldest_created_at).total_seconds())
+        outbox_oldest_age_seconds.labels(projection=projection).set(float(age_s))
+
+
+class BacklogSampler:
+    """Background task refreshing the backlog gauges every `interval_seconds`.
+
+    `extra(session)` runs in the same session after the backlog sample, for
+    other low-frequency gauges (e.g. rebuild bookkeeping).
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        model: Any,
+        *,
+        projection: str,
+        interval_seconds: float,
+        max_processing_seconds: int,
+        extra: Optional[Callable[[AsyncSession], Awaitable[None]]] = None,
+    ):
+        self._session_factory = session_factory
+        self._model = model
+        self._projection = projection
+        self._interval_seconds = max(0.1, float(interval_seconds))
+        self._max_processing_seconds = max_processing_seconds
+        self._extra = extra
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "BacklogSampler":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"outbox-backlog:{self._projection}")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def sample_once(self) -> BacklogSnapshot:
+        now = datetime.now(timezone.utc)
+        async with self._session_factory() as session:
+            snapshot = await sample_backlog(
+                session,
+                self._model,
+                now=now,
+                max_processing_seconds=self._max_processing_seconds,
+            )
+            if self._extra is not None:
+                await self._extra(session)
+        publish_backlog(self._projection, snapshot, now=now)
+        return snapshot
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sample_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                logger.warning(
+                    {
+                        "event": "outbox.backlog_sample.failed",
+                        "projection": self._projection,
+                        "error": f"{type(exc).__name__}: {exc}",
+                    }
+                )
+            await asyncio.sleep(self._interval_seconds)
+
+
+__all__ = [
+    "BacklogSampler",
+    "BacklogSnapshot",
+    "publish_backlog",
+    "sample_backlog",
+]
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from typing import Any, Sequence, TypeVar
+
+
+RowT = TypeVar("RowT")
+
+
+def coalesce_latest_per_entity(rows: Sequence[RowT]) -> tuple[list[RowT], list[RowT]]:
+    """Split outbox rows into (survivors, superseded).
+
+    For state projections (the worker re-reads current state at apply time),
+    only the newest event per (entity_type, entity_id) needs to be applied:
+    older rows for the same entity are superseded and can be acked as no-ops.
+
+    The survivor is the row with the highest event_version (ties: latest
+    created_at). Survivors keep the input order of their first appearance.
+    Rows are expected to look like SearchOutboxEventModel (attributes used).
+    """
+
+    latest: dict[tuple[str, str], Any] = {}
+    order: list[tuple[str, str]] = []
+    for row in rows:
+        key = (str(getattr(row, "entity_type")), str(getattr(row, "entity_id")))
+        current = latest.get(key)
+        if current is None:
+            order.append(key)
+            latest[key] = row
+        elif _version_key(row) > _version_key(current):
+            latest[key] = row
+
+    survivors = [latest[key] for key in order]
+    survivor_ids = {id(row) for row in survivors}
+    superseded = [row for row in rows if id(row) not in survivor_ids]
+    return survivors, superseded
+
+
+def _version_key(row: Any) -> tuple[int, float]:
+    created_at = getattr(row, "created_at", None)
+    return (
+        int(getattr(row, "event_version", 0) or 0),
+        created_at.timestamp() if created_at is not None else 0.0,
+    )
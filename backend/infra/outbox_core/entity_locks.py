@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Hashable
+
+
+class EntityLockTable:
+    """Per-entity asyncio locks whose size is bounded by in-flight work.
+
+    Each key maps to a lock plus a refcount of tasks holding or waiting on it.
+    The entry is dropped when the last holder leaves, so the table only holds
+    keys that are currently being processed. Tasks for the same key still
+    serialize in acquisition order (asyncio.Lock is FIFO).
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[Hashable, tuple[asyncio.Lock, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @asynccontextmanager
+    async def hold(self, key: Hashable) -> AsyncIterator[None]:
+        lock, refs = self._entries.get(key) or (asyncio.Lock(), 0)
+        self._entries[key] = (lock, refs + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, refs = self._entries[key]
+            if refs <= 1:
+                del self._entries[key]
+            else:
+                self._entries[key] = (lock, refs - 1)
+
+
+__all__ = ["EntityLockTable"]
@@ -0,0 +1,139 @@
+"""LISTEN/NOTIFY wakeups for outbox workers.
+
+Writers call `notify_outbox(session, channel)` in the same transaction as the
+outbox insert. Postgres delivers NOTIFY only on commit (and folds duplicates
+within a transaction), so a worker is never woken for an uncommitted row and a
+bulk write costs one notification.
+
+Workers hold one dedicated autocommit connection in LISTEN mode
+(`OutboxWakeup`) and wait on it instead of sleeping a fixed poll interval.
+Polling stays as the fallback: `wait()` always returns after its timeout, and
+if the LISTEN connection drops it reconnects with backoff while callers keep
+polling at their normal interval.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+
+SEARCH_OUTBOX_CHANNEL = "search_outbox_events"
+CHRONICLE_OUTBOX_CHANNEL = "chronicle_outbox_events"
+
+
+async def notify_outbox(session: AsyncSession, channel: str) -> None:
+    """Queue a wakeup for `channel`; delivered when the session's transaction commits."""
+    await session.execute(text("SELECT pg_notify(:channel, '')"), {"channel": channel})
+
+
+def _libpq_dsn(database_url: str) -> str:
+    # SQLAlchemy URLs carry the driver ("postgresql+psycopg://"); libpq does not.
+    return re.sub(r"^postgres(ql)?\+\w+://", "postgresql://", database_url)
+
+
+class OutboxWakeup:
+    """Event-driven idle wait for an outbox worker loop."""
+
+    def __init__(
+        self,
+        database_url: str,
+        channel: str,
+        *,
+        reconnect_backoff_seconds: float = 1.0,
+        max_reconnect_backoff_seconds: float = 30.0,
+    ):
+        self._dsn = _libpq_dsn(database_url)
+        self._channel = channel
+        self._reconnect_backoff_seconds = reconnect_backoff_seconds
+        self._max_reconnect_backoff_seconds = max_reconnect_backoff_seconds
+        self._event = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._listening = False
+
+    @property
+    def listening(self) -> bool:
+        """True while the LISTEN connection is up (notifications are live)."""
+        return self._listening
+
+    async def __aenter__(self) -> "OutboxWakeup":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    def wake(self) -> None:
+        """Interrupt a pending wait() (e.g. on shutdown signal)."""
+        self._event.set()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"outbox-listen:{self._channel}")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        self._listening = False
+        self._event.set()
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait for a notification or `timeout` seconds. Returns True if notified."""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout=max(0.0, timeout))
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._event.clear()
+
+    async def _run(self) -> None:
+        import psycopg
+
+        backoff = self._reconnect_backoff_seconds
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(self._dsn, autocommit=True) as conn:
+                    await conn.execute(f'LISTEN "{self._channel}"')
+                    self._listening = True
+                    backoff = self._reconnect_backoff_seconds
+                    # Rows committed while we were disconnected: wake once to catch up.
+                    self._event.set()
+                    logger.info({"event": "outbox.listen.connected", "channel": self._channel})
+                    async for _ in conn.notifies():
+                        self._event.set()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                logger.warning(
+                    {
+                        "event": "outbox.listen.disconnected",
+                        "channel": self._channel,
+                        "error": f"{type(exc).__name__}: {exc}",
+                        "retry_in_seconds": backoff,
+                    }
+                )
+            finally:
+                self._listening = False
+            await asyncio.sleep(backoff)
+            backoff = min(self._max_reconnect_backoff_seconds, backoff * 2)
+
+
+__all__ = [
+    "CHRONICLE_OUTBOX_CHANNEL",
+    "SEARCH_OUTBOX_CHANNEL",
+    "OutboxWakeup",
+    "notify_outbox",
+]
@@ -0,0 +1,216 @@
+"""Pipelining for outbox workers.
+
+A serial worker spends `claim + process + ack` per batch: the DB claim, the
+downstream request (ES) and the status write never overlap. Two bounded stages
+take the DB steps off the worker loop, so throughput approaches
+max(claim, process, ack) instead of their sum:
+
+- `ClaimAhead` runs the claim step in its own task and hands batches to the
+  worker, so batch N+1 is claimed while batch N is in flight;
+- `AckWriter` takes each batch's outcomes and writes them from its own task,
+  so the worker starts sending batch N+1 while batch N is being acked.
+
+ClaimAhead:
+- `depth` bounds how many claimed-but-unprocessed batches may wait; their row
+  leases keep ticking, so keep it small (and renew on hand-out).
+- `drain()` waits until every handed-out batch has been finished, for steps
+  that must run with nothing in flight (e.g. shard rebalancing).
+- Batches still queued on exit are passed to `on_abandon` (release them).
+
+AckWriter:
+- `depth` bounds how many outcome batches may wait; `submit()` blocks beyond
+  that, so a slow DB slows the worker down instead of letting row leases
+  expire under unwritten acks.
+- Waiting batches are written together (one `write` call); exiting waits
+  until everything queued has been written.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Generic, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+A = TypeVar("A")
+
+
+class ClaimAhead(Generic[T]):
+    """Bounded claim-ahead queue between a claimer task and the worker loop."""
+
+    def __init__(
+        self,
+        claim: Callable[[], Awaitable[Optional[T]]],
+        *,
+        depth: int,
+        idle_wait: Callable[[], Awaitable[None]],
+        should_claim: Callable[[], bool],
+        on_abandon: Optional[Callable[[T], Awaitable[None]]] = None,
+        pause_seconds: float = 0.5,
+    ):
+        self._claim = claim
+        self._idle_wait = idle_wait
+        self._should_claim = should_claim
+        self._on_abandon = on_abandon
+        self._pause_seconds = max(0.01, float(pause_seconds))
+        self._queue: asyncio.Queue[T] = asyncio.Queue()
+        # A slot is taken before claiming (not before enqueueing), so at most
+        # `depth` batches are ever claimed ahead of the worker.
+        self._slots = asyncio.Semaphore(max(1, int(depth)))
+        self._handed_out = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "ClaimAhead[T]":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="outbox-claim-ahead")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        while not self._queue.empty():
+            batch = self._queue.get_nowait()
+            self._queue.task_done()
+            await self._abandon(batch)
+
+    async def _abandon(self, batch: T) -> None:
+        if self._on_abandon is None:
+            return
+        try:
+            await self._on_abandon(batch)
+        except Exception:  # noqa: BLE001
+            logger.exception("Failed to release a claimed-ahead outbox batch")
+
+    async def get(self, timeout: float) -> Optional[T]:
+        """Next claimed batch, or None after `timeout` seconds.
+
+        Getting a batch marks the previously handed-out one as finished: the
+        worker loop asks for the next batch only once the last one is done.
+        """
+        self.finish_current()
+        try:
+            batch = await asyncio.wait_for(self._queue.get(), timeout=max(0.0, timeout))
+        except asyncio.TimeoutError:
+            return None
+        self._handed_out += 1
+        self._slots.release()
+        return batch
+
+    def finish_current(self) -> None:
+        while self._handed_out > 0:
+            self._handed_out -= 1
+            self._queue.task_done()
+
+    async def drain(self) -> None:
+        """Wait until nothing is queued or being processed."""
+        await self._queue.join()
+
+    async def _run(self) -> None:
+        while True:
+            if not self._should_claim():
+                await asyncio.sleep(self._pause_seconds)
+                continue
+            await self._slots.acquire()
+            try:
+                batch = await self._claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # noqa: BLE001
+                self._slots.release()
+                logger.exception("Claim-ahead failed; retrying")
+                await asyncio.sleep(self._pause_seconds)
+                continue
+            if batch is None:
+                self._slots.release()
+                await self._idle_wait()
+                continue
+            self._queue.put_nowait(batch)
+
+
+class AckWriter(Generic[A]):
+    """Bounded outcome queue drained by one ack-writer task."""
+
+    def __init__(self, write: Callable[[list[A]], Awaitable[None]], *, depth: int):
+        self._write = write
+        self._queue: asyncio.Queue[list[A]] = asyncio.Queue(maxsize=max(1, int(depth)))
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "AckWriter[A]":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="outbox-ack-writer")
+
+    async def submit(self, acks: list[A]) -> None:
+        """Queue one batch of outcomes; writes inline when the stage is not running."""
+        if not acks:
+            return
+        if self._task is None:
+            await self._write_logged(list(acks))
+            return
+        await self._queue.put(list(acks))
+
+    async def drain(self) -> None:
+        """Wait until every submitted outcome has been written."""
+        await self._queue.join()
+
+    async def stop(self) -> None:
+        """Write what is queued, then stop the writer task."""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        try:
+            await self._queue.join()
+        finally:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _write_logged(self, acks: list[A]) -> None:
+        try:
+            await self._write(acks)
+        except Exception:  # noqa: BLE001
+            # Unacked rows stay processing and are reclaimed after their lease.
+            logger.exception("Failed to write %s outbox acks", len(acks))
+
+    async def _run(self) -> None:
+        while True:
+            batches = [await self._queue.get()]
+            while not self._queue.empty():
+                batches.append(self._queue.get_nowait())
+            try:
+                await self._write_logged([ack for batch in batches for ack in batch])
+            finally:
+                for _ in batches:
+                    self._queue.task_done()
+
+
+__all__ = ["AckWriter", "ClaimAhead"]
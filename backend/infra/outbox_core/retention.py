@@ -0,0 +1,148 @@
+"""Retention for processed outbox rows.
+
+Outbox tables are queues, not logs: once a row is `done` it is only useful for
+short-term debugging. `OutboxRetention` deletes done rows older than the
+retention window in small batches (SKIP LOCKED, one commit per batch) so the
+tables and their indexes stay proportional to recent traffic.
+
+Never deleted:
+- `failed` rows (terminal failures wait for manual replay), and
+- rows that went through manual replay (`replay_count > 0`), so the replay
+  audit fields (`last_replayed_*`) survive.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infra.observability.outbox_metrics import outbox_retention_deleted_total
+
+logger = logging.getLogger(__name__)
+
+
+async def purge_done_rows(
+    session: AsyncSession,
+    model: Any,
+    *,
+    now: datetime,
+    retention_seconds: float,
+    batch_size: int,
+) -> int:
+    """Delete up to `batch_size` expired done rows. Returns the number deleted.
+
+    The model is expected to look like SearchOutboxEventModel (attributes used).
+    """
+
+    cutoff = now - timedelta(seconds=float(retention_seconds))
+    expired_ids = (
+        select(model.id)
+        .where(
+            model.status == "done",
+            model.processed_at.is_not(None),
+            model.processed_at < cutoff,
+            model.replay_count == 0,
+        )
+        .order_by(model.processed_at.asc())
+        .limit(int(batch_size))
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    result = await session.execute(delete(model).where(model.id.in_(expired_ids)))
+    return int(result.rowcount or 0)
+
+
+class OutboxRetention:
+    """Background task applying `purge_done_rows` every `interval_seconds`.
+
+    Each cycle deletes batches until one comes back short (or `max_batches`),
+    committing per batch to keep transactions and lock sets small.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        model: Any,
+        *,
+        projection: str,
+        retention_seconds: float,
+        interval_seconds: float,
+        batch_size: int = 1000,
+        max_batches: int = 20,
+    ):
+        self._session_factory = session_factory
+        self._model = model
+        self._projection = projection
+        self._retention_seconds = float(retention_seconds)
+        self._interval_seconds = max(1.0, float(interval_seconds))
+        self._batch_size = max(1, int(batch_size))
+        self._max_batches = max(1, int(max_batches))
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._retention_seconds > 0
+
+    async def __aenter__(self) -> "OutboxRetention":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"outbox-retention:{self._projection}")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def run_once(self) -> int:
+        total = 0
+        for _ in range(self._max_batches):
+            async with self._session_factory() as session:
+                deleted = await purge_done_rows(
+                    session,
+                    self._model,
+                    now=datetime.now(timezone.utc),
+                    retention_seconds=self._retention_seconds,
+                    batch_size=self._batch_size,
+                )
+                await session.commit()
+            total += deleted
+            if deleted < self._batch_size:
+                break
+        if total:
+            outbox_retention_deleted_total.labels(projection=self._projection).inc(total)
+            logger.info({"event": "outbox.retention.deleted", "projection": self._projection, "deleted": total})
+        return total
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                logger.warning(
+                    {
+                        "event": "outbox.retention.failed",
+                        "projection": self._projection,
+                        "error": f"{type(exc).__name__}: {exc}",
+                    }
+                )
+            await asyncio.sleep(self._interval_seconds)
+
+
+__all__ = ["OutboxRetention", "purge_done_rows"]
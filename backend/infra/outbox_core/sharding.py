@@ -0,0 +1,233 @@
+"""Sharded outbox consumers.
+
+Without sharding, every worker claims from the head of the same ordered range
+and SKIP LOCKED contention grows with the number of workers; per-entity
+ordering only holds inside one process (EntityLockTable).
+
+With sharding, rows are split into `partitions` buckets by
+hash(entity_type, entity_id). Each bucket is leased to at most one worker
+(outbox_shard_leases), and a worker only claims rows of the buckets it holds:
+
+- workers claim disjoint row sets, so they no longer fight over head rows;
+- all events of one entity land in one bucket, owned by one worker at a time,
+  so per-entity claims are serialized cluster-wide.
+
+A lease is only renewed between batches, so a slow batch can outlive it and
+overlap with the next owner's. Ordering of the side effects therefore has to
+be fenced by the sink: the search worker writes ES with external versioning
+(event_version), so a stale write is rejected instead of applied.
+
+Rebalancing: every worker heartbeats into outbox_consumers and aims for
+ceil(partitions / live_workers) buckets. Workers above their share release
+extras, workers below take free or expired buckets. Callers rebalance between
+batches (never with work in flight), so a released bucket has nothing pending
+on the old owner. A crashed worker's buckets free up when its lease expires.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from sqlalchemy import Integer, Text, cast, delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.sql.elements import ColumnElement
+
+from infra.database.models.outbox_shard_models import OutboxConsumerModel, OutboxShardLeaseModel
+from infra.observability.outbox_metrics import outbox_owned_shards
+
+logger = logging.getLogger(__name__)
+
+
+def shard_of(model: Any, partitions: int) -> ColumnElement[int]:
+    """SQL expression for the bucket of an outbox row (stable across processes).
+
+    The model is expected to look like SearchOutboxEventModel (attributes used).
+    """
+
+    key = cast(model.entity_type, Text) + ":" + cast(model.entity_id, Text)
+    return cast(func.hashtext(key).op("&")(0x7FFFFFFF) % int(partitions), Integer)
+
+
+class ShardLeaseManager:
+    """Holds this worker's bucket leases for one projection."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        *,
+        projection: str,
+        worker_id: str,
+        partitions: int = 64,
+        lease_seconds: float = 15.0,
+    ):
+        self._session_factory = session_factory
+        self._projection = projection
+        self._worker_id = str(worker_id)
+        self._partitions = max(1, int(partitions))
+        self._lease_seconds = max(1.0, float(lease_seconds))
+        self._owned: frozenset[int] = frozenset()
+        self._valid_until_mono = 0.0
+        self._seeded = False
+
+    @property
+    def partitions(self) -> int:
+        return self._partitions
+
+    @property
+    def rebalance_interval_seconds(self) -> float:
+        return self._lease_seconds / 3.0
+
+    @property
+    def owned(self) -> frozenset[int]:
+        """Buckets this worker may claim from; empty once the lease may have lapsed."""
+        if time.monotonic() >= self._valid_until_mono:
+            return frozenset()
+        return self._owned
+
+    def claim_predicate(self, model: Any) -> ColumnElement[bool]:
+        return shard_of(model, self._partitions).in_(sorted(self.owned))
+
+    async def __aenter__(self) -> "ShardLeaseManager":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        try:
+            await self.release_all()
+        except Exception:  # noqa: BLE001
+            logger.exception("Failed to release outbox shard leases for %s", self._worker_id)
+
+    async def rebalance(self) -> frozenset[int]:
+        """Heartbeat, renew held buckets, then release/acquire toward the fair share."""
+
+        started_mono = time.monotonic()
+        now = datetime.now(timezone.utc)
+        until = now + timedelta(seconds=self._lease_seconds)
+        lease = OutboxShardLeaseModel
+        consumer = OutboxConsumerModel
+
+        async with self._session_factory() as session:
+            if not self._seeded:
+                await session.execute(
+                    pg_insert(lease)
+                    .values(
+                        [
+                            {"projection_name": self._projection, "shard_id": shard_id, "updated_at": now}
+                            for shard_id in range(self._partitions)
+                        ]
+                    )
+                    .on_conflict_do_nothing()
+                )
+
+            await session.execute(
+                pg_insert(consumer)
+                .values(
+                    projection_name=self._projection,
+                    worker_id=self._worker_id,
+                    heartbeat_until=until,
+                    joined_at=now,
+                )
+                .on_conflict_do_update(
+                    index_elements=[consumer.projection_name, consumer.worker_id],
+                    set_={"heartbeat_until": until},
+                )
+            )
+            await session.execute(
+                delete(consumer).where(
+                    consumer.projection_name == self._projection,
+                    consumer.heartbeat_until < now,
+                )
+            )
+            live_workers = (
+                await session.execute(
+                    select(func.count()).select_from(consumer).where(consumer.projection_name == self._projection)
+                )
+            ).scalar_one()
+            target = math.ceil(self._partitions / max(1, int(live_workers)))
+
+            mine = set(
+                (
+                    await session.execute(
+                        update(lease)
+                        .where(
+                            lease.projection_name == self._projection,
+                            lease.shard_id < self._partitions,
+                            lease.owner == self._worker_id,
+                        )
+                        .values(lease_until=until, updated_at=now)
+                        .returning(lease.shard_id)
+                    )
+                ).scalars()
+            )
+
+            if len(mine) > target:
+                extras = sorted(mine)[target:]
+                await session.execute(
+                    update(lease)
+                    .where(
+                        lease.projection_name == self._projection,
+                        lease.shard_id.in_(extras),
+                        lease.owner == self._worker_id,
+                    )
+                    .values(owner=None, lease_until=None, updated_at=now)
+                )
+                mine.difference_update(extras)
+            elif len(mine) < target:
+                free = (
+                    select(lease.shard_id)
+                    .where(
+                        lease.projection_name == self._projection,
+                        lease.shard_id < self._partitions,
+                        or_(lease.owner.is_(None), lease.lease_until < now),
+                    )
+                    .order_by(lease.shard_id)
+                    .limit(target - len(mine))
+                    .with_for_update(skip_locked=True)
+                    .scalar_subquery()
+                )
+                acquired = (
+                    await session.execute(
+                        update(lease)
+                        .where(lease.projection_name == self._projection, lease.shard_id.in_(free))
+                        .values(owner=self._worker_id, lease_until=until, updated_at=now)
+                        .returning(lease.shard_id)
+                    )
+                ).scalars()
+                mine.update(acquired)
+
+            await session.commit()
+
+        self._seeded = True
+        self._owned = frozenset(mine)
+        # Trust the lease a little less than its DB expiry (clock skew, slow commit).
+        self._valid_until_mono = started_mono + self._lease_seconds * 0.8
+        outbox_owned_shards.labels(projection=self._projection).set(len(self._owned))
+        return self._owned
+
+    async def release_all(self) -> None:
+        now = datetime.now(timezone.utc)
+        self._owned = frozenset()
+        self._valid_until_mono = 0.0
+        outbox_owned_shards.labels(projection=self._projection).set(0)
+        async with self._session_factory() as session:
+            await session.execute(
+                update(OutboxShardLeaseModel)
+                .where(
+                    OutboxShardLeaseModel.projection_name == self._projection,
+                    OutboxShardLeaseModel.owner == self._worker_id,
+                )
+                .values(owner=None, lease_until=None, updated_at=now)
+            )
+            await session.execute(
+                delete(OutboxConsumerModel).where(
+                    OutboxConsumerModel.projection_name == self._projection,
+                    OutboxConsumerModel.worker_id == self._worker_id,
+                )
+            )
+            await session.commit()
+
+
+__all__ = ["ShardLeaseManager", "shard_of"]
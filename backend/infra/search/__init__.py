@@ -8,7 +8,9 @@ from .search_indexer import SearchIndexer, PostgresSearchIndexer, get_search_ind
 from .candidate_provider_factory import get_stage1_candidate_provider
 from .postgres_fts_candidate_provider import PostgresFTSCandidateProvider
 from .elastic_candidate_provider import ElasticCandidateProvider
+from .elastic_client import get_elastic_client, shutdown_elastic_client
 from .fake_elastic_candidate_provider import FakeElasticCandidateProvider
+from .stage1_candidate_cache import CachedCandidateProvider, Stage1CandidateCache
 
 __all__ = [
     "SearchIndexer",
@@ -17,5 +19,9 @@ __all__ = [
     "get_stage1_candidate_provider",
     "PostgresFTSCandidateProvider",
     "ElasticCandidateProvider",
+    "get_elastic_client",
+    "shutdown_elastic_client",
     "FakeElasticCandidateProvider",
+    "CachedCandidateProvider",
+    "Stage1CandidateCache",
 ]
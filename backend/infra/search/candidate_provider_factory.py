@@ -8,6 +8,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from api.app.modules.search.application.ports.candidate_provider import CandidateProvider
 from infra.search.postgres_fts_candidate_provider import PostgresFTSCandidateProvider
 from infra.search.elastic_candidate_provider import ElasticCandidateProvider
+from infra.search.stage1_candidate_cache import (
+    CachedCandidateProvider,
+    get_stage1_candidate_cache,
+    read_search_index_watermark,
+    read_search_outbox_ack_watermark,
+    stage1_cache_enabled,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -19,21 +26,37 @@ def get_stage1_candidate_provider(session: AsyncSession) -> CandidateProvider:
       - SEARCH_STAGE1_PROVIDER=postgres|elastic
 
     Default is postgres to preserve current behavior.
+
+    Unless SEARCH_STAGE1_CACHE_ENABLED=false, the provider is wrapped in a
+    process-wide LRU/TTL candidate cache invalidated by a high-water mark of
+    what the provider can see: search_index.event_version for postgres, the
+    latest search outbox ack for elastic (see stage1_candidate_cache).
     """
 
     provider = (os.getenv("SEARCH_STAGE1_PROVIDER") or "postgres").strip().lower()
 
     if provider == "postgres":
         selected: CandidateProvider = PostgresFTSCandidateProvider(session)
+        read_watermark = read_search_index_watermark
     elif provider == "elastic":
         selected = ElasticCandidateProvider()
+        read_watermark = read_search_outbox_ack_watermark
     else:
         raise ValueError(f"Unknown SEARCH_STAGE1_PROVIDER={provider!r}")
 
+    cached = stage1_cache_enabled()
+    if cached:
+        selected = CachedCandidateProvider(
+            selected,
+            get_stage1_candidate_cache(provider),
+            watermark=lambda: read_watermark(session),
+        )
+
     logger.info(
         {
             "event": "search.stage1.provider.selected",
             "provider": provider,
+            "cached": cached,
         }
     )
     return selected
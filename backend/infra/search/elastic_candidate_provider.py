@@ -1,76 +1,96 @@
 from __future__ import annotations
 
-import json
 import logging
-import os
-from dataclasses import dataclass
-from typing import Any
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+from typing import Any, Optional
 from uuid import UUID
 
-from api.app.modules.search.application.ports.candidate_provider import Candidate
+import httpx
 
-logger = logging.getLogger(__name__)
-
-
-@dataclass(frozen=True)
-class _ElasticConfig:
-    base_url: str
-    index: str
-
-
-def _get_config() -> _ElasticConfig:
-    base_url = (os.getenv("ELASTIC_URL") or "http://localhost:9200").rstrip("/")
-    index = os.getenv("ELASTIC_INDEX") or "wordloom-search-index"
-    return _ElasticConfig(base_url=base_url, index=index)
+from api.app.modules.search.application.ports.candidate_provider import (
+    Candidate,
+    CandidateCursor,
+    CandidateScope,
+)
+from infra.search.elastic_client import (
+    ElasticConfig,
+    get_elastic_client,
+    get_elastic_config,
+    request_timeout,
+)
 
+logger = logging.getLogger(__name__)
 
-def _http_json(method: str, url: str, body: dict[str, Any] | None) -> dict[str, Any]:
-    data = None if body is None else json.dumps(body).encode("utf-8")
-    req = Request(url, data=data, method=method)
-    req.add_header("Accept", "application/json")
-    if data is not None:
-        req.add_header("Content-Type", "application/json")
 
+async def _http_json(
+    client: httpx.AsyncClient,
+    method: str,
+    path: str,
+    body: dict[str, Any] | None,
+    *,
+    timeout: httpx.Timeout,
+) -> dict[str, Any]:
     try:
-        with urlopen(req, timeout=5) as resp:
-            payload = resp.read().decode("utf-8")
-            return json.loads(payload) if payload else {}
-    except HTTPError as e:
-        detail = e.read().decode("utf-8", errors="replace")
-        raise RuntimeError(f"Elastic HTTPError {e.code} for {url}: {detail}") from e
-    except URLError as e:
-        raise RuntimeError(f"Elastic connection failed for {url}: {e}") from e
+        resp = await client.request(method, path, json=body, timeout=timeout)
+    except httpx.RequestError as e:
+        raise RuntimeError(f"Elastic connection failed for {path}: {e}") from e
+
+    if resp.status_code >= 400:
+        raise RuntimeError(f"Elastic HTTPError {resp.status_code} for {path}: {resp.text}")
+    return resp.json() if resp.content else {}
 
 
 class ElasticCandidateProvider:
     """Stage1 recall using Elasticsearch.
 
     Requires ES docs contain:
-      - entity_type: 'block'
+      - entity_type: keyword ('block' by default; see CandidateScope.entity_types)
+      - library_id / book_id: keyword scope keys (filter context, cached by ES)
       - entity_id: UUID string
       - text: searchable text
       - snippet: optional
       - event_version: bigint (used as order_key)
 
+    Uses the process-wide pooled async client (infra.search.elastic_client), so
+    a slow ES response only awaits this request instead of blocking the loop.
+
     Env:
       - ELASTIC_URL (default http://localhost:9200)
       - ELASTIC_INDEX (default wordloom-search-index)
+      - ELASTIC_TIMEOUT_SECONDS (default 5.0)
+      - ELASTIC_FILTER_BOOK_ID (default false)
     """
 
-    def __init__(self):
-        self._cfg = _get_config()
-
-    async def get_block_candidates(self, *, q: str, candidate_limit: int) -> list[Candidate]:
-        url = f"{self._cfg.base_url}/{self._cfg.index}/_search"
+    def __init__(
+        self,
+        client: httpx.AsyncClient | None = None,
+        config: ElasticConfig | None = None,
+    ):
+        self._cfg = config or get_elastic_config()
+        self._client = client
+
+    async def get_block_candidates(
+        self,
+        *,
+        q: str,
+        candidate_limit: int,
+        scope: Optional[CandidateScope] = None,
+        after: Optional[CandidateCursor] = None,
+    ) -> list[Candidate]:
+        path = f"/{self._cfg.index}/_search"
+
+        scope = scope or CandidateScope()
+        filters: list[dict[str, Any]] = [{"terms": {"entity_type": list(scope.entity_types)}}]
+        if scope.library_id is not None:
+            filters.append({"term": {"library_id": str(scope.library_id)}})
+        if scope.book_id is not None and self._cfg.filter_book_id:
+            filters.append({"term": {"book_id": str(scope.book_id)}})
 
         query = {
             "size": candidate_limit,
             "track_total_hits": False,
             "query": {
                 "bool": {
-                    "filter": [{"term": {"entity_type": "block"}}],
+                    "filter": filters,
                     "must": [
                         {
                             "match": {
@@ -83,7 +103,10 @@ class ElasticCandidateProvider:
                     ],
                 }
             },
-            "sort": [{"event_version": {"order": "desc"}}],
+            "sort": [
+                {"event_version": {"order": "desc"}},
+                {"entity_id": {"order": "desc"}},
+            ],
             "highlight": {
                 "fields": {
                     "text": {
@@ -97,7 +120,11 @@ class ElasticCandidateProvider:
             "_source": ["entity_id", "snippet", "event_version"],
         }
 
-        resp = _http_json("POST", url, query)
+        if after is not None:
+            query["search_after"] = [after.order_key, str(after.entity_id)]
+
+        client = self._client or get_elastic_client()
+        resp = await _http_json(client, "POST", path, query, timeout=request_timeout(self._cfg))
         hits = ((resp.get("hits") or {}).get("hits")) or []
 
         candidates: list[Candidate] = []
@@ -0,0 +1,109 @@
+"""Shared async Elasticsearch HTTP client (API process).
+
+One connection-pooled `httpx.AsyncClient` per process, mirroring how
+`infra.database.session` owns the SQLAlchemy engine:
+  - lazily created on first use (scripts/tests)
+  - created eagerly at app startup and closed at app shutdown (main.py)
+
+Env:
+  - ELASTIC_URL (default http://localhost:9200)
+  - ELASTIC_INDEX (default wordloom-search-index)
+  - ELASTIC_TIMEOUT_SECONDS (default 5.0): per-request read/write/pool timeout
+  - ELASTIC_CONNECT_TIMEOUT_SECONDS (default 1.0)
+  - ELASTIC_MAX_CONNECTIONS (default 20)
+  - ELASTIC_MAX_KEEPALIVE_CONNECTIONS (default 10)
+  - ELASTIC_KEEPALIVE_EXPIRY_SECONDS (default 30.0)
+  - ELASTIC_FILTER_BOOK_ID (default false): push book_id scope into recall.
+    Enable once the index carries `book_id` (worker upserts / backfill --recreate).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass
+
+import httpx
+
+from infra.env import get_bool_env, get_float_env, get_int_env
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ElasticConfig:
+    base_url: str
+    index: str
+    timeout_seconds: float
+    connect_timeout_seconds: float
+    max_connections: int
+    max_keepalive_connections: int
+    keepalive_expiry_seconds: float
+    filter_book_id: bool = False
+
+
+def get_elastic_config() -> ElasticConfig:
+    return ElasticConfig(
+        base_url=(os.getenv("ELASTIC_URL") or "http://localhost:9200").rstrip("/"),
+        index=os.getenv("ELASTIC_INDEX") or "wordloom-search-index",
+        timeout_seconds=get_float_env("ELASTIC_TIMEOUT_SECONDS", 5.0),
+        connect_timeout_seconds=get_float_env("ELASTIC_CONNECT_TIMEOUT_SECONDS", 1.0),
+        max_connections=get_int_env("ELASTIC_MAX_CONNECTIONS", 20),
+        max_keepalive_connections=get_int_env("ELASTIC_MAX_KEEPALIVE_CONNECTIONS", 10),
+        keepalive_expiry_seconds=get_float_env("ELASTIC_KEEPALIVE_EXPIRY_SECONDS", 30.0),
+        filter_book_id=get_bool_env("ELASTIC_FILTER_BOOK_ID", False),
+    )
+
+
+def request_timeout(cfg: ElasticConfig) -> httpx.Timeout:
+    return httpx.Timeout(cfg.timeout_seconds, connect=cfg.connect_timeout_seconds)
+
+
+# ============================================================================
+# Global Client Instance - Lazy loaded
+# ============================================================================
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_elastic_client() -> httpx.AsyncClient:
+    """Get or create the process-wide pooled ES client."""
+    global _client
+    if _client is None or _client.is_closed:
+        cfg = get_elastic_config()
+        _client = httpx.AsyncClient(
+            base_url=cfg.base_url,
+            timeout=request_timeout(cfg),
+            limits=httpx.Limits(
+                max_connections=cfg.max_connections,
+                max_keepalive_connections=cfg.max_keepalive_connections,
+                keepalive_expiry=cfg.keepalive_expiry_seconds,
+            ),
+            headers={"Accept": "application/json"},
+        )
+        logger.info(
+            {
+                "event": "search.elastic.client.created",
+                "base_url": cfg.base_url,
+                "max_connections": cfg.max_connections,
+            }
+        )
+    return _client
+
+
+async def shutdown_elastic_client() -> None:
+    """Close pooled connections. Call this on application shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        logger.info({"event": "search.elastic.client.closed"})
+
+
+__all__ = [
+    "ElasticConfig",
+    "get_elastic_config",
+    "get_elastic_client",
+    "request_timeout",
+    "shutdown_elastic_client",
+]
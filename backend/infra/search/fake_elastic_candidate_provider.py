@@ -1,20 +1,38 @@
 from __future__ import annotations
 
-from api.app.modules.search.application.ports.candidate_provider import Candidate
+from typing import Optional
+
+from api.app.modules.search.application.ports.candidate_provider import (
+    Candidate,
+    CandidateCursor,
+    CandidateScope,
+)
 
 
 class FakeElasticCandidateProvider:
     """Dev/test provider to simulate Elastic Stage1 recall.
 
     Intentionally simple: returns preconfigured candidates and only applies the
-    requested candidate_limit.
+    requested candidate_limit and `after` cursor (scope is enforced by Stage2).
     """
 
     def __init__(self, candidates: list[Candidate]):
         self._candidates = list(candidates)
 
-    async def get_block_candidates(self, *, q: str, candidate_limit: int) -> list[Candidate]:
-        return self._candidates[:candidate_limit]
+    async def get_block_candidates(
+        self,
+        *,
+        q: str,
+        candidate_limit: int,
+        scope: Optional[CandidateScope] = None,
+        after: Optional[CandidateCursor] = None,
+    ) -> list[Candidate]:
+        candidates = self._candidates
+        if after is not None:
+            candidates = [
+                c for c in candidates if (c.order_key, c.entity_id) < (after.order_key, after.entity_id)
+            ]
+        return candidates[:candidate_limit]
 
 
 __all__ = ["FakeElasticCandidateProvider"]
@@ -1,55 +1,85 @@
 from __future__ import annotations
 
+from typing import Any, Optional
+
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.app.modules.search.application.ports.candidate_provider import Candidate
+from api.app.modules.search.application.ports.candidate_provider import (
+    Candidate,
+    CandidateCursor,
+    CandidateScope,
+)
 
 
 class PostgresFTSCandidateProvider:
     """Stage1 recall using Postgres FTS over `search_index`.
 
     This is the current production implementation (before Elastic).
+    Matches against the stored `text_tsv` column so recall is GIN-index driven.
+
+    No snippets here: ts_headline is expensive and most candidates are dropped
+    by Stage2, so highlighting runs after Stage2, only for the returned page.
+
+    Scope pushdown:
+      - entity_types: search_index.entity_type
+      - library_id: search_index.library_id (projection partition key)
+      - book_id: semi-join to blocks (search_index has no book column)
     """
 
     def __init__(self, session: AsyncSession):
         self._session = session
 
-    async def get_block_candidates(self, *, q: str, candidate_limit: int) -> list[Candidate]:
+    async def get_block_candidates(
+        self,
+        *,
+        q: str,
+        candidate_limit: int,
+        scope: Optional[CandidateScope] = None,
+        after: Optional[CandidateCursor] = None,
+    ) -> list[Candidate]:
+        scope = scope or CandidateScope()
+        where = [
+            "si.entity_type = ANY(CAST(:entity_types AS text[]))",
+            "si.text_tsv @@ plainto_tsquery('english', :q)",
+        ]
+        params: dict[str, Any] = {
+            "q": q,
+            "candidate_limit": candidate_limit,
+            "entity_types": list(scope.entity_types),
+        }
+
+        if scope.library_id is not None:
+            where.append("si.library_id = CAST(:library_id AS uuid)")
+            params["library_id"] = scope.library_id
+        if scope.book_id is not None:
+            where.append(
+                "EXISTS (SELECT 1 FROM blocks b WHERE b.id = si.entity_id AND b.book_id = CAST(:book_id AS uuid))"
+            )
+            params["book_id"] = scope.book_id
+        if after is not None:
+            where.append("(si.event_version, si.entity_id) < (:after_order_key, CAST(:after_entity_id AS uuid))")
+            params["after_order_key"] = after.order_key
+            params["after_entity_id"] = after.entity_id
+
         sql = text(
-            """
+            f"""
             SELECT
                 si.entity_id AS entity_id,
-                COALESCE(
-                    ts_headline(
-                        'english',
-                        si.text,
-                        plainto_tsquery('english', :q),
-                        'MaxFragments=2,MinWords=3,MaxWords=15,ShortWord=3,HighlightAll=FALSE'
-                    ),
-                    ''
-                ) AS snippet,
-                ts_rank_cd(
-                    to_tsvector('english', si.text),
-                    plainto_tsquery('english', :q)
-                ) AS score,
+                ts_rank_cd(si.text_tsv, plainto_tsquery('english', :q)) AS score,
                 si.event_version AS order_key
             FROM search_index si
-            WHERE si.entity_type = 'block'
-              AND to_tsvector('english', si.text) @@ plainto_tsquery('english', :q)
-            ORDER BY si.event_version DESC
+            WHERE {" AND ".join(where)}
+            ORDER BY si.event_version DESC, si.entity_id DESC
             LIMIT :candidate_limit
             """
         )
 
-        rows = (
-            await self._session.execute(sql, {"q": q, "candidate_limit": candidate_limit})
-        ).mappings().all()
+        rows = (await self._session.execute(sql, params)).mappings().all()
 
         return [
             Candidate(
                 entity_id=row["entity_id"],
-                snippet=row.get("snippet") or "",
                 score=float(row["score"]) if row.get("score") is not None else None,
                 order_key=int(row["order_key"]),
             )
@@ -22,8 +22,6 @@ from api.app.modules.block.domain.events import BlockCreated, BlockUpdated
 from api.app.modules.book.domain.events import BookCreated, BookRenamed
 from api.app.modules.tag.domain.events import TagCreated, TagRenamed
 from infra.database.models.search_index_models import SearchIndexModel
-from infra.database.models.search_outbox_models import SearchOutboxEventModel
-from infra.observability.tracing import inject_trace_context
 from infra.database.models.book_models import BookModel
 from infra.observability.outbox_metrics import outbox_produced_total
 from infra.search.search_outbox_repository import SearchOutboxRepository
@@ -271,16 +269,11 @@ class PostgresSearchIndexer:
         )
         await self._db.execute(stmt)
 
-        traceparent, tracestate = inject_trace_context()
-        await self._db.execute(
-            pg_insert(SearchOutboxEventModel).values(
-                entity_type="tag",
-                entity_id=event.tag_id,
-                op="upsert",
-                event_version=version,
-                traceparent=traceparent,
-                tracestate=tracestate,
-            )
+        await self._outbox.enqueue(
+            entity_type="tag",
+            entity_id=event.tag_id,
+            op="upsert",
+            event_version=version,
         )
         outbox_produced_total.labels(event_type="tag.created", entity_type="tag").inc()
         logger.info("Search index: inserted tag %s (outbox enqueued)", event.tag_id)
@@ -312,16 +305,11 @@ class PostgresSearchIndexer:
         )
         await self._db.execute(stmt)
 
-        traceparent, tracestate = inject_trace_context()
-        await self._db.execute(
-            pg_insert(SearchOutboxEventModel).values(
-                entity_type="tag",
-                entity_id=event.tag_id,
-                op="upsert",
-                event_version=version,
-                traceparent=traceparent,
-                tracestate=tracestate,
-            )
+        await self._outbox.enqueue(
+            entity_type="tag",
+            entity_id=event.tag_id,
+            op="upsert",
+            event_version=version,
         )
         outbox_produced_total.labels(event_type="tag.renamed", entity_type="tag").inc()
         logger.info("Search index: updated tag %s (outbox enqueued)", event.tag_id)
@@ -334,16 +322,11 @@ class PostgresSearchIndexer:
         await self._db.execute(stmt)
 
         version = _event_version(datetime.utcnow())
-        traceparent, tracestate = inject_trace_context()
-        await self._db.execute(
-            pg_insert(SearchOutboxEventModel).values(
-                entity_type="tag",
-                entity_id=tag_id,
-                op="delete",
-                event_version=version,
-                traceparent=traceparent,
-                tracestate=tracestate,
-            )
+        await self._outbox.enqueue(
+            entity_type="tag",
+            entity_id=tag_id,
+            op="delete",
+            event_version=version,
         )
         outbox_produced_total.labels(event_type="tag.deleted", entity_type="tag").inc()
         logger.info("Search index: deleted tag %s (outbox enqueued)", tag_id)
@@ -3,6 +3,9 @@
 This is an infra-only helper to encapsulate writes into `search_outbox_events`.
 The worker/daemon can remain script-driven; this repo is mainly used by
 projection writers to enqueue events within the same DB transaction.
+
+Each enqueue also queues a NOTIFY on SEARCH_OUTBOX_CHANNEL; Postgres delivers it
+on commit, waking idle workers immediately instead of at their next poll.
 """
 
 from __future__ import annotations
@@ -14,6 +17,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from infra.database.models.search_outbox_models import SearchOutboxEventModel
 from infra.observability.tracing import inject_trace_context
+from infra.outbox_core.notify import SEARCH_OUTBOX_CHANNEL, notify_outbox
 
 
 class SearchOutboxRepository:
@@ -39,6 +43,7 @@ class SearchOutboxRepository:
                 tracestate=tracestate,
             )
         )
+        await notify_outbox(self._db, SEARCH_OUTBOX_CHANNEL)
 
 
 __all__ = ["SearchOutboxRepository"]
@@ -0,0 +1,254 @@
+"""Stage1 candidate cache (two-stage search).
+
+Search-as-you-type repeats the same few queries many times per second; Stage1
+recall (FTS over search_index, or an Elastic round-trip) is the expensive half
+of two-stage search. This module puts a bounded LRU/TTL cache in front of any
+`CandidateProvider`, keyed by (normalized query, candidate_limit, scope, cursor).
+
+Freshness:
+  - Every lookup reads a high-water mark of what the provider can already see;
+    when it moves, the whole cache is flushed: any projected write may change
+    any query's recall.
+      - postgres: `search_index_watermark.version`, a one-row counter bumped
+        at commit by a deferred trigger on every search_index insert, update
+        or delete; FTS reads search_index directly. It follows commit order,
+        so deletes and late commits with an older occurred_at flush too.
+      - elastic: the latest `search_outbox_events.processed_at` (index scan on
+        idx_search_outbox_processed). search_index moves before the outbox
+        worker has written ES, so its version would flush too early and let
+        the pre-write ES results be cached again until TTL.
+  - Deletes move both marks (a search_index delete, an acked delete event).
+    Stage2 drops deleted/soft-deleted blocks anyway; TTL bounds anything else.
+  - Stage2 business filtering always runs fresh; only candidate lists are cached.
+
+Env:
+  - SEARCH_STAGE1_CACHE_ENABLED (default true)
+  - SEARCH_STAGE1_CACHE_MAX_ENTRIES (default 1024)
+  - SEARCH_STAGE1_CACHE_TTL_SECONDS (default 30.0)
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.app.modules.search.application.ports.candidate_provider import (
+    Candidate,
+    CandidateCursor,
+    CandidateProvider,
+    CandidateScope,
+)
+from infra.env import get_bool_env, get_float_env, get_int_env
+from infra.observability.outbox_metrics import (
+    search_stage1_cache_entries,
+    search_stage1_cache_invalidations_total,
+    search_stage1_cache_requests_total,
+)
+
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 30.0
+
+
+def normalize_query(q: str) -> str:
+    """Cache-key normalization: case-fold and collapse whitespace."""
+    return " ".join((q or "").split()).casefold()
+
+
+@dataclass(frozen=True)
+class _Entry:
+    candidates: tuple[Candidate, ...]
+    expires_at: float
+
+
+class Stage1CandidateCache:
+    """Bounded LRU cache of Stage1 candidate lists with TTL + watermark flush.
+
+    Not thread-safe by design: it lives on one event loop, and no method awaits
+    while mutating the underlying OrderedDict.
+    """
+
+    def __init__(
+        self,
+        *,
+        provider: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._provider = provider
+        self._max_entries = max(1, int(max_entries))
+        self._ttl_seconds = float(ttl_seconds)
+        self._clock = clock
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self._watermark: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def observe_watermark(self, watermark: int) -> None:
+        """Flush everything if search_index moved since entries were filled."""
+        if self._watermark is not None and watermark != self._watermark and self._entries:
+            self._entries.clear()
+            search_stage1_cache_invalidations_total.labels(
+                provider=self._provider, reason="watermark"
+            ).inc()
+            self._update_size()
+        self._watermark = watermark
+
+    @staticmethod
+    def _key(
+        q: str,
+        candidate_limit: int,
+        scope: Optional[CandidateScope],
+        after: Optional[CandidateCursor],
+    ) -> tuple:
+        return (normalize_query(q), int(candidate_limit), scope or CandidateScope(), after)
+
+    def get(
+        self,
+        q: str,
+        candidate_limit: int,
+        scope: Optional[CandidateScope] = None,
+        after: Optional[CandidateCursor] = None,
+    ) -> Optional[list[Candidate]]:
+        key = self._key(q, candidate_limit, scope, after)
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= self._clock():
+            del self._entries[key]
+            search_stage1_cache_invalidations_total.labels(
+                provider=self._provider, reason="expired"
+            ).inc()
+            self._update_size()
+            entry = None
+
+        if entry is None:
+            search_stage1_cache_requests_total.labels(provider=self._provider, result="miss").inc()
+            return None
+
+        self._entries.move_to_end(key)
+        search_stage1_cache_requests_total.labels(provider=self._provider, result="hit").inc()
+        return list(entry.candidates)
+
+    def put(
+        self,
+        q: str,
+        candidate_limit: int,
+        candidates: list[Candidate],
+        scope: Optional[CandidateScope] = None,
+        after: Optional[CandidateCursor] = None,
+    ) -> None:
+        key = self._key(q, candidate_limit, scope, after)
+        self._entries[key] = _Entry(
+            candidates=tuple(candidates),
+            expires_at=self._clock() + self._ttl_seconds,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            search_stage1_cache_invalidations_total.labels(
+                provider=self._provider, reason="evicted"
+            ).inc()
+        self._update_size()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._watermark = None
+        self._update_size()
+
+    def _update_size(self) -> None:
+        search_stage1_cache_entries.labels(provider=self._provider).set(len(self._entries))
+
+
+async def read_search_index_watermark(session: AsyncSession) -> int:
+    """Commit-time change counter of `search_index` (moves on every committed write or delete)."""
+    value = (
+        await session.execute(text("SELECT version FROM search_index_watermark WHERE id = 1"))
+    ).scalar_one_or_none()
+    return int(value or 0)
+
+
+async def read_search_outbox_ack_watermark(session: AsyncSession) -> int:
+    """Latest outbox ack (done/failed), in epoch microseconds: moves once ES has been written."""
+    value = (
+        await session.execute(
+            text(
+                "SELECT COALESCE(CAST(EXTRACT(EPOCH FROM MAX(processed_at)) * 1000000 AS BIGINT), 0) "
+                "FROM search_outbox_events"
+            )
+        )
+    ).scalar_one()
+    return int(value or 0)
+
+
+class CachedCandidateProvider:
+    """CandidateProvider decorator that serves repeated queries from cache."""
+
+    def __init__(
+        self,
+        inner: CandidateProvider,
+        cache: Stage1CandidateCache,
+        watermark: Callable[[], Awaitable[int]],
+    ):
+        self._inner = inner
+        self._cache = cache
+        self._watermark = watermark
+
+    async def get_block_candidates(
+        self,
+        *,
+        q: str,
+        candidate_limit: int,
+        scope: Optional[CandidateScope] = None,
+        after: Optional[CandidateCursor] = None,
+    ) -> list[Candidate]:
+        self._cache.observe_watermark(await self._watermark())
+
+        cached = self._cache.get(q, candidate_limit, scope, after)
+        if cached is not None:
+            return cached
+
+        candidates = await self._inner.get_block_candidates(
+            q=q, candidate_limit=candidate_limit, scope=scope, after=after
+        )
+        self._cache.put(q, candidate_limit, candidates, scope, after)
+        return candidates
+
+
+# ============================================================================
+# Global Cache Instances - one per provider kind, lazy loaded
+# ============================================================================
+
+_caches: dict[str, Stage1CandidateCache] = {}
+
+
+def stage1_cache_enabled() -> bool:
+    return get_bool_env("SEARCH_STAGE1_CACHE_ENABLED", True)
+
+
+def get_stage1_candidate_cache(provider: str) -> Stage1CandidateCache:
+    cache = _caches.get(provider)
+    if cache is None:
+        cache = Stage1CandidateCache(
+            provider=provider,
+            max_entries=get_int_env("SEARCH_STAGE1_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+            ttl_seconds=get_float_env("SEARCH_STAGE1_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS),
+        )
+        _caches[provider] = cache
+    return cache
+
+
+__all__ = [
+    "CachedCandidateProvider",
+    "Stage1CandidateCache",
+    "get_stage1_candidate_cache",
+    "normalize_query",
+    "read_search_index_watermark",
+    "read_search_outbox_ack_watermark",
+    "stage1_cache_enabled",
+]
@@ -0,0 +1,377 @@
+"""Chronicle activity rollup (chronicle_book_activity_daily) maintenance.
+
+- apply_chronicle_activity: add the newly projected chronicle entries of one
+  projector batch to their (book, UTC day) buckets. The chronicle outbox
+  projector calls it once per batch, after the chronicle_entries upserts and in
+  the same transaction. Deltas are summed first and written in key order
+  ((book_id, day), then books.id), so each hot row is touched once per batch
+  and concurrent batches lock rows in the same order (no deadlocks);
+  record_chronicle_activity is the one-entry form.
+- rebuild_chronicle_activity_rollup: recompute every bucket from
+  chronicle_entries (after a projection rebuild).
+
+The view buckets double as the day buckets of the rolling visit counters on
+books (visit_count_90d, last_visited_at):
+
+- apply_chronicle_activity bumps them incrementally for projected views;
+- expire_book_visit_counts recomputes the books whose view buckets just left
+  the window (run periodically by `BookVisitExpiry` in the chronicle worker);
+- recompute_book_visit_counts recomputes them in bulk (after a rebuild, or via
+  scripts/legacy/recompute_book_visit_counters.py).
+
+The rollup mirrors chronicle_entries, not chronicle_events: it counts what the
+projector has materialized, so both stay consistent under replays and rebuilds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import Date, cast, delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infra.database.models.book_models import BookModel
+from infra.database.models.chronicle_activity_models import ChronicleBookActivityDailyModel
+from infra.database.models.chronicle_entries_models import ChronicleEntryModel
+
+# The only chronicle event counted as a view; everything else is an edit.
+VIEW_EVENT_TYPE = "book_opened"
+
+# Width of books.visit_count_90d, in UTC days (today included).
+VISIT_WINDOW_DAYS = 90
+
+logger = logging.getLogger(__name__)
+
+
+def utc_day(occurred_at: datetime) -> date:
+    if occurred_at.tzinfo is None:
+        occurred_at = occurred_at.replace(tzinfo=timezone.utc)
+    return occurred_at.astimezone(timezone.utc).date()
+
+
+def visit_window_start(today: date) -> date:
+    """First UTC day still counted by visit_count_90d."""
+
+    return today - timedelta(days=VISIT_WINDOW_DAYS - 1)
+
+
+def _utc_today() -> date:
+    return utc_day(datetime.now(timezone.utc))
+
+
+@dataclass(frozen=True)
+class ChronicleActivity:
+    """One newly projected chronicle entry, as counted by the rollup."""
+
+    book_id: UUID
+    event_type: str
+    occurred_at: datetime
+
+
+@dataclass
+class BucketDelta:
+    book_id: UUID
+    day: date
+    edits: int
+    views: int
+    last_activity_at: datetime
+
+
+@dataclass
+class VisitDelta:
+    book_id: UUID
+    window_views: int
+    last_visited_at: datetime
+
+
+def aggregate_chronicle_activity(
+    activities: Sequence[ChronicleActivity],
+    *,
+    today: date,
+) -> Tuple[List[BucketDelta], List[VisitDelta]]:
+    """Sum a batch into per-(book, day) bucket deltas and per-book visit deltas.
+
+    Both lists come back in lock order: buckets by (book_id, day), books by id.
+    Views before the window start only move last_visited_at.
+    """
+
+    window_start = visit_window_start(today)
+    buckets: Dict[Tuple[UUID, date], BucketDelta] = {}
+    visits: Dict[UUID, VisitDelta] = {}
+    for activity in activities:
+        day = utc_day(activity.occurred_at)
+        is_view = activity.event_type == VIEW_EVENT_TYPE
+        bucket = buckets.get((activity.book_id, day))
+        if bucket is None:
+            bucket = buckets[(activity.book_id, day)] = BucketDelta(
+                book_id=activity.book_id, day=day, edits=0, views=0, last_activity_at=activity.occurred_at
+            )
+        bucket.last_activity_at = max(bucket.last_activity_at, activity.occurred_at)
+        if not is_view:
+            bucket.edits += 1
+            continue
+        bucket.views += 1
+
+        visit = visits.get(activity.book_id)
+        if visit is None:
+            visit = visits[activity.book_id] = VisitDelta(
+                book_id=activity.book_id, window_views=0, last_visited_at=activity.occurred_at
+            )
+        visit.last_visited_at = max(visit.last_visited_at, activity.occurred_at)
+        if day >= window_start:
+            visit.window_views += 1
+
+    return (
+        [buckets[key] for key in sorted(buckets)],
+        [visits[book_id] for book_id in sorted(visits)],
+    )
+
+
+async def apply_chronicle_activity(
+    session: AsyncSession,
+    activities: Sequence[ChronicleActivity],
+    *,
+    today: Optional[date] = None,
+) -> None:
+    """Add a batch of projected entries to the rollup and visit counters (caller commits).
+
+    `today` (default: the UTC date) decides which views still fall inside the
+    rolling window.
+    """
+
+    buckets, visits = aggregate_chronicle_activity(activities, today=today or _utc_today())
+    if buckets:
+        daily = ChronicleBookActivityDailyModel
+        # One statement; Postgres upserts the rows in VALUES order.
+        stmt = pg_insert(daily).values(
+            [
+                {
+                    "book_id": bucket.book_id,
+                    "day": bucket.day,
+                    "edits": bucket.edits,
+                    "views": bucket.views,
+                    "last_activity_at": bucket.last_activity_at,
+                }
+                for bucket in buckets
+            ]
+        )
+        excluded = stmt.excluded
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[daily.book_id, daily.day],
+                set_={
+                    "edits": daily.edits + excluded.edits,
+                    "views": daily.views + excluded.views,
+                    "last_activity_at": func.greatest(daily.last_activity_at, excluded.last_activity_at),
+                },
+            )
+        )
+
+    book = BookModel
+    # One UPDATE per book keeps the lock order explicit (an UPDATE ... FROM join
+    # may visit books in any order).
+    for visit in visits:
+        # greatest() skips NULLs, so the first visit simply sets last_visited_at.
+        values: dict[str, Any] = {"last_visited_at": func.greatest(book.last_visited_at, visit.last_visited_at)}
+        if visit.window_views:
+            values["visit_count_90d"] = book.visit_count_90d + visit.window_views
+        await session.execute(update(book).where(book.id == visit.book_id).values(**values))
+
+
+async def record_chronicle_activity(
+    session: AsyncSession,
+    *,
+    book_id: UUID,
+    event_type: str,
+    occurred_at: datetime,
+    today: Optional[date] = None,
+) -> None:
+    """Add one event to its daily bucket (and a view to the book's visit counters)."""
+
+    await apply_chronicle_activity(
+        session,
+        [ChronicleActivity(book_id=book_id, event_type=event_type, occurred_at=occurred_at)],
+        today=today,
+    )
+
+
+def _window_views(start: date):
+    daily = ChronicleBookActivityDailyModel
+    return (
+        select(func.coalesce(func.sum(daily.views), 0))
+        .where(daily.book_id == BookModel.id, daily.day >= start)
+        .scalar_subquery()
+    )
+
+
+async def expire_book_visit_counts(session: AsyncSession, *, today: date, lookback_days: int = 7) -> int:
+    """Recompute visit_count_90d for books with views that recently left the window.
+
+    Only books with a non-empty view bucket in the `lookback_days` days before
+    the window start are touched, so the cost follows recent traffic rather
+    than the books table. Idempotent; a run that was missed for less than
+    `lookback_days` days is caught up by the next one. Returns the number of
+    books updated (caller commits).
+    """
+
+    daily = ChronicleBookActivityDailyModel
+    book = BookModel
+    start = visit_window_start(today)
+    expired = (
+        select(daily.book_id)
+        .where(
+            daily.day >= start - timedelta(days=max(1, int(lookback_days))),
+            daily.day < start,
+            daily.views > 0,
+        )
+        .distinct()
+    )
+    window_views = _window_views(start)
+    result = await session.execute(
+        update(book)
+        .where(book.id.in_(expired), book.visit_count_90d != window_views)
+        .values(visit_count_90d=window_views)
+        .execution_options(synchronize_session=False)
+    )
+    return int(result.rowcount or 0)
+
+
+async def recompute_book_visit_counts(
+    session: AsyncSession,
+    *,
+    today: date,
+    book_ids: Optional[Sequence[UUID]] = None,
+) -> int:
+    """Recompute visit counters from scratch (all books, or `book_ids`).
+
+    visit_count_90d is summed from the view buckets of the window;
+    last_visited_at is raised to the latest projected view (never lowered, so
+    values survive chronicle retention). Returns the number of books updated
+    (caller commits).
+    """
+
+    book = BookModel
+    entry = ChronicleEntryModel
+    window_views = _window_views(visit_window_start(today))
+    latest_view = (
+        select(func.max(entry.occurred_at))
+        .where(entry.book_id == book.id, entry.event_type == VIEW_EVENT_TYPE)
+        .scalar_subquery()
+    )
+    stmt = update(book).values(
+        visit_count_90d=window_views,
+        last_visited_at=func.greatest(book.last_visited_at, latest_view),
+    )
+    if book_ids is not None:
+        stmt = stmt.where(book.id.in_(list(book_ids)))
+    result = await session.execute(stmt.execution_options(synchronize_session=False))
+    return int(result.rowcount or 0)
+
+
+async def rebuild_chronicle_activity_rollup(session: AsyncSession) -> int:
+    """Replace every bucket with an aggregate of chronicle_entries (caller commits).
+
+    Returns the number of buckets written.
+    """
+
+    entry = ChronicleEntryModel
+    daily = ChronicleBookActivityDailyModel
+    day = cast(func.timezone("UTC", entry.occurred_at), Date)
+    is_view = entry.event_type == VIEW_EVENT_TYPE
+
+    await session.execute(delete(daily))
+    result = await session.execute(
+        insert(daily).from_select(
+            ["book_id", "day", "edits", "views", "last_activity_at"],
+            select(
+                entry.book_id,
+                day,
+                func.count().filter(~is_view),
+                func.count().filter(is_view),
+                func.max(entry.occurred_at),
+            ).group_by(entry.book_id, day),
+        )
+    )
+    return int(result.rowcount or 0)
+
+
+class BookVisitExpiry:
+    """Background task applying `expire_book_visit_counts` every `interval_seconds`."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        *,
+        interval_seconds: float,
+        lookback_days: int = 7,
+    ):
+        self._session_factory = session_factory
+        self._interval_seconds = float(interval_seconds)
+        self._lookback_days = max(1, int(lookback_days))
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._interval_seconds > 0
+
+    async def __aenter__(self) -> "BookVisitExpiry":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="chronicle-visit-expiry")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def run_once(self) -> int:
+        async with self._session_factory() as session:
+            updated = await expire_book_visit_counts(session, today=_utc_today(), lookback_days=self._lookback_days)
+            await session.commit()
+        if updated:
+            logger.info({"event": "chronicle.visit_expiry.updated", "books": updated})
+        return updated
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                logger.warning({"event": "chronicle.visit_expiry.failed", "error": f"{type(exc).__name__}: {exc}"})
+            await asyncio.sleep(self._interval_seconds)
+
+
+__all__ = [
+    "BookVisitExpiry",
+    "BucketDelta",
+    "ChronicleActivity",
+    "VIEW_EVENT_TYPE",
+    "VISIT_WINDOW_DAYS",
+    "VisitDelta",
+    "aggregate_chronicle_activity",
+    "apply_chronicle_activity",
+    "expire_book_visit_counts",
+    "rebuild_chronicle_activity_rollup",
+    "recompute_book_visit_counts",
+    "record_chronicle_activity",
+    "utc_day",
+    "visit_window_start",
+]
@@ -19,7 +19,7 @@ import os
 import sqlalchemy as sa
 from sqlalchemy import select, func, desc, asc, and_, cast
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID, insert as pg_insert
 
 from api.app.modules.chronicle.domain import (
     ChronicleRepositoryPort,
@@ -27,7 +27,14 @@ from api.app.modules.chronicle.domain import (
     ChronicleEventType,
 )
 from api.app.modules.chronicle.exceptions import ChronicleRepositoryError
-from infra.database.models import ChronicleEventModel, ChronicleOutboxEventModel, ChronicleEventDedupeStateModel
+from infra.database.models import (
+    BlockModel,
+    BookModel,
+    ChronicleEventModel,
+    ChronicleOutboxEventModel,
+    ChronicleEventDedupeStateModel,
+)
+from infra.outbox_core.notify import CHRONICLE_OUTBOX_CHANNEL, notify_outbox
 
 
 def _get_block_updated_dedupe_window_seconds() -> int:
@@ -90,6 +97,48 @@ async def _should_emit_block_updated(
     return int(getattr(result, "rowcount", 0) or 0) > 0
 
 
+def _event_columns(event: ChronicleEvent) -> dict:
+    payload = event.payload or {}
+    try:
+        schema_version = payload.get("schema_version")
+    except Exception:
+        schema_version = None
+    return {
+        "id": event.id,
+        "event_type": event.event_type.value,
+        "book_id": event.book_id,
+        "block_id": event.block_id,
+        "actor_id": event.actor_id,
+        "payload": payload,
+        "occurred_at": event.occurred_at,
+        "created_at": event.created_at,
+        # Phase C: promote durable envelope fields to columns.
+        # Keep payload as source of truth for backwards compatibility.
+        "schema_version": schema_version,
+        "provenance": payload.get("provenance"),
+        "source": payload.get("source"),
+        "actor_kind": payload.get("actor_kind"),
+        "correlation_id": payload.get("correlation_id"),
+    }
+
+
+_EVENT_VALUE_COLUMNS = (
+    sa.column("id", PG_UUID(as_uuid=True)),
+    sa.column("event_type", sa.String),
+    sa.column("book_id", PG_UUID(as_uuid=True)),
+    sa.column("block_id", PG_UUID(as_uuid=True)),
+    sa.column("actor_id", PG_UUID(as_uuid=True)),
+    sa.column("payload", JSONB),
+    sa.column("occurred_at", sa.DateTime(timezone=True)),
+    sa.column("created_at", sa.DateTime(timezone=True)),
+    sa.column("schema_version", sa.Integer),
+    sa.column("provenance", sa.String),
+    sa.column("source", sa.String),
+    sa.column("actor_kind", sa.String),
+    sa.column("correlation_id", sa.String),
+)
+
+
 class SQLAlchemyChronicleRepository(ChronicleRepositoryPort):
     def __init__(self, session: AsyncSession):
         self._session = session
@@ -115,28 +164,7 @@ class SQLAlchemyChronicleRepository(ChronicleRepositoryPort):
                         await self._session.commit()
                         return event
 
-            payload = event.payload or {}
-            model = ChronicleEventModel(
-                id=event.id,
-                event_type=event.event_type.value,
-                book_id=event.book_id,
-                block_id=event.block_id,
-                actor_id=event.actor_id,
-                payload=payload,
-                occurred_at=event.occurred_at,
-                created_at=event.created_at,
-            )
-
-            # Phase C: promote durable envelope fields to columns.
-            # Keep payload as source of truth for backwards compatibility.
-            try:
-                model.schema_version = payload.get("schema_version")
-            except Exception:
-                model.schema_version = None
-            model.provenance = payload.get("provenance")
-            model.source = payload.get("source")
-            model.actor_kind = payload.get("actor_kind")
-            model.correlation_id = payload.get("correlation_id")
+            model = ChronicleEventModel(**_event_columns(event))
             self._session.add(model)
 
             # In the same transaction: enqueue outbox event for async projection.
@@ -161,6 +189,8 @@ class SQLAlchemyChronicleRepository(ChronicleRepositoryPort):
                 tracestate=tracestate,
             )
             self._session.add(outbox_row)
+            # Delivered on commit: wakes idle chronicle workers right away.
+            await notify_outbox(self._session, CHRONICLE_OUTBOX_CHANNEL)
 
             await self._session.commit()
             await self._session.refresh(model)
@@ -173,6 +203,72 @@ class SQLAlchemyChronicleRepository(ChronicleRepositoryPort):
             await self._session.rollback()
             raise ChronicleRepositoryError(str(exc)) from exc
 
+    async def save_many(self, events: Sequence[ChronicleEvent]) -> int:
+        """Persist a batch of events and their outbox rows in one transaction.
+
+        Used by the view write-behind buffer (infra/storage/view_counter_buffer.py):
+        two multi-row INSERTs and one NOTIFY instead of a transaction per event.
+        Not deduplicated: only batch event types `save` never suppresses.
+
+        Events are inserted through a join on books, so events of books
+        hard-deleted since they were buffered are dropped instead of failing the
+        FK (which would fail, and requeue, the whole batch on every flush); a
+        deleted block is stored as NULL, like ON DELETE SET NULL would.
+        Outbox rows are written for the inserted events only.
+        Returns the number of events written.
+        """
+        if not events:
+            return 0
+        try:
+            rows = sa.values(*_EVENT_VALUE_COLUMNS, name="new_events").data(
+                [tuple(_event_columns(event)[c.name] for c in _EVENT_VALUE_COLUMNS) for event in events]
+            )
+            # A VALUES column that is NULL in every row is typed text: cast back.
+            typed = {c.name: cast(rows.c[c.name], c.type) for c in _EVENT_VALUE_COLUMNS}
+            # Recorded events leave created_at to the repository (see ChronicleEvent).
+            typed["created_at"] = func.coalesce(typed["created_at"], func.now())
+            selected = (
+                select(*(BlockModel.id if name == "block_id" else value for name, value in typed.items()))
+                .select_from(rows)
+                .join(BookModel, BookModel.id == typed["book_id"])
+                .outerjoin(BlockModel, BlockModel.id == typed["block_id"])
+            )
+            inserted_ids = set(
+                (
+                    await self._session.execute(
+                        sa.insert(ChronicleEventModel)
+                        .from_select(list(typed), selected)
+                        .returning(ChronicleEventModel.id)
+                    )
+                ).scalars()
+            )
+            if not inserted_ids:
+                await self._session.commit()
+                return 0
+            await self._session.execute(
+                sa.insert(ChronicleOutboxEventModel).values(
+                    [
+                        {
+                            "entity_type": "chronicle_event",
+                            "entity_id": event.id,
+                            "op": "upsert",
+                            "event_version": 0,
+                            "status": "pending",
+                            "attempts": 0,
+                            "replay_count": 0,
+                        }
+                        for event in events
+                        if event.id in inserted_ids
+                    ]
+                )
+            )
+            await notify_outbox(self._session, CHRONICLE_OUTBOX_CHANNEL)
+            await self._session.commit()
+            return len(inserted_ids)
+        except Exception as exc:
+            await self._session.rollback()
+            raise ChronicleRepositoryError(str(exc)) from exc
+
     async def list_by_book(
         self,
         book_id: UUID,
@@ -72,8 +72,9 @@ class SQLAlchemyLibraryRepository(ILibraryRepository):
                 existing.pinned_order = library.pinned_order
                 existing.archived_at = library.archived_at
                 existing.last_activity_at = library.last_activity_at
-                existing.views_count = library.views_count
-                existing.last_viewed_at = library.last_viewed_at
+                # views_count / last_viewed_at are written by the view counter's
+                # set-based flushes (infra/storage/view_counter_buffer.py); writing
+                # back the loaded snapshot would drop views flushed meanwhile.
                 existing.updated_at = library.updated_at
                 existing.soft_deleted_at = library.soft_deleted_at
             else:
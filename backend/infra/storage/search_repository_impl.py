@@ -18,14 +18,21 @@ Performance:
 """
 
 import logging
-from typing import List
+import os
+from typing import List, Optional
 from uuid import UUID
 
-from sqlalchemy import func, select, text
+from sqlalchemy import Float, and_, cast, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.app.modules.search.application.ports.output import SearchPort
-from api.app.modules.search.domain import SearchQuery, SearchHit, SearchResult, SearchEntityType
+from api.app.modules.search.domain import (
+    SearchCursor,
+    SearchQuery,
+    SearchHit,
+    SearchResult,
+    SearchEntityType,
+)
 from api.app.modules.search.application.dtos import BlockSearchHit
 from api.app.modules.search.application.ports.candidate_provider import CandidateProvider
 from api.app.modules.search.application.two_stage_search_service import TwoStageSearchService
@@ -35,6 +42,26 @@ from infra.search.candidate_provider_factory import get_stage1_candidate_provide
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_TOTAL_COUNT_CAP = 1000
+
+
+def _total_count_cap() -> int:
+    """Upper bound for exact `total` counts (env SEARCH_TOTAL_COUNT_CAP).
+
+    Totals are exact up to the cap and reported as "cap+" beyond it.
+    0 (or negative) disables the cap: exact totals over the full match set.
+    """
+
+    raw = os.getenv("SEARCH_TOTAL_COUNT_CAP")
+    if raw is None or not raw.strip():
+        return DEFAULT_TOTAL_COUNT_CAP
+    try:
+        return int(raw)
+    except ValueError:
+        logger.warning("Invalid SEARCH_TOTAL_COUNT_CAP=%r; using %s", raw, DEFAULT_TOTAL_COUNT_CAP)
+        return DEFAULT_TOTAL_COUNT_CAP
+
+
 class PostgresSearchAdapter(SearchPort):
     """PostgreSQL Search Adapter - Denormalized search_index table
 
@@ -71,18 +98,21 @@ class PostgresSearchAdapter(SearchPort):
         q: str,
         book_id: UUID | None = None,
         limit: int = 20,
-        candidate_limit: int = 200,
+        candidate_limit: int | None = 200,
         candidate_provider: CandidateProvider | None = None,
+        library_id: UUID | None = None,
     ) -> List[BlockSearchHit]:
         """Two-stage search for blocks with tags.
 
         Stage 1 (cheap): search in search_index to get candidate block IDs.
         Stage 2 (strict): join blocks + tag_associations + tags with business filters.
+        candidate_limit=None: adaptive Stage 1 sizing with a Stage 2 refill loop.
 
         Notes:
         - Uses search_index.event_version as ordering key to avoid out-of-order event regression.
         - Filters out soft-deleted blocks (blocks.soft_deleted_at IS NULL).
         - Filters out deleted tags (tags.deleted_at IS NULL).
+        - library_id/book_id are pushed down into Stage 1 recall.
         """
 
         provider = candidate_provider or get_stage1_candidate_provider(self.db_session)
@@ -92,6 +122,7 @@ class PostgresSearchAdapter(SearchPort):
             book_id=book_id,
             limit=limit,
             candidate_limit=candidate_limit,
+            library_id=library_id,
         )
 
     async def search_blocks(self, query: SearchQuery) -> SearchResult:
@@ -104,12 +135,8 @@ class PostgresSearchAdapter(SearchPort):
             SearchResult with matching blocks
         """
         try:
-            hits = await self._search_entity_type(query, "block")
-            return SearchResult(
-                total=hits[0] if hits else 0,
-                hits=hits[1] if len(hits) > 1 else [],
-                query=query,
-            )
+            total, hits, capped = await self._search_entity_type(query, "block")
+            return SearchResult(total=total, hits=hits, query=query, total_capped=capped)
         except Exception as e:
             logger.error(f"Block search failed: {str(e)}")
             raise
@@ -124,12 +151,8 @@ class PostgresSearchAdapter(SearchPort):
             SearchResult with matching books
         """
         try:
-            hits = await self._search_entity_type(query, "book")
-            return SearchResult(
-                total=hits[0] if hits else 0,
-                hits=hits[1] if len(hits) > 1 else [],
-                query=query,
-            )
+            total, hits, capped = await self._search_entity_type(query, "book")
+            return SearchResult(total=total, hits=hits, query=query, total_capped=capped)
         except Exception as e:
             logger.error(f"Book search failed: {str(e)}")
             raise
@@ -144,12 +167,8 @@ class PostgresSearchAdapter(SearchPort):
             SearchResult with matching bookshelves
         """
         try:
-            hits = await self._search_entity_type(query, "bookshelf")
-            return SearchResult(
-                total=hits[0] if hits else 0,
-                hits=hits[1] if len(hits) > 1 else [],
-                query=query,
-            )
+            total, hits, capped = await self._search_entity_type(query, "bookshelf")
+            return SearchResult(total=total, hits=hits, query=query, total_capped=capped)
         except Exception as e:
             logger.error(f"Bookshelf search failed: {str(e)}")
             raise
@@ -164,12 +183,8 @@ class PostgresSearchAdapter(SearchPort):
             SearchResult with matching tags
         """
         try:
-            hits = await self._search_entity_type(query, "tag")
-            return SearchResult(
-                total=hits[0] if hits else 0,
-                hits=hits[1] if len(hits) > 1 else [],
-                query=query,
-            )
+            total, hits, capped = await self._search_entity_type(query, "tag")
+            return SearchResult(total=total, hits=hits, query=query, total_capped=capped)
         except Exception as e:
             logger.error(f"Tag search failed: {str(e)}")
             raise
@@ -184,12 +199,8 @@ class PostgresSearchAdapter(SearchPort):
             SearchResult with matching libraries
         """
         try:
-            hits = await self._search_entity_type(query, "library")
-            return SearchResult(
-                total=hits[0] if hits else 0,
-                hits=hits[1] if len(hits) > 1 else [],
-                query=query,
-            )
+            total, hits, capped = await self._search_entity_type(query, "library")
+            return SearchResult(total=total, hits=hits, query=query, total_capped=capped)
         except Exception as e:
             logger.error(f"Library search failed: {str(e)}")
             raise
@@ -204,16 +215,73 @@ class PostgresSearchAdapter(SearchPort):
             SearchResult with matching entries
         """
         try:
-            hits = await self._search_entity_type(query, "entry")
-            return SearchResult(
-                total=hits[0] if hits else 0,
-                hits=hits[1] if len(hits) > 1 else [],
-                query=query,
-            )
+            total, hits, capped = await self._search_entity_type(query, "entry")
+            return SearchResult(total=total, hits=hits, query=query, total_capped=capped)
         except Exception as e:
             logger.error(f"Entry search failed: {str(e)}")
             raise
 
+    async def _ranked_page(
+        self,
+        where_clauses: list,
+        score_expr,
+        *,
+        limit: int,
+        offset: int = 0,
+        with_total: bool = True,
+    ) -> tuple:
+        """Ranked hits + capped total in a single statement
+
+        The match predicate is evaluated once: an inner top-N (N = count cap)
+        ranks matching ids, and the outer query joins back for the page rows
+        while `count(*) OVER ()` counts the capped set.
+
+        Returns:
+            Tuple (total_count | None, total_capped, [(SearchIndexModel, score), ...])
+        """
+        cap = _total_count_cap()
+        ranked = (
+            select(SearchIndexModel.id.label("id"), score_expr.label("score"))
+            .where(*where_clauses)
+            .order_by(score_expr.desc(), SearchIndexModel.entity_id.asc())
+        )
+        if not with_total:
+            ranked = ranked.limit(offset + limit)
+        elif cap > 0:
+            ranked = ranked.limit(max(cap + 1, offset + limit))
+        ranked = ranked.subquery("ranked")
+
+        columns = [SearchIndexModel, ranked.c.score]
+        if with_total:
+            columns.append(func.count().over().label("total_count"))
+
+        stmt = (
+            select(*columns)
+            .join(ranked, ranked.c.id == SearchIndexModel.id)
+            .order_by(ranked.c.score.desc(), SearchIndexModel.entity_id.asc())
+            .limit(limit)
+            .offset(offset)
+        )
+        rows = (await self.db_session.execute(stmt)).all()
+        page = [(row[0], row[1]) for row in rows]
+
+        if not with_total:
+            return (None, False, page)
+
+        if rows:
+            total_count = int(rows[0][2])
+        elif offset > 0:
+            # Page past the end carries no window row; count the capped set.
+            total_count = (
+                await self.db_session.execute(select(func.count()).select_from(ranked))
+            ).scalar_one()
+        else:
+            total_count = 0
+
+        if cap > 0 and total_count > cap:
+            return (cap, True, page)
+        return (total_count, False, page)
+
     async def _search_entity_type(
         self,
         query: SearchQuery,
@@ -221,14 +289,16 @@ class PostgresSearchAdapter(SearchPort):
     ) -> tuple:
         """Internal search method for a specific entity type
 
-        Uses PostgreSQL tsvector + plainto_tsquery for full-text search.
+        Uses the stored search_index.text_tsv (GIN-indexed) + plainto_tsquery
+        for full-text search. Hits and total come back from one query; the
+        total is exact up to SEARCH_TOTAL_COUNT_CAP and capped beyond it.
 
         Args:
             query: SearchQuery
             entity_type: "block", "book", "bookshelf", or "tag"
 
         Returns:
-            Tuple (total_count, [SearchHit, ...])
+            Tuple (total_count, [SearchHit, ...], total_capped)
         """
         try:
             where_clauses = [SearchIndexModel.entity_type == entity_type]
@@ -238,63 +308,120 @@ class PostgresSearchAdapter(SearchPort):
 
             if query.text:
                 where_clauses.append(
-                    text(
-                        "to_tsvector('english', search_index.text) @@ plainto_tsquery('english', :q)"
-                    )
+                    SearchIndexModel.text_tsv.op("@@")(func.plainto_tsquery("english", query.text))
                 )
 
-            count_stmt = (
-                select(func.count())
-                .select_from(SearchIndexModel)
-                .where(*where_clauses)
-            )
-            total_count = (await self.db_session.execute(count_stmt, {"q": query.text})).scalar_one()
-
-            stmt = (
-                select(SearchIndexModel)
-                .where(*where_clauses)
-                .order_by(
-                    func.ts_rank_cd(
-                        func.to_tsvector('english', SearchIndexModel.text),
-                        func.plainto_tsquery('english', query.text),
-                    ).desc()
-                )
-                .limit(query.limit)
-                .offset(query.offset)
+            score_expr = func.ts_rank_cd(
+                SearchIndexModel.text_tsv,
+                func.plainto_tsquery('english', query.text),
             )
 
-            result = await self.db_session.execute(stmt, {"q": query.text})
-            rows = result.scalars().all()
+            total_count, capped, rows = await self._ranked_page(
+                where_clauses,
+                score_expr,
+                limit=query.limit,
+                offset=query.offset,
+            )
 
             # Convert to SearchHit domain objects
             hits = [
                 self._model_to_search_hit(row, entity_type)
-                for row in rows
+                for row, _score in rows
             ]
 
-            return (total_count, hits)
+            return (total_count, hits, capped)
 
         except Exception as e:
             logger.error(f"Entity type search failed for {entity_type}: {str(e)}")
             raise
 
-    def _model_to_search_hit(self, model: SearchIndexModel, entity_type: str) -> SearchHit:
+    async def search_entity_type_page(
+        self,
+        query: SearchQuery,
+        entity_type: str,
+        *,
+        fetch_limit: int,
+        after: Optional[SearchCursor] = None,
+    ) -> tuple:
+        """Keyset page of one entity type, ordered for cross-type merging
+
+        Ordering is (score DESC, entity_id ASC) where score is
+        ts_rank_cd(..., 32) = rank / (rank + 1), i.e. normalized to [0, 1) so
+        hits from different entity types are comparable in a k-way merge.
+
+        Args:
+            query: SearchQuery (limit/offset are ignored; use fetch_limit/after)
+            entity_type: search_index.entity_type to scan
+            fetch_limit: Max rows to return
+            after: Resume strictly after this global (score, type, id) position
+
+        Returns:
+            Tuple (total_count, [SearchHit, ...], total_capped). The total is
+            only computed for the first page (after=None) and is None otherwise;
+            cursors carry it forward.
+        """
+        tsq = func.plainto_tsquery("english", query.text)
+        score_expr = cast(func.ts_rank_cd(SearchIndexModel.text_tsv, tsq, 32), Float)
+
+        where_clauses = [
+            SearchIndexModel.entity_type == entity_type,
+            SearchIndexModel.text_tsv.op("@@")(tsq),
+        ]
+        if getattr(query, "library_id", None) is not None:
+            where_clauses.append(SearchIndexModel.library_id == query.library_id)
+
+        if after is not None:
+            # Global order is (score DESC, entity_type ASC, entity_id ASC).
+            if entity_type < after.entity_type:
+                where_clauses.append(score_expr < after.score)
+            elif entity_type > after.entity_type:
+                where_clauses.append(score_expr <= after.score)
+            else:
+                where_clauses.append(
+                    or_(
+                        score_expr < after.score,
+                        and_(score_expr == after.score, SearchIndexModel.entity_id > after.entity_id),
+                    )
+                )
+
+        total_count, capped, rows = await self._ranked_page(
+            where_clauses,
+            score_expr,
+            limit=fetch_limit,
+            with_total=after is None,
+        )
+
+        hits = [
+            self._model_to_search_hit(row, entity_type, score=float(score or 0.0))
+            for row, score in rows
+        ]
+        return (total_count, hits, capped)
+
+    def _model_to_search_hit(
+        self,
+        model: SearchIndexModel,
+        entity_type: str,
+        score: Optional[float] = None,
+    ) -> SearchHit:
         """Convert ORM model to SearchHit domain object
 
         Args:
             model: SearchIndexModel from database
             entity_type: Type string for SearchEntityType
+            score: Query-time relevance in [0, 1]; falls back to rank_score
 
         Returns:
             SearchHit domain object
         """
         try:
+            if score is None:
+                score = min(1.0, model.rank_score or 0.5)  # Normalize score 0-1
             return SearchHit(
                 entity_type=SearchEntityType(entity_type),
                 entity_id=model.entity_id,
                 title=model.text[:100],  # Use first 100 chars as title
                 snippet=model.snippet or model.text[:200],
-                score=min(1.0, model.rank_score or 0.5),  # Normalize score 0-1
+                score=score,
                 path=f"Search Result: {entity_type.capitalize()}",  # Simplified for now
                 rank_algorithm="ts_rank_cd",
             )
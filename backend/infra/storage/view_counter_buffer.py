@@ -0,0 +1,292 @@
+"""Write-behind buffer for view tracking (API process).
+
+Views are the hottest writes in the API and only ever add to counters, so they
+are taken off the request path:
+
+- library views are aggregated per library in memory (delta, latest view) and
+  flushed as one `UPDATE libraries ... FROM (VALUES ...)` adding each delta;
+- `book_opened` chronicle events (first block page of a book) are queued and
+  flushed as one multi-row insert into chronicle_events + chronicle_outbox_events
+  (`SQLAlchemyChronicleRepository.save_many`, which skips events of books
+  deleted meanwhile). The chronicle projector then feeds the book visit
+  counters (infra/storage/chronicle_activity_rollup.py).
+
+Recording is O(1) with no I/O. Flushes run every interval, early once
+`max_pending` items are buffered, and on app shutdown (main.py). A failed
+flush puts its batch back, so views are lost only if the process dies between
+flushes.
+
+Env:
+  - VIEW_COUNTER_FLUSH_INTERVAL_SECONDS (default 5.0)
+  - VIEW_COUNTER_MAX_PENDING (default 1000): buffered items that trigger an early flush
+  - VIEW_COUNTER_MAX_BUFFERED_EVENTS (default 50000): queued chronicle events kept
+    while flushes fail; newer events are dropped (and logged) beyond that
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import BigInteger, DateTime, column, func, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.app.modules.chronicle.domain import ChronicleEvent
+from api.app.modules.library.application.ports.output import ILibraryViewCounter
+from infra.database.models.library_models import LibraryModel
+from infra.env import get_float_env, get_int_env
+from infra.storage.chronicle_repository_impl import SQLAlchemyChronicleRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PendingViews:
+    delta: int
+    last_viewed_at: datetime
+
+    def merge(self, other: "PendingViews") -> None:
+        self.delta += other.delta
+        self.last_viewed_at = max(self.last_viewed_at, other.last_viewed_at)
+
+
+async def apply_library_view_deltas(session: AsyncSession, views: Mapping[UUID, PendingViews]) -> int:
+    """Add buffered view deltas to libraries in one statement (caller commits).
+
+    Returns the number of libraries updated (deleted libraries are skipped).
+    """
+
+    if not views:
+        return 0
+    deltas = values(
+        column("id", PG_UUID(as_uuid=True)),
+        column("delta", BigInteger),
+        column("last_viewed_at", DateTime(timezone=True)),
+        name="view_deltas",
+    ).data([(library_id, pending.delta, pending.last_viewed_at) for library_id, pending in views.items()])
+    library = LibraryModel
+    result = await session.execute(
+        update(library)
+        .where(library.id == deltas.c.id)
+        .values(
+            views_count=library.views_count + deltas.c.delta,
+            # greatest() skips NULLs, so a first view simply sets the timestamp.
+            last_viewed_at=func.greatest(library.last_viewed_at, deltas.c.last_viewed_at),
+            # A view is not an edit: keep the column's onupdate from bumping it.
+            updated_at=library.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return int(result.rowcount or 0)
+
+
+class _LibraryViewCounter(ILibraryViewCounter):
+    def __init__(self, buffer: "ViewCounterBuffer"):
+        self._buffer = buffer
+
+    def record_view(self, library_id: UUID, occurred_at: Optional[datetime] = None) -> Tuple[int, datetime]:
+        pending = self._buffer.record_library_view(library_id, occurred_at)
+        return pending.delta, pending.last_viewed_at
+
+
+class _BufferedChronicleWriter:
+    """`ChronicleRepositoryPort.save` stand-in for ChronicleRecorderService: queues the event."""
+
+    def __init__(self, buffer: "ViewCounterBuffer"):
+        self._buffer = buffer
+
+    async def save(self, event: ChronicleEvent) -> ChronicleEvent:
+        self._buffer.record_chronicle_event(event)
+        return event
+
+
+class ViewCounterBuffer:
+    """In-process write-behind buffer; see module docstring."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Any]] = None,
+        *,
+        flush_interval_seconds: float = 5.0,
+        max_pending: int = 1000,
+        max_buffered_events: int = 50000,
+    ):
+        # None: resolve the app's shared factory on first flush.
+        self._session_factory = session_factory
+        self._flush_interval_seconds = max(0.1, float(flush_interval_seconds))
+        self._max_pending = max(1, int(max_pending))
+        self._max_buffered_events = max(self._max_pending, int(max_buffered_events))
+        self._library_views: Dict[UUID, PendingViews] = {}
+        self._chronicle_events: List[ChronicleEvent] = []
+        self._dropped_events = 0
+        self._last_flush_failed = False
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        self.library_views: ILibraryViewCounter = _LibraryViewCounter(self)
+        self.chronicle_writer = _BufferedChronicleWriter(self)
+
+    @property
+    def pending(self) -> int:
+        return len(self._library_views) + len(self._chronicle_events)
+
+    def record_library_view(self, library_id: UUID, occurred_at: Optional[datetime] = None) -> PendingViews:
+        """Count one library view. Returns the library's buffered (unflushed) views."""
+
+        viewed_at = occurred_at or datetime.now(timezone.utc)
+        pending = self._library_views.get(library_id)
+        if pending is None:
+            pending = self._library_views[library_id] = PendingViews(delta=1, last_viewed_at=viewed_at)
+        else:
+            pending.merge(PendingViews(delta=1, last_viewed_at=viewed_at))
+        self._after_record()
+        return PendingViews(delta=pending.delta, last_viewed_at=pending.last_viewed_at)
+
+    def record_chronicle_event(self, event: ChronicleEvent) -> None:
+        if len(self._chronicle_events) >= self._max_buffered_events:
+            self._dropped_events += 1
+            return
+        self._chronicle_events.append(event)
+        self._after_record()
+
+    def _after_record(self) -> None:
+        if self.pending >= self._max_pending:
+            self._wakeup.set()
+        if self._task is None:
+            # Started at app startup; also start lazily when recording from a running loop.
+            try:
+                self.start()
+            except RuntimeError:
+                pass
+
+    def _requeue(self, views: Dict[UUID, PendingViews], events: List[ChronicleEvent]) -> None:
+        for library_id, pending in views.items():
+            current = self._library_views.get(library_id)
+            if current is None:
+                self._library_views[library_id] = pending
+            else:
+                current.merge(pending)
+        if events:
+            room = max(0, self._max_buffered_events - len(self._chronicle_events))
+            self._dropped_events += max(0, len(events) - room)
+            self._chronicle_events[:0] = events[:room]
+
+    async def flush(self) -> Tuple[int, int]:
+        """Persist everything buffered so far. Returns (libraries, events) written.
+
+        Failures are logged and the batch is put back for the next flush.
+        """
+
+        async with self._flush_lock:
+            views, self._library_views = self._library_views, {}
+            events, self._chronicle_events = self._chronicle_events, []
+            dropped, self._dropped_events = self._dropped_events, 0
+            if dropped:
+                logger.warning({"event": "view_counter.events_dropped", "dropped": dropped})
+            if not views and not events:
+                return 0, 0
+
+            session_factory = self._session_factory
+            if session_factory is None:
+                from infra.database.session import get_session_factory
+
+                session_factory = await get_session_factory()
+
+            libraries = written = 0
+            self._last_flush_failed = True
+            try:
+                if views:
+                    async with session_factory() as session:
+                        libraries = await apply_library_view_deltas(session, views)
+                        await session.commit()
+                    views = {}
+                if events:
+                    async with session_factory() as session:
+                        written = await SQLAlchemyChronicleRepository(session).save_many(events)
+                    events = []
+                self._last_flush_failed = False
+            except asyncio.CancelledError:
+                self._requeue(views, events)
+                raise
+            except Exception as exc:  # noqa: BLE001
+                self._requeue(views, events)
+                logger.warning(
+                    {
+                        "event": "view_counter.flush_failed",
+                        "libraries": len(views),
+                        "events": len(events),
+                        "error": f"{type(exc).__name__}: {exc}",
+                    }
+                )
+            return libraries, written
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="view-counter-flush")
+
+    async def stop(self) -> None:
+        """Stop the flush loop and flush what is left (app shutdown)."""
+
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+            if self._last_flush_failed:
+                # Do not let early-flush wakeups hammer an unavailable database.
+                await asyncio.sleep(self._flush_interval_seconds)
+
+
+# ============================================================================
+# Global Buffer Instance - Lazy loaded
+# ============================================================================
+
+_buffer: ViewCounterBuffer | None = None
+
+
+def get_view_counter_buffer() -> ViewCounterBuffer:
+    """Get or create the process-wide view counter buffer."""
+    global _buffer
+    if _buffer is None:
+        _buffer = ViewCounterBuffer(
+            flush_interval_seconds=get_float_env("VIEW_COUNTER_FLUSH_INTERVAL_SECONDS", 5.0),
+            max_pending=get_int_env("VIEW_COUNTER_MAX_PENDING", 1000),
+            max_buffered_events=get_int_env("VIEW_COUNTER_MAX_BUFFERED_EVENTS", 50000),
+        )
+    return _buffer
+
+
+async def shutdown_view_counter_buffer() -> None:
+    """Flush buffered views. Call this on application shutdown, before the engine is disposed."""
+    global _buffer
+    if _buffer is not None:
+        buffer, _buffer = _buffer, None
+        await buffer.stop()
+        logger.info({"event": "view_counter.flushed_on_shutdown"})
+
+
+__all__ = [
+    "PendingViews",
+    "ViewCounterBuffer",
+    "apply_library_view_deltas",
+    "get_view_counter_buffer",
+    "shutdown_view_counter_buffer",
+]
@@ -94,6 +94,7 @@ def ensure_index(*, recreate: bool) -> None:
             "properties": {
                 "entity_type": {"type": "keyword"},
                 "library_id": {"type": "keyword"},
+                "book_id": {"type": "keyword"},
                 "entity_id": {"type": "keyword"},
                 "text": {"type": "text"},
                 "snippet": {"type": "text", "index": False},
@@ -129,16 +130,19 @@ async def backfill(*, batch_size: int) -> None:
     # Use raw SQL for stable ordering + lower overhead.
     sql = text(
         """
-        SELECT entity_type,
-               library_id::text AS library_id,
-               entity_id::text AS entity_id,
-               text,
-               COALESCE(snippet, '') AS snippet,
-               COALESCE(rank_score, 0) AS rank_score,
-               COALESCE(event_version, 0) AS event_version,
-               updated_at
-        FROM search_index
-        ORDER BY event_version ASC
+        SELECT si.entity_type,
+               si.library_id::text AS library_id,
+               b.book_id::text AS book_id,
+               si.entity_id::text AS entity_id,
+               si.text,
+               COALESCE(si.snippet, '') AS snippet,
+               COALESCE(si.rank_score, 0) AS rank_score,
+               COALESCE(si.event_version, 0) AS event_version,
+               si.updated_at
+        FROM search_index si
+        LEFT JOIN blocks b
+          ON si.entity_type = 'block' AND b.id = si.entity_id
+        ORDER BY si.event_version ASC
         """
     )
 
@@ -158,6 +162,7 @@ async def backfill(*, batch_size: int) -> None:
                 {
                     "entity_type": row["entity_type"],
                     "library_id": row.get("library_id"),
+                    "book_id": row.get("book_id"),
                     "entity_id": row["entity_id"],
                     "text": row["text"] or "",
                     "snippet": row["snippet"] or "",
@@ -31,7 +31,7 @@ from typing import Any, Optional
 from contextlib import nullcontext
 
 from prometheus_client import Counter, start_http_server
-from sqlalchemy import func, select, update
+from sqlalchemy import literal_column, select, update
 from sqlalchemy.dialects.postgresql import insert
 
 _HERE = Path(__file__).resolve()
@@ -50,6 +50,11 @@ from infra.database.session import get_session_factory
 from infra.database.models.chronicle_models import ChronicleEventModel
 from infra.database.models.chronicle_entries_models import ChronicleEntryModel
 from infra.database.models.chronicle_outbox_models import ChronicleOutboxEventModel
+from infra.storage.chronicle_activity_rollup import (
+    BookVisitExpiry,
+    ChronicleActivity,
+    apply_chronicle_activity,
+)
 from infra.observability.outbox_metrics import (
     outbox_failed_total,
     outbox_inflight_events,
@@ -57,10 +62,14 @@ from infra.observability.outbox_metrics import (
     outbox_last_success_timestamp_seconds,
     outbox_oldest_age_seconds,
     outbox_processed_total,
-    outbox_stuck_processing_events,
     outbox_retry_scheduled_total,
     outbox_terminal_failed_total,
+    outbox_wakeups_total,
 )
+from infra.outbox_core.acks import ACK_DONE, ACK_FAILED, ACK_RETRY, OutboxAck, write_acks
+from infra.outbox_core.backlog import BacklogSampler
+from infra.outbox_core.notify import CHRONICLE_OUTBOX_CHANNEL, OutboxWakeup
+from infra.outbox_core.retention import OutboxRetention
 from infra.outbox_core.stuck import stuck_processing_predicate
 from infra.observability.runtime_endpoints import RuntimeState, start_runtime_http_server
 
@@ -152,6 +161,13 @@ def _get_float_env(name: str, default: float) -> float:
         raise RuntimeError(f"Invalid float env {name}={raw!r}") from exc
 
 
+def _get_bool_env(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None or raw == "":
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "y", "on"}
+
+
 def _summarize(event: ChronicleEventModel) -> str:
     if event.block_id:
         return f"{event.event_type} (book={event.book_id}, block={event.block_id})"
@@ -285,69 +301,7 @@ def _compute_next_retry_at(now: datetime, *, attempts: int, base: float, max_bac
     return now + timedelta(seconds=(backoff + jitter))
 
 
-async def _mark_done(session, *, ev_id: Any, worker_id: str) -> None:
-    now = _utc_now()
-    await session.execute(
-        update(ChronicleOutboxEventModel)
-        .where(
-            ChronicleOutboxEventModel.id == ev_id,
-            ChronicleOutboxEventModel.owner == worker_id,
-            ChronicleOutboxEventModel.status == "processing",
-            ChronicleOutboxEventModel.lease_until > now,
-        )
-        .values(
-            status="done",
-            processed_at=now,
-            owner=None,
-            lease_until=None,
-            processing_started_at=None,
-            next_retry_at=None,
-            error_reason=None,
-            error=None,
-            updated_at=now,
-        )
-    )
-
-
-async def _mark_retry(session, *, ev_id: Any, reason: str, error: str, attempts: int, next_retry_at: datetime) -> None:
-    now = _utc_now()
-    await session.execute(
-        update(ChronicleOutboxEventModel)
-        .where(ChronicleOutboxEventModel.id == ev_id)
-        .values(
-            status="pending",
-            owner=None,
-            lease_until=None,
-            processing_started_at=None,
-            attempts=attempts,
-            next_retry_at=next_retry_at,
-            error_reason=reason,
-            error=error[:8000],
-            updated_at=now,
-        )
-    )
-
-
-async def _mark_failed(session, *, ev_id: Any, reason: str, error: str, attempts: int) -> None:
-    now = _utc_now()
-    await session.execute(
-        update(ChronicleOutboxEventModel)
-        .where(ChronicleOutboxEventModel.id == ev_id)
-        .values(
-            status="failed",
-            owner=None,
-            lease_until=None,
-            processing_started_at=None,
-            attempts=attempts,
-            next_retry_at=None,
-            error_reason=reason,
-            error=error[:8000],
-            updated_at=now,
-        )
-    )
-
-
-async def _process_one(session, row: _OutboxEventRow) -> None:
+async def _process_one(session, row: _OutboxEventRow) -> Optional[ChronicleActivity]:
     inject_id = _fault_inject_entity_id()
     if inject_id and str(row.entity_id) == inject_id:
         kind = _fault_inject_kind()
@@ -392,61 +346,14 @@ async def _process_one(session, row: _OutboxEventRow) -> None:
             "projection_version": projection_version,
             "updated_at": now,
         },
-    )
-    await session.execute(stmt)
-
-
-async def _update_metrics(session) -> None:
-    # Lag: pending + processing (unprocessed)
-    pending_count = (
-        await session.execute(
-            select(func.count()).select_from(ChronicleOutboxEventModel).where(
-                ChronicleOutboxEventModel.processed_at.is_(None),
-                ChronicleOutboxEventModel.status.in_(["pending", "processing", "failed"]),
-            )
-        )
-    ).scalar_one()
-
-    oldest_created = (
-        await session.execute(
-            select(func.min(ChronicleOutboxEventModel.created_at)).where(
-                ChronicleOutboxEventModel.processed_at.is_(None),
-                ChronicleOutboxEventModel.status.in_(["pending", "processing", "failed"]),
-            )
-        )
-    ).scalar_one()
-
-    inflight = (
-        await session.execute(
-            select(func.count()).select_from(ChronicleOutboxEventModel).where(
-                ChronicleOutboxEventModel.processed_at.is_(None),
-                ChronicleOutboxEventModel.status == "processing",
-            )
-        )
-    ).scalar_one()
+    ).returning(literal_column("(xmax = 0)").label("inserted"))
+    inserted = bool((await session.execute(stmt)).scalar_one())
 
-    outbox_lag_events.labels(projection=PROJECTION_NAME).set(int(pending_count or 0))
-    outbox_inflight_events.labels(projection=PROJECTION_NAME).set(int(inflight or 0))
-
-    if oldest_created is None:
-        outbox_oldest_age_seconds.labels(projection=PROJECTION_NAME).set(0)
-    else:
-        age = max(0.0, (_utc_now() - oldest_created).total_seconds())
-        outbox_oldest_age_seconds.labels(projection=PROJECTION_NAME).set(age)
-
-    stuck = (
-        await session.execute(
-            select(func.count()).select_from(ChronicleOutboxEventModel).where(
-                ChronicleOutboxEventModel.processed_at.is_(None),
-                stuck_processing_predicate(
-                    ChronicleOutboxEventModel,
-                    now=_utc_now(),
-                    max_processing_seconds=_get_int_env("OUTBOX_MAX_PROCESSING_SECONDS", 600),
-                ),
-            )
-        )
-    ).scalar_one()
-    outbox_stuck_processing_events.labels(projection=PROJECTION_NAME).set(int(stuck or 0))
+    # Dashboard rollup: count each entry once (replays only update the entry).
+    # The caller applies the batch's activity after the loop, in key order.
+    if not inserted:
+        return None
+    return ChronicleActivity(book_id=ev.book_id, event_type=ev.event_type, occurred_at=ev.occurred_at)
 
 
 async def _db_ping(session_factory, *, timeout_seconds: float) -> tuple[bool, str | None]:
@@ -520,6 +427,16 @@ async def main_async() -> int:
     max_attempts = _get_int_env("OUTBOX_MAX_ATTEMPTS", 10)
     base_backoff = _get_float_env("OUTBOX_BASE_BACKOFF_SECONDS", 0.5)
     max_backoff = _get_float_env("OUTBOX_MAX_BACKOFF_SECONDS", 10.0)
+    listen_enabled = _get_bool_env("OUTBOX_LISTEN_ENABLED", True)
+    listen_fallback_poll_seconds = _get_float_env("OUTBOX_LISTEN_FALLBACK_POLL_SECONDS", 5.0)
+    metrics_sample_interval_seconds = _get_float_env("OUTBOX_METRICS_SAMPLE_INTERVAL_SECONDS", 15.0)
+    # Retention for done rows (0 disables). Failed and replayed rows are kept.
+    retention_done_seconds = _get_float_env("OUTBOX_RETENTION_DONE_SECONDS", 7 * 24 * 3600.0)
+    retention_interval_seconds = _get_float_env("OUTBOX_RETENTION_INTERVAL_SECONDS", 60.0)
+    retention_batch_size = _get_int_env("OUTBOX_RETENTION_BATCH_SIZE", 1000)
+    # Expiry of books.visit_count_90d as view buckets leave the window (0 disables).
+    visit_expiry_interval_seconds = _get_float_env("CHRONICLE_VISIT_EXPIRY_INTERVAL_SECONDS", 3600.0)
+    visit_expiry_lookback_days = _get_int_env("CHRONICLE_VISIT_EXPIRY_LOOKBACK_DAYS", 7)
 
     start_http_server(metrics_port)
     logger.info(f"[chronicle worker] metrics on :{metrics_port}")
@@ -537,6 +454,39 @@ async def main_async() -> int:
 
     session_factory = await get_session_factory()
 
+    # LISTEN/NOTIFY wakeup; polling remains the fallback (retries, listener down).
+    wakeup = OutboxWakeup(os.environ["DATABASE_URL"], CHRONICLE_OUTBOX_CHANNEL) if listen_enabled else None
+
+    # Backlog gauges are sampled off the claim path (count scans grow with the table).
+    backlog_sampler = BacklogSampler(
+        session_factory,
+        ChronicleOutboxEventModel,
+        projection=PROJECTION_NAME,
+        interval_seconds=metrics_sample_interval_seconds,
+        max_processing_seconds=max_processing_seconds,
+    )
+    retention = OutboxRetention(
+        session_factory,
+        ChronicleOutboxEventModel,
+        projection=PROJECTION_NAME,
+        retention_seconds=retention_done_seconds,
+        interval_seconds=retention_interval_seconds,
+        batch_size=retention_batch_size,
+    )
+    visit_expiry = BookVisitExpiry(
+        session_factory,
+        interval_seconds=visit_expiry_interval_seconds,
+        lookback_days=visit_expiry_lookback_days,
+    )
+
+    async def _idle_wait() -> None:
+        if wakeup is None:
+            await asyncio.sleep(poll_interval)
+            return
+        timeout = listen_fallback_poll_seconds if wakeup.listening else poll_interval
+        notified = await wakeup.wait(timeout)
+        outbox_wakeups_total.labels(projection=PROJECTION_NAME, reason="notify" if notified else "poll").inc()
+
     # Initialize metrics to 0.
     outbox_lag_events.labels(projection=PROJECTION_NAME).set(0)
     outbox_oldest_age_seconds.labels(projection=PROJECTION_NAME).set(0)
@@ -552,6 +502,8 @@ async def main_async() -> int:
         runtime.request_stop(reason)
         if stop_requested_at_mono is None:
             stop_requested_at_mono = time.monotonic()
+        if wakeup is not None:
+            wakeup.wake()
 
     try:
         loop = asyncio.get_running_loop()
@@ -565,139 +517,275 @@ async def main_async() -> int:
             # Signal handling may be unsupported (e.g., embedded environments).
             pass
 
-    while True:
-        with _start_span(
-            "outbox_worker.loop",
-            {
-                "projection": "chronicle",
-                "wordloom.projection": PROJECTION_NAME,
-                "wordloom.worker.id": str(worker_id),
-            },
-        ):
-            runtime.mark_loop_tick()
-
-        if run_seconds > 0 and (time.monotonic() - started_mono) >= run_seconds:
-            logger.info("[chronicle worker] exiting after OUTBOX_RUN_SECONDS=%s", run_seconds)
-            runtime.set_state("STOPPED")
-            return 0
-
-        if stop_requested_at_mono is not None and (time.monotonic() - stop_requested_at_mono) >= shutdown_grace_seconds:
-            logger.warning(
-                "[chronicle worker] shutdown grace exceeded (%ss); exiting",
-                shutdown_grace_seconds,
-            )
-            runtime.set_state("STOPPED")
-            return 0
-
-        try:
-            now_mono = time.monotonic()
-
-            # Guardrail: DB ping + readiness.
-            if db_ping_interval_seconds > 0 and (now_mono - last_db_ping_at) >= db_ping_interval_seconds:
-                ok, err = await _db_ping(session_factory, timeout_seconds=db_ping_timeout_seconds)
-                runtime.set_db_check(ok=ok, error=err)
-                last_db_ping_at = now_mono
-                snap = runtime.snapshot()
-                if not ok and snap.consecutive_db_failures >= db_fails_before_draining:
-                    runtime.set_state("DRAINING")
-                elif ok and (not snap.stop_requested):
-                    runtime.set_state("RUNNING")
-
-            if reclaim_interval_seconds > 0 and (now_mono - last_reclaim_at) >= reclaim_interval_seconds:
-                async with session_factory() as session:
-                    await _sanitize_terminal_rows(session)
-                    reclaimed = await _reclaim_stuck_processing(session, max_processing_seconds=max_processing_seconds)
-                    if reclaimed:
-                        logger.info("Reclaimed %s stuck chronicle outbox events", reclaimed)
-                    await session.commit()
-                last_reclaim_at = now_mono
-
-            async with session_factory() as session:
-                await _update_metrics(session)
-                await session.commit()
-
-            # Stop claiming new work once stop is requested or while draining due to guardrails.
-            snap = runtime.snapshot()
-            if snap.stop_requested or snap.state == "DRAINING" or (not snap.last_db_ok):
-                if snap.stop_requested:
-                    logger.info("[chronicle worker] stop requested; not claiming new work")
-                await asyncio.sleep(min(1.0, max(0.1, poll_interval)))
-                if snap.stop_requested:
-                    runtime.set_state("STOPPED")
-                    return 0
-                continue
-
+    async with (
+        (wakeup or nullcontext()),
+        backlog_sampler,
+        retention,
+        visit_expiry,
+    ):
+        while True:
             with _start_span(
-                "outbox.claim_batch",
+                "outbox_worker.loop",
                 {
                     "projection": "chronicle",
                     "wordloom.projection": PROJECTION_NAME,
                     "wordloom.worker.id": str(worker_id),
-                    "batch_size": int(batch_size),
                 },
-            ) as claim_span:
-                async with session_factory() as session:
-                    events = await _claim_batch(
-                        session,
-                        worker_id=worker_id,
-                        lease_seconds=lease_seconds,
-                        batch_size=batch_size,
-                    )
-                if claim_span is not None:
-                    try:
-                        claim_span.set_attribute("claimed", int(len(events or [])))
-                    except Exception:
-                        pass
-
-            logger.info(
-                {
-                    "event": "outbox.claim_batch",
-                    "layer": "worker",
-                    "projection": PROJECTION_NAME,
-                    "worker_id": str(worker_id),
-                    "batch_size": int(batch_size),
-                    "claimed": int(len(events or [])),
-                }
-            )
-
-            if not events:
-                await asyncio.sleep(poll_interval)
-                continue
-
-            attempt_max = max((int(getattr(e, "attempts", 0) or 0) for e in events), default=0)
+            ):
+                runtime.mark_loop_tick()
+
+            if run_seconds > 0 and (time.monotonic() - started_mono) >= run_seconds:
+                logger.info("[chronicle worker] exiting after OUTBOX_RUN_SECONDS=%s", run_seconds)
+                runtime.set_state("STOPPED")
+                return 0
+
+            if stop_requested_at_mono is not None and (time.monotonic() - stop_requested_at_mono) >= shutdown_grace_seconds:
+                logger.warning(
+                    "[chronicle worker] shutdown grace exceeded (%ss); exiting",
+                    shutdown_grace_seconds,
+                )
+                runtime.set_state("STOPPED")
+                return 0
 
-            ops = {str(getattr(e, "op", None) or "unknown") for e in events}
-            entity_types = {str(getattr(e, "entity_type", None) or "unknown") for e in events}
-            batch_op = next(iter(ops)) if len(ops) == 1 else "mixed"
-            batch_entity_type = next(iter(entity_types)) if len(entity_types) == 1 else "mixed"
-
-            batch_parent_ctx = None
             try:
-                traceparents = {e.traceparent for e in events if getattr(e, "traceparent", None)}
-                tracestates = {e.tracestate for e in events if getattr(e, "tracestate", None)}
-                if len(traceparents) == 1 and len(tracestates) <= 1:
-                    batch_parent_ctx = extract_context(
-                        traceparent=next(iter(traceparents)),
-                        tracestate=(next(iter(tracestates)) if tracestates else None),
-                    )
-            except Exception:
+                now_mono = time.monotonic()
+
+                # Guardrail: DB ping + readiness.
+                if db_ping_interval_seconds > 0 and (now_mono - last_db_ping_at) >= db_ping_interval_seconds:
+                    ok, err = await _db_ping(session_factory, timeout_seconds=db_ping_timeout_seconds)
+                    runtime.set_db_check(ok=ok, error=err)
+                    last_db_ping_at = now_mono
+                    snap = runtime.snapshot()
+                    if not ok and snap.consecutive_db_failures >= db_fails_before_draining:
+                        runtime.set_state("DRAINING")
+                    elif ok and (not snap.stop_requested):
+                        runtime.set_state("RUNNING")
+
+                if reclaim_interval_seconds > 0 and (now_mono - last_reclaim_at) >= reclaim_interval_seconds:
+                    async with session_factory() as session:
+                        await _sanitize_terminal_rows(session)
+                        reclaimed = await _reclaim_stuck_processing(session, max_processing_seconds=max_processing_seconds)
+                        if reclaimed:
+                            logger.info("Reclaimed %s stuck chronicle outbox events", reclaimed)
+                        await session.commit()
+                    last_reclaim_at = now_mono
+
+                # Stop claiming new work once stop is requested or while draining due to guardrails.
+                snap = runtime.snapshot()
+                if snap.stop_requested or snap.state == "DRAINING" or (not snap.last_db_ok):
+                    if snap.stop_requested:
+                        logger.info("[chronicle worker] stop requested; not claiming new work")
+                    await asyncio.sleep(min(1.0, max(0.1, poll_interval)))
+                    if snap.stop_requested:
+                        runtime.set_state("STOPPED")
+                        return 0
+                    continue
+
+                with _start_span(
+                    "outbox.claim_batch",
+                    {
+                        "projection": "chronicle",
+                        "wordloom.projection": PROJECTION_NAME,
+                        "wordloom.worker.id": str(worker_id),
+                        "batch_size": int(batch_size),
+                    },
+                ) as claim_span:
+                    async with session_factory() as session:
+                        events = await _claim_batch(
+                            session,
+                            worker_id=worker_id,
+                            lease_seconds=lease_seconds,
+                            batch_size=batch_size,
+                        )
+                    if claim_span is not None:
+                        try:
+                            claim_span.set_attribute("claimed", int(len(events or [])))
+                        except Exception:
+                            pass
+
+                logger.info(
+                    {
+                        "event": "outbox.claim_batch",
+                        "layer": "worker",
+                        "projection": PROJECTION_NAME,
+                        "worker_id": str(worker_id),
+                        "batch_size": int(batch_size),
+                        "claimed": int(len(events or [])),
+                    }
+                )
+
+                if not events:
+                    await _idle_wait()
+                    continue
+
+                attempt_max = max((int(getattr(e, "attempts", 0) or 0) for e in events), default=0)
+
+                ops = {str(getattr(e, "op", None) or "unknown") for e in events}
+                entity_types = {str(getattr(e, "entity_type", None) or "unknown") for e in events}
+                batch_op = next(iter(ops)) if len(ops) == 1 else "mixed"
+                batch_entity_type = next(iter(entity_types)) if len(entity_types) == 1 else "mixed"
+
                 batch_parent_ctx = None
+                try:
+                    traceparents = {e.traceparent for e in events if getattr(e, "traceparent", None)}
+                    tracestates = {e.tracestate for e in events if getattr(e, "tracestate", None)}
+                    if len(traceparents) == 1 and len(tracestates) <= 1:
+                        batch_parent_ctx = extract_context(
+                            traceparent=next(iter(traceparents)),
+                            tracestate=(next(iter(tracestates)) if tracestates else None),
+                        )
+                except Exception:
+                    batch_parent_ctx = None
+
+                with _start_span(
+                    "projection.process_batch",
+                    {
+                        "projection": "chronicle",
+                        "wordloom.projection": PROJECTION_NAME,
+                        "batch_size": int(len(events)),
+                        "attempt": int(attempt_max),
+                        "op": batch_op,
+                        "entity_type": batch_entity_type,
+                    },
+                    context=batch_parent_ctx,
+                ) as batch_span:
+                    # One transaction per batch: each event's projection write runs in a
+                    # savepoint, status transitions are written together (write_acks).
+                    deadline_idx: int | None = None
+                    async with session_factory() as session:
+                        try:
+                            # Confirm ownership/lease for the whole batch in one read.
+                            db_rows = {
+                                row.id: row
+                                for row in (
+                                    await session.execute(
+                                        select(ChronicleOutboxEventModel).where(
+                                            ChronicleOutboxEventModel.id.in_([e.id for e in events])
+                                        )
+                                    )
+                                ).scalars()
+                            }
+                            acks: list[OutboxAck] = []
+                            activities: list[ChronicleActivity] = []
+
+                            for idx, ev in enumerate(events):
+                                if stop_requested_at_mono is not None and (time.monotonic() - stop_requested_at_mono) >= shutdown_grace_seconds:
+                                    deadline_idx = idx
+                                    break
+
+                                db_ev = db_rows.get(ev.id)
+                                if db_ev is None:
+                                    continue
+
+                                now = _utc_now()
+                                if db_ev.processed_at is not None:
+                                    continue
+                                if db_ev.status != "processing" or db_ev.owner != worker_id:
+                                    if db_ev.owner != worker_id:
+                                        outbox_owner_mismatch_skips_total.labels(projection=PROJECTION_NAME).inc()
+                                    continue
+                                if db_ev.lease_until is None or db_ev.lease_until <= now:
+                                    continue
+
+                                try:
+                                    async with session.begin_nested():
+                                        with _start_span(
+                                            "outbox.process",
+                                            {
+                                                "wordloom.projection": PROJECTION_NAME,
+                                                "wordloom.outbox.id": str(ev.id),
+                                                "wordloom.entity.type": str(ev.entity_type),
+                                                "wordloom.entity.id": str(ev.entity_id),
+                                                "wordloom.outbox.op": str(ev.op),
+                                                "wordloom.outbox.event_version": int(ev.event_version or 0),
+                                                "wordloom.outbox.attempts": int(ev.attempts or 0),
+                                            },
+                                        ):
+                                            activity = await _process_one(session, ev)
+
+                                    if activity is not None:
+                                        activities.append(activity)
+                                    acks.append(OutboxAck(id=ev.id, outcome=ACK_DONE))
+                                    outbox_processed_total.labels(projection=PROJECTION_NAME, op=str(db_ev.op)).inc()
+                                    outbox_last_success_timestamp_seconds.labels(projection=PROJECTION_NAME).set(now.timestamp())
+                                except DeterministicError as exc:
+                                    attempts = int(getattr(ev, "attempts", 0) or 0) + 1
+                                    acks.append(
+                                        OutboxAck(
+                                            id=ev.id,
+                                            outcome=ACK_FAILED,
+                                            attempts=attempts,
+                                            error_reason="deterministic_exception",
+                                            error=str(exc)[:8000],
+                                        )
+                                    )
+                                    outbox_terminal_failed_total.labels(
+                                        projection=PROJECTION_NAME,
+                                        op=str(db_ev.op),
+                                        reason="deterministic_exception",
+                                    ).inc()
+                                    outbox_failed_total.labels(
+                                        projection=PROJECTION_NAME,
+                                        op=str(db_ev.op),
+                                        reason="deterministic_exception",
+                                    ).inc()
+                                except Exception as exc:
+                                    logger.exception("[chronicle worker] Failed to process outbox event %s", ev.id)
+                                    attempts = int(getattr(ev, "attempts", 0) or 0) + 1
+                                    if attempts >= max_attempts:
+                                        acks.append(
+                                            OutboxAck(
+                                                id=ev.id,
+                                                outcome=ACK_FAILED,
+                                                attempts=attempts,
+                                                error_reason="unknown_exception",
+                                                error=str(exc)[:8000],
+                                            )
+                                        )
+                                        outbox_terminal_failed_total.labels(
+                                            projection=PROJECTION_NAME,
+                                            op=str(db_ev.op),
+                                            reason="unknown_exception",
+                                        ).inc()
+                                    else:
+                                        acks.append(
+                                            OutboxAck(
+                                                id=ev.id,
+                                                outcome=ACK_RETRY,
+                                                attempts=attempts,
+                                                next_retry_at=_compute_next_retry_at(
+                                                    _utc_now(),
+                                                    attempts=attempts,
+                                                    base=base_backoff,
+                                                    max_backoff=max_backoff,
+                                                ),
+                                                error_reason="unknown_exception",
+                                                error=str(exc)[:8000],
+                                            )
+                                        )
+                                        outbox_retry_scheduled_total.labels(
+                                            projection=PROJECTION_NAME,
+                                            op=str(db_ev.op),
+                                            reason="unknown_exception",
+                                        ).inc()
+
+                                    outbox_failed_total.labels(
+                                        projection=PROJECTION_NAME,
+                                        op=str(db_ev.op),
+                                        reason="unknown_exception",
+                                    ).inc()
 
-            with _start_span(
-                "projection.process_batch",
-                {
-                    "projection": "chronicle",
-                    "wordloom.projection": PROJECTION_NAME,
-                    "batch_size": int(len(events)),
-                    "attempt": int(attempt_max),
-                    "op": batch_op,
-                    "entity_type": batch_entity_type,
-                },
-                context=batch_parent_ctx,
-            ) as batch_span:
-                for idx, ev in enumerate(events):
-                    if stop_requested_at_mono is not None and (time.monotonic() - stop_requested_at_mono) >= shutdown_grace_seconds:
-                        remaining_ids = [e.id for e in events[idx:]]
+                            # Rollup deltas once per batch, sorted, so hot (book, day) and
+                            # books rows are locked briefly and in one order across workers.
+                            await apply_chronicle_activity(session, activities)
+                            await write_acks(session, ChronicleOutboxEventModel, acks, worker_id=worker_id, now=_utc_now())
+                            await session.commit()
+                        except Exception:
+                            logger.exception("[chronicle worker] Failed to process outbox batch")
+                            await session.rollback()
+
+                    if deadline_idx is not None:
+                        remaining_ids = [e.id for e in events[deadline_idx:]]
                         try:
                             released = await _release_processing_rows(
                                 session_factory,
@@ -720,139 +808,29 @@ async def main_async() -> int:
                         runtime.set_state("STOPPED")
                         return 0
 
-                    async with session_factory() as session:
+                    if batch_span is not None:
                         try:
-                            # Reload row to confirm ownership/lease before doing work.
-                            db_ev = (
-                                await session.execute(
-                                    select(ChronicleOutboxEventModel).where(ChronicleOutboxEventModel.id == ev.id)
-                                )
-                            ).scalar_one_or_none()
-
-                            if db_ev is None:
-                                await session.commit()
-                                continue
-
-                            now = _utc_now()
-                            if db_ev.processed_at is not None:
-                                await session.commit()
-                                continue
-                            if db_ev.status != "processing" or db_ev.owner != worker_id:
-                                if db_ev.owner != worker_id:
-                                    outbox_owner_mismatch_skips_total.labels(projection=PROJECTION_NAME).inc()
-                                await session.commit()
-                                continue
-                            if db_ev.lease_until is None or db_ev.lease_until <= now:
-                                await session.commit()
-                                continue
-
-                            try:
-                                with _start_span(
-                                    "outbox.process",
-                                    {
-                                        "wordloom.projection": PROJECTION_NAME,
-                                        "wordloom.outbox.id": str(ev.id),
-                                        "wordloom.entity.type": str(ev.entity_type),
-                                        "wordloom.entity.id": str(ev.entity_id),
-                                        "wordloom.outbox.op": str(ev.op),
-                                        "wordloom.outbox.event_version": int(ev.event_version or 0),
-                                        "wordloom.outbox.attempts": int(ev.attempts or 0),
-                                    },
-                                ):
-                                    await _process_one(session, ev)
-
-                                await _mark_done(session, ev_id=ev.id, worker_id=worker_id)
-                                outbox_processed_total.labels(projection=PROJECTION_NAME, op=str(db_ev.op)).inc()
-                                outbox_last_success_timestamp_seconds.labels(projection=PROJECTION_NAME).set(now.timestamp())
-                            except DeterministicError as exc:
-                                attempts = int(getattr(ev, "attempts", 0) or 0) + 1
-                                await _mark_failed(
-                                    session,
-                                    ev_id=ev.id,
-                                    reason="deterministic_exception",
-                                    error=str(exc),
-                                    attempts=attempts,
-                                )
-                                outbox_terminal_failed_total.labels(
-                                    projection=PROJECTION_NAME,
-                                    op=str(db_ev.op),
-                                    reason="deterministic_exception",
-                                ).inc()
-                                outbox_failed_total.labels(
-                                    projection=PROJECTION_NAME,
-                                    op=str(db_ev.op),
-                                    reason="deterministic_exception",
-                                ).inc()
-                            except Exception as exc:
-                                attempts = int(getattr(ev, "attempts", 0) or 0) + 1
-                                if attempts >= max_attempts:
-                                    await _mark_failed(
-                                        session,
-                                        ev_id=ev.id,
-                                        reason="unknown_exception",
-                                        error=str(exc),
-                                        attempts=attempts,
-                                    )
-                                    outbox_terminal_failed_total.labels(
-                                        projection=PROJECTION_NAME,
-                                        op=str(db_ev.op),
-                                        reason="unknown_exception",
-                                    ).inc()
-                                else:
-                                    next_retry_at = _compute_next_retry_at(
-                                        _utc_now(),
-                                        attempts=attempts,
-                                        base=base_backoff,
-                                        max_backoff=max_backoff,
-                                    )
-                                    await _mark_retry(
-                                        session,
-                                        ev_id=ev.id,
-                                        reason="unknown_exception",
-                                        error=str(exc),
-                                        attempts=attempts,
-                                        next_retry_at=next_retry_at,
-                                    )
-                                    outbox_retry_scheduled_total.labels(
-                                        projection=PROJECTION_NAME,
-                                        op=str(db_ev.op),
-                                        reason="unknown_exception",
-                                    ).inc()
-
-                                outbox_failed_total.labels(
-                                    projection=PROJECTION_NAME,
-                                    op=str(db_ev.op),
-                                    reason="unknown_exception",
-                                ).inc()
-
-                            await session.commit()
+                            batch_span.set_attribute("result", "ok")
                         except Exception:
-                            logger.exception("[chronicle worker] Failed to process outbox event %s", ev.id)
-                            await session.rollback()
+                            pass
+
+                logger.info(
+                    {
+                        "event": "projection.process_batch",
+                        "layer": "worker",
+                        "projection": PROJECTION_NAME,
+                        "worker_id": str(worker_id),
+                        "batch_size": int(len(events)),
+                        "attempt": int(attempt_max),
+                        "op": batch_op,
+                        "entity_type": batch_entity_type,
+                        "result": "ok",
+                    }
+                )
 
-                if batch_span is not None:
-                    try:
-                        batch_span.set_attribute("result", "ok")
-                    except Exception:
-                        pass
-
-            logger.info(
-                {
-                    "event": "projection.process_batch",
-                    "layer": "worker",
-                    "projection": PROJECTION_NAME,
-                    "worker_id": str(worker_id),
-                    "batch_size": int(len(events)),
-                    "attempt": int(attempt_max),
-                    "op": batch_op,
-                    "entity_type": batch_entity_type,
-                    "result": "ok",
-                }
-            )
-
-        except Exception:
-            logger.exception("[chronicle worker] loop error")
-            await asyncio.sleep(1.0)
+            except Exception:
+                logger.exception("[chronicle worker] loop error")
+                await asyncio.sleep(1.0)
 
 
 def main() -> None:
@@ -35,6 +35,11 @@ from infra.database.models.chronicle_models import ChronicleEventModel
 from infra.database.models.chronicle_entries_models import ChronicleEntryModel
 from infra.database.models.chronicle_outbox_models import ChronicleOutboxEventModel
 from infra.database.models.projection_status_models import ProjectionStatusModel
+from infra.storage.chronicle_activity_rollup import (
+    rebuild_chronicle_activity_rollup,
+    recompute_book_visit_counts,
+    utc_day,
+)
 
 
 PROJECTION_NAME = "chronicle_events_to_entries"
@@ -217,6 +222,11 @@ async def main_async() -> int:
                     )
                     await session.execute(stmt2)
 
+                # Entries were rewritten directly (not via the projector): recompute the dashboard
+                # rollup and the visit counters derived from it.
+                await rebuild_chronicle_activity_rollup(session)
+                await recompute_book_visit_counts(session, today=utc_day(now))
+
             finished_at = _utc_now()
             await _set_projection_status(session, success=True, error=None, started_at=started_at, finished_at=finished_at)
             await session.commit()
@@ -12,6 +12,10 @@ Usage (WSL2/bash or PowerShell):
 Notes:
 - This rebuild only covers entity types we currently project here: book + block.
 - Soft-deleted rows are skipped.
+- Rows are streamed in chunks of --batch-size with keyset pagination on
+  (created_at, id); each chunk is one multi-row upsert (+ one multi-row outbox
+  insert) and one commit, so memory stays flat and no long transaction is held.
+- Progress and ETA are exported via the projection_rebuild_* gauges.
 """
 
 from __future__ import annotations
@@ -20,12 +24,13 @@ import argparse
 import asyncio
 import os
 import sys
+import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, func, select, tuple_
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 _HERE = Path(__file__).resolve()
@@ -52,6 +57,11 @@ from infra.database.models.projection_status_models import ProjectionStatusModel
 
 PROJECTION_NAME = "search_sot_to_search_index"
 
+# Postgres caps bind parameters per statement at 65535; a search_index row
+# binds 9 of them.
+_MAX_BATCH_SIZE = 5000
+_PROGRESS_PRINT_INTERVAL_SECONDS = 10.0
+
 
 class _NoopMetric:
     def labels(self, **_kwargs):  # noqa: ANN003
@@ -61,7 +71,17 @@ class _NoopMetric:
         return None
 
 
-def _get_rebuild_metrics():
+@dataclass(frozen=True)
+class _RebuildMetrics:
+    duration_seconds: Any
+    last_finished_timestamp_seconds: Any
+    last_success: Any
+    rows_total: Any
+    rows_done: Any
+    eta_seconds: Any
+
+
+def _get_rebuild_metrics() -> _RebuildMetrics:
     """Best-effort metrics.
 
     These are optional for ad-hoc scripts; allow running in minimal envs.
@@ -70,18 +90,24 @@ def _get_rebuild_metrics():
     try:
         from infra.observability.outbox_metrics import (
             projection_rebuild_duration_seconds,
+            projection_rebuild_eta_seconds,
             projection_rebuild_last_finished_timestamp_seconds,
             projection_rebuild_last_success,
+            projection_rebuild_rows_done,
+            projection_rebuild_rows_total,
         )
 
-        return (
-            projection_rebuild_duration_seconds,
-            projection_rebuild_last_finished_timestamp_seconds,
-            projection_rebuild_last_success,
+        return _RebuildMetrics(
+            duration_seconds=projection_rebuild_duration_seconds,
+            last_finished_timestamp_seconds=projection_rebuild_last_finished_timestamp_seconds,
+            last_success=projection_rebuild_last_success,
+            rows_total=projection_rebuild_rows_total,
+            rows_done=projection_rebuild_rows_done,
+            eta_seconds=projection_rebuild_eta_seconds,
         )
     except Exception:
         noop = _NoopMetric()
-        return (noop, noop, noop)
+        return _RebuildMetrics(noop, noop, noop, noop, noop, noop)
 
 
 @dataclass(frozen=True)
@@ -90,6 +116,39 @@ class _Counters:
     blocks: int = 0
 
 
+class _Progress:
+    """Rows done vs. expected, exported as gauges after every chunk."""
+
+    def __init__(self, metrics: _RebuildMetrics, *, total: int):
+        self._metrics = metrics
+        self._total = max(0, int(total))
+        self._done = 0
+        self._started_mono = time.monotonic()
+        self._last_print_mono = self._started_mono
+        self._publish()
+
+    def advance(self, rows: int) -> None:
+        self._done += int(rows)
+        self._publish()
+        now_mono = time.monotonic()
+        if (now_mono - self._last_print_mono) >= _PROGRESS_PRINT_INTERVAL_SECONDS:
+            self._last_print_mono = now_mono
+            print("Rebuild progress: %s/%s rows, eta=%.0fs" % (self._done, self._total, self.eta_seconds()))
+
+    def eta_seconds(self) -> float:
+        elapsed = time.monotonic() - self._started_mono
+        if self._done <= 0 or elapsed <= 0.0:
+            return 0.0
+        return max(0, self._total - self._done) / (self._done / elapsed)
+
+    def _publish(self) -> None:
+        labels = {"projection": PROJECTION_NAME}
+        self._metrics.rows_total.labels(**labels).set(self._total)
+        self._metrics.rows_done.labels(**labels).set(self._done)
+        self._metrics.eta_seconds.labels(**labels).set(self.eta_seconds())
+        self._metrics.duration_seconds.labels(**labels).set(time.monotonic() - self._started_mono)
+
+
 def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
@@ -113,11 +172,162 @@ def _parse_args() -> argparse.Namespace:
         action="store_true",
         help="Enqueue search_outbox_events for each upsert (worker will project to ES)",
     )
-    p.add_argument("--batch-size", type=int, default=500, help="Commit every N rows (default: 500)")
+    p.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help=f"Rows per chunk; one upsert statement + one commit each (default: 500, max: {_MAX_BATCH_SIZE})",
+    )
     p.add_argument("--limit", type=int, default=0, help="Optional limit per entity type (0 means no limit)")
     return p.parse_args()
 
 
+def _books_query():
+    return (
+        select(
+            BookModel.id,
+            BookModel.library_id,
+            BookModel.title,
+            BookModel.summary,
+            BookModel.updated_at,
+            BookModel.created_at,
+        )
+        .where(BookModel.soft_deleted_at.is_(None))
+    )
+
+
+def _blocks_query():
+    return (
+        select(
+            BlockModel.id,
+            BlockModel.content,
+            BlockModel.updated_at,
+            BlockModel.created_at,
+            BookModel.library_id,
+        )
+        .select_from(BlockModel)
+        .join(BookModel, BookModel.id == BlockModel.book_id)
+        .where(BlockModel.soft_deleted_at.is_(None), BookModel.soft_deleted_at.is_(None))
+    )
+
+
+def _book_index_row(row: Any, *, now: datetime) -> dict[str, Any]:
+    book_id, library_id, title, summary, updated_at, created_at = row
+    ts = updated_at or created_at or now
+    return {
+        "entity_type": "book",
+        "library_id": library_id,
+        "entity_id": book_id,
+        "text": (title or "") + ("\n" + summary if summary else ""),
+        "snippet": (title or "")[:200],
+        "rank_score": 0.0,
+        "created_at": created_at or ts,
+        "updated_at": ts,
+        "event_version": _event_version(ts),
+    }
+
+
+def _block_index_row(row: Any, *, now: datetime) -> dict[str, Any]:
+    block_id, content, updated_at, created_at, library_id = row
+    ts = updated_at or created_at or now
+    return {
+        "entity_type": "block",
+        "library_id": library_id,
+        "entity_id": block_id,
+        "text": content or "",
+        "snippet": (content or "")[:200],
+        "rank_score": 0.0,
+        "created_at": created_at or ts,
+        "updated_at": ts,
+        "event_version": _event_version(ts),
+    }
+
+
+async def _upsert_chunk(session, rows: list[dict[str, Any]], *, emit_outbox: bool, now: datetime) -> None:
+    """One multi-row upsert into search_index (+ one multi-row outbox insert)."""
+
+    stmt = pg_insert(SearchIndexModel).values(rows)
+    excluded = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SearchIndexModel.entity_type, SearchIndexModel.entity_id],
+        set_={
+            "library_id": excluded.library_id,
+            "text": excluded.text,
+            "snippet": excluded.snippet,
+            "updated_at": excluded.updated_at,
+            "event_version": excluded.event_version,
+        },
+        where=SearchIndexModel.event_version <= excluded.event_version,
+    )
+    await session.execute(stmt)
+
+    if emit_outbox:
+        await session.execute(
+            pg_insert(SearchOutboxEventModel).values(
+                [
+                    {
+                        "entity_type": row["entity_type"],
+                        "entity_id": row["entity_id"],
+                        "op": "upsert",
+                        "event_version": row["event_version"],
+                        "status": "pending",
+                        "attempts": 0,
+                        "replay_count": 0,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for row in rows
+                ]
+            )
+        )
+
+
+async def _rebuild_entity(
+    session,
+    *,
+    base_query,
+    model,
+    to_row,
+    chunk_size: int,
+    limit: int,
+    emit_outbox: bool,
+    progress: _Progress,
+    now: datetime,
+) -> int:
+    """Stream one entity type in keyset-paginated chunks; returns rows projected.
+
+    `model` supplies the (created_at, id) keyset columns; the query's first
+    column must be the id and it must select created_at.
+    """
+
+    after: Optional[tuple[datetime, Any]] = None
+    written = 0
+    while limit <= 0 or written < limit:
+        size = chunk_size if limit <= 0 else min(chunk_size, limit - written)
+        stmt = base_query.order_by(model.created_at.asc(), model.id.asc()).limit(size)
+        if after is not None:
+            stmt = stmt.where(tuple_(model.created_at, model.id) > after)
+        chunk = (await session.execute(stmt)).all()
+        if not chunk:
+            break
+
+        await _upsert_chunk(session, [to_row(row, now=now) for row in chunk], emit_outbox=emit_outbox, now=now)
+        await session.commit()
+
+        last = chunk[-1]
+        after = (last.created_at, last.id)
+        written += len(chunk)
+        progress.advance(len(chunk))
+        if len(chunk) < size:
+            break
+    return written
+
+
+async def _count_rows(session, base_query, *, limit: int) -> int:
+    total = int((await session.execute(select(func.count()).select_from(base_query.subquery()))).scalar_one())
+    return min(total, limit) if limit > 0 else total
+
+
 async def _set_projection_status(
     session,
     *,
@@ -153,11 +363,7 @@ async def _set_projection_status(
 async def main_async() -> int:
     args = _parse_args()
 
-    (
-        projection_rebuild_duration_seconds,
-        projection_rebuild_last_finished_timestamp_seconds,
-        projection_rebuild_last_success,
-    ) = _get_rebuild_metrics()
+    metrics = _get_rebuild_metrics()
 
     if not os.getenv("DATABASE_URL"):
         raise RuntimeError("DATABASE_URL must be set")
@@ -165,6 +371,8 @@ async def main_async() -> int:
     batch_size = int(args.batch_size or 0)
     if batch_size <= 0:
         raise RuntimeError("--batch-size must be > 0")
+    if batch_size > _MAX_BATCH_SIZE:
+        raise RuntimeError(f"--batch-size must be <= {_MAX_BATCH_SIZE}")
 
     limit = int(args.limit or 0)
     if limit < 0:
@@ -183,156 +391,54 @@ async def main_async() -> int:
                 await session.execute(
                     delete(SearchIndexModel).where(SearchIndexModel.entity_type.in_(["book", "block"]))
                 )
+                await session.commit()
 
             now = _utc_now()
-
-            # --- Books ---
-            books_stmt = (
-                select(
-                    BookModel.id,
-                    BookModel.library_id,
-                    BookModel.title,
-                    BookModel.summary,
-                    BookModel.updated_at,
-                    BookModel.created_at,
-                )
-                .where(BookModel.soft_deleted_at.is_(None))
-                .order_by(BookModel.created_at.asc(), BookModel.id.asc())
+            books_query = _books_query()
+            blocks_query = _blocks_query()
+
+            progress = _Progress(
+                metrics,
+                total=(
+                    await _count_rows(session, books_query, limit=limit)
+                    + await _count_rows(session, blocks_query, limit=limit)
+                ),
             )
-            if limit > 0:
-                books_stmt = books_stmt.limit(limit)
-            book_rows = (await session.execute(books_stmt)).all()
-
-            for (book_id, library_id, title, summary, updated_at, created_at) in book_rows:
-                text = (title or "") + ("\n" + summary if summary else "")
-                ts = updated_at or created_at or now
-                version = _event_version(ts)
-
-                stmt = pg_insert(SearchIndexModel).values(
-                    entity_type="book",
-                    library_id=library_id,
-                    entity_id=book_id,
-                    text=text,
-                    snippet=(title or "")[:200],
-                    rank_score=0.0,
-                    created_at=created_at or ts,
-                    updated_at=ts,
-                    event_version=version,
-                )
-                excluded = stmt.excluded
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=[SearchIndexModel.entity_type, SearchIndexModel.entity_id],
-                    set_={
-                        "library_id": excluded.library_id,
-                        "text": excluded.text,
-                        "snippet": excluded.snippet,
-                        "updated_at": excluded.updated_at,
-                        "event_version": excluded.event_version,
-                    },
-                    where=SearchIndexModel.event_version <= excluded.event_version,
-                )
-                await session.execute(stmt)
-
-                if args.emit_outbox:
-                    await session.execute(
-                        pg_insert(SearchOutboxEventModel).values(
-                            entity_type="book",
-                            entity_id=book_id,
-                            op="upsert",
-                            event_version=version,
-                            status="pending",
-                            attempts=0,
-                            replay_count=0,
-                            created_at=now,
-                            updated_at=now,
-                        )
-                    )
-
-                counters = _Counters(books=counters.books + 1, blocks=counters.blocks)
-                if counters.books % batch_size == 0:
-                    await session.commit()
-
             await session.commit()
 
-            # --- Blocks ---
-            blocks_stmt = (
-                select(
-                    BlockModel.id,
-                    BlockModel.book_id,
-                    BlockModel.content,
-                    BlockModel.updated_at,
-                    BlockModel.created_at,
-                    BookModel.library_id,
-                )
-                .select_from(BlockModel)
-                .join(BookModel, BookModel.id == BlockModel.book_id)
-                .where(BlockModel.soft_deleted_at.is_(None), BookModel.soft_deleted_at.is_(None))
-                .order_by(BlockModel.created_at.asc(), BlockModel.id.asc())
+            books = await _rebuild_entity(
+                session,
+                base_query=books_query,
+                model=BookModel,
+                to_row=_book_index_row,
+                chunk_size=batch_size,
+                limit=limit,
+                emit_outbox=bool(args.emit_outbox),
+                progress=progress,
+                now=now,
             )
-            if limit > 0:
-                blocks_stmt = blocks_stmt.limit(limit)
-            block_rows = (await session.execute(blocks_stmt)).all()
-
-            for (block_id, _book_id, content, updated_at, created_at, library_id) in block_rows:
-                ts = updated_at or created_at or now
-                version = _event_version(ts)
-
-                stmt = pg_insert(SearchIndexModel).values(
-                    entity_type="block",
-                    library_id=library_id,
-                    entity_id=block_id,
-                    text=content or "",
-                    snippet=(content or "")[:200],
-                    rank_score=0.0,
-                    created_at=created_at or ts,
-                    updated_at=ts,
-                    event_version=version,
-                )
-                excluded = stmt.excluded
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=[SearchIndexModel.entity_type, SearchIndexModel.entity_id],
-                    set_={
-                        "library_id": excluded.library_id,
-                        "text": excluded.text,
-                        "snippet": excluded.snippet,
-                        "updated_at": excluded.updated_at,
-                        "event_version": excluded.event_version,
-                    },
-                    where=SearchIndexModel.event_version <= excluded.event_version,
-                )
-                await session.execute(stmt)
-
-                if args.emit_outbox:
-                    await session.execute(
-                        pg_insert(SearchOutboxEventModel).values(
-                            entity_type="block",
-                            entity_id=block_id,
-                            op="upsert",
-                            event_version=version,
-                            status="pending",
-                            attempts=0,
-                            replay_count=0,
-                            created_at=now,
-                            updated_at=now,
-                        )
-                    )
-
-                counters = _Counters(books=counters.books, blocks=counters.blocks + 1)
-                if counters.blocks % batch_size == 0:
-                    await session.commit()
+            blocks = await _rebuild_entity(
+                session,
+                base_query=blocks_query,
+                model=BlockModel,
+                to_row=_block_index_row,
+                chunk_size=batch_size,
+                limit=limit,
+                emit_outbox=bool(args.emit_outbox),
+                progress=progress,
+                now=now,
+            )
+            counters = _Counters(books=books, blocks=blocks)
 
             finished_at = _utc_now()
             await _set_projection_status(session, success=True, error=None, started_at=started_at, finished_at=finished_at)
             await session.commit()
             success = True
 
-            projection_rebuild_duration_seconds.labels(projection=PROJECTION_NAME).set(
-                (finished_at - started_at).total_seconds()
-            )
-            projection_rebuild_last_finished_timestamp_seconds.labels(projection=PROJECTION_NAME).set(
-                finished_at.timestamp()
-            )
-            projection_rebuild_last_success.labels(projection=PROJECTION_NAME).set(1)
+            metrics.duration_seconds.labels(projection=PROJECTION_NAME).set((finished_at - started_at).total_seconds())
+            metrics.last_finished_timestamp_seconds.labels(projection=PROJECTION_NAME).set(finished_at.timestamp())
+            metrics.last_success.labels(projection=PROJECTION_NAME).set(1)
+            metrics.eta_seconds.labels(projection=PROJECTION_NAME).set(0)
 
             print(
                 "Rebuild OK: books=%s blocks=%s truncate=%s emit_outbox=%s"
@@ -360,10 +466,9 @@ async def main_async() -> int:
         except Exception:
             pass
 
-        projection_rebuild_last_finished_timestamp_seconds.labels(projection=PROJECTION_NAME).set(
-            finished_at.timestamp()
-        )
-        projection_rebuild_last_success.labels(projection=PROJECTION_NAME).set(0)
+        metrics.last_finished_timestamp_seconds.labels(projection=PROJECTION_NAME).set(finished_at.timestamp())
+        metrics.last_success.labels(projection=PROJECTION_NAME).set(0)
+        metrics.eta_seconds.labels(projection=PROJECTION_NAME).set(0)
 
         raise
 
@@ -19,6 +19,7 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import math
 import os
 import random
 import socket
@@ -35,7 +36,8 @@ from contextlib import nullcontext
 
 import httpx
 from prometheus_client import Counter, start_http_server
-from sqlalchemy import func, select, update
+from sqlalchemy import String, and_, cast, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PGUUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # Ensure backend root is on sys.path so `infra.*` imports work whether this
@@ -54,10 +56,21 @@ if sys.platform.startswith("win"):
         pass
 
 from infra.database.session import get_session_factory
+from infra.database.models.block_models import BlockModel
 from infra.database.models.search_index_models import SearchIndexModel
 from infra.database.models.search_outbox_models import SearchOutboxEventModel
 from infra.database.models.projection_status_models import ProjectionStatusModel
+from infra.outbox_core.acks import ACK_DONE, ACK_FAILED, ACK_RETRY, OutboxAck, write_acks
+from infra.outbox_core.adaptive import AimdController
+from infra.outbox_core.backlog import BacklogSampler
+from infra.outbox_core.coalesce import coalesce_latest_per_entity
+from infra.outbox_core.entity_locks import EntityLockTable
+from infra.outbox_core.notify import SEARCH_OUTBOX_CHANNEL, OutboxWakeup
+from infra.outbox_core.pipeline import AckWriter, ClaimAhead
+from infra.outbox_core.retention import OutboxRetention
+from infra.outbox_core.sharding import ShardLeaseManager
 from infra.observability.outbox_metrics import (
+    outbox_entity_locks,
     outbox_failed_total,
     outbox_idempotent_noop_total,
     outbox_inflight_events,
@@ -68,6 +81,7 @@ from infra.observability.outbox_metrics import (
     outbox_stuck_processing_events,
     outbox_retry_scheduled_total,
     outbox_terminal_failed_total,
+    outbox_wakeups_total,
     projection_rebuild_duration_seconds,
     projection_rebuild_last_finished_timestamp_seconds,
     projection_rebuild_last_success,
@@ -188,6 +202,65 @@ def _es_doc_id(entity_type: str, entity_id: Any) -> str:
     return f"{entity_type}:{entity_id}"
 
 
+async def _hydrate_docs(
+    session: AsyncSession,
+    keys: list[tuple[str, Any]],
+) -> dict[tuple[str, str], dict[str, Any]]:
+    """Load ES docs for many (entity_type, entity_id) pairs in one round-trip.
+
+    The keys travel as two arrays through unnest() and are joined to
+    search_index on its unique (entity_type, entity_id) index; block rows pick up
+    their book_id scope key in the same query. Pairs with no search_index row
+    (deleted / never existed) are simply absent from the result.
+    """
+    if not keys:
+        return {}
+
+    key_rows = (
+        func.unnest(
+            cast([et for et, _ in keys], ARRAY(String)),
+            cast([eid for _, eid in keys], ARRAY(PGUUID(as_uuid=True))),
+        )
+        .table_valued("entity_type", "entity_id")
+        .render_derived(name="k")
+    )
+    rows = (
+        await session.execute(
+            select(SearchIndexModel, BlockModel.book_id)
+            .select_from(key_rows)
+            .join(
+                SearchIndexModel,
+                and_(
+                    SearchIndexModel.entity_type == key_rows.c.entity_type,
+                    SearchIndexModel.entity_id == key_rows.c.entity_id,
+                ),
+            )
+            .outerjoin(
+                BlockModel,
+                and_(SearchIndexModel.entity_type == "block", BlockModel.id == SearchIndexModel.entity_id),
+            )
+        )
+    ).all()
+
+    return {
+        (row.entity_type, str(row.entity_id)): _es_doc(row, book_id=(str(book_id) if book_id else None))
+        for row, book_id in rows
+    }
+
+
+def _es_doc(row: SearchIndexModel, *, book_id: str | None) -> dict[str, Any]:
+    return {
+        "entity_type": row.entity_type,
+        "library_id": (str(row.library_id) if getattr(row, "library_id", None) else None),
+        "book_id": book_id,
+        "entity_id": str(row.entity_id),
+        "text": row.text,
+        "snippet": row.snippet,
+        "rank_score": row.rank_score,
+        "event_version": int(row.event_version),
+    }
+
+
 def _get_bool_env(name: str, default: bool) -> bool:
     raw = os.getenv(name)
     if raw is None or raw == "":
@@ -286,6 +359,11 @@ def _is_transient_reason(reason: str) -> bool:
     }
 
 
+def _is_throttle_reason(reason: str) -> bool:
+    # Signals that ES is overloaded (as opposed to a bad request or a bad doc).
+    return reason in {"es_429", "es_timeout"}
+
+
 def _classify_bulk_item_failure(*, status_code: int | None) -> tuple[str, bool]:
     if status_code is None:
         return "es_unknown", True
@@ -307,29 +385,47 @@ def _try_parse_int(value: Any) -> int | None:
         return None
 
 
+def _es_version_params(version: Any) -> dict[str, Any]:
+    """External versioning: ES rejects (409) a write not newer than the stored doc.
+
+    This fences writers cluster-wide: a worker whose shard lease lapsed while its
+    batch was in flight cannot overwrite what the new owner already wrote.
+    Legacy rows without a version (0) are written unversioned.
+    """
+
+    value = _try_parse_int(version)
+    if value is None or value <= 0:
+        return {}
+    return {"version": value, "version_type": "external"}
+
+
 def _build_es_bulk_payload(
     *,
     index: str,
-    ops: list[tuple[str, str, dict[str, Any] | None]],
+    ops: list[tuple[str, str, dict[str, Any] | None, int | None]],
 ) -> str:
     """Build NDJSON payload for Elasticsearch _bulk.
 
-    ops: list of (op, doc_id, doc_or_none)
+    ops: list of (op, doc_id, doc_or_none, event_version_or_none)
       op: "index" | "delete"
     """
 
     lines: list[str] = []
-    for op, doc_id, doc in ops:
+    for op, doc_id, doc, version in ops:
         if op == "index":
-            lines.append(json.dumps({"index": {"_index": index, "_id": doc_id}}))
+            lines.append(json.dumps({"index": {"_index": index, "_id": doc_id, **_es_version_params(version)}}))
             lines.append(json.dumps(doc or {}))
         elif op == "delete":
-            lines.append(json.dumps({"delete": {"_index": index, "_id": doc_id}}))
+            lines.append(json.dumps({"delete": {"_index": index, "_id": doc_id, **_es_version_params(version)}}))
         else:
             raise ValueError(f"Unknown bulk op: {op!r}")
     return "\n".join(lines) + ("\n" if lines else "")
 
 
+def _record_version_conflict_noop(op: str) -> None:
+    outbox_idempotent_noop_total.labels(projection=PROJECTION_NAME, op=op, reason="es_version_conflict").inc()
+
+
 def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
@@ -341,42 +437,46 @@ def _compute_backoff_seconds(*, attempt: int, base: float, max_backoff: float) -
     return min(max_backoff, exp + jitter)
 
 
-async def _process_upsert(session: AsyncSession, client: httpx.AsyncClient, index: str, event: _OutboxEventRow) -> None:
-    row = (
-        await session.execute(
-            select(SearchIndexModel).where(
-                SearchIndexModel.entity_type == event.entity_type,
-                SearchIndexModel.entity_id == event.entity_id,
-            )
-        )
-    ).scalar_one_or_none()
-
-    if row is None:
+async def _process_upsert(
+    session: AsyncSession | None,
+    client: httpx.AsyncClient,
+    index: str,
+    event: _OutboxEventRow,
+    docs: dict[tuple[str, str], dict[str, Any]] | None = None,
+) -> None:
+    """Index one event's doc. `docs` is the batch-hydrated map (see _hydrate_docs);
+    without it the doc is loaded here."""
+    key = (event.entity_type, str(event.entity_id))
+    if docs is None:
+        docs = await _hydrate_docs(session, [(event.entity_type, event.entity_id)])
+    doc = docs.get(key)
+
+    if doc is None:
         # Nothing to upsert anymore (deleted or never existed); treat as success.
         logger.info("Outbox upsert: no search_index row for %s %s, skipping", event.entity_type, event.entity_id)
         return
 
-    doc = {
-        "entity_type": row.entity_type,
-        "library_id": (str(row.library_id) if getattr(row, "library_id", None) else None),
-        "entity_id": str(row.entity_id),
-        "text": row.text,
-        "snippet": row.snippet,
-        "rank_score": row.rank_score,
-        "event_version": int(row.event_version),
-    }
-
-    doc_id = _es_doc_id(row.entity_type, row.entity_id)
-    resp = await client.put(f"/{index}/_doc/{doc_id}", json=doc)
+    doc_id = _es_doc_id(event.entity_type, event.entity_id)
+    resp = await client.put(f"/{index}/_doc/{doc_id}", json=doc, params=_es_version_params(doc["event_version"]))
+    if resp.status_code == 409:
+        # ES already holds this version or a newer one.
+        _record_version_conflict_noop("upsert")
+        logger.info("Outbox upsert: ES already has %s at version >= %s (noop)", doc_id, doc["event_version"])
+        return
     resp.raise_for_status()
     logger.info(
-        "Outbox upsert: indexed %s %s (version=%s) into ES", row.entity_type, row.entity_id, row.event_version
+        "Outbox upsert: indexed %s %s (version=%s) into ES", event.entity_type, event.entity_id, doc["event_version"]
     )
 
 
 async def _process_delete(client: httpx.AsyncClient, index: str, event: _OutboxEventRow) -> None:
     doc_id = _es_doc_id(event.entity_type, event.entity_id)
-    resp = await client.delete(f"/{index}/_doc/{doc_id}")
+    resp = await client.delete(f"/{index}/_doc/{doc_id}", params=_es_version_params(event.event_version))
+    if resp.status_code == 409:
+        # A newer version was written meanwhile; this delete is stale.
+        _record_version_conflict_noop("delete")
+        logger.info("Outbox delete: ES has %s newer than version %s (noop)", doc_id, event.event_version)
+        return
     # 404 is fine (already deleted).
     if resp.status_code not in (200, 404):
         resp.raise_for_status()
@@ -411,6 +511,30 @@ async def _worker_loop() -> None:
     concurrency = _get_int_env("OUTBOX_CONCURRENCY", 1)
     poll_interval_seconds = _get_float_env("OUTBOX_POLL_INTERVAL_SECONDS", 1.0)
     use_es_bulk_api = _get_bool_env("OUTBOX_USE_ES_BULK", False)
+    # Collapse pending events per entity at claim time: only the newest
+    # event_version is projected, older ones are acked as no-ops.
+    coalesce_enabled = _get_bool_env("OUTBOX_COALESCE_ENABLED", True)
+    metrics_sample_interval_seconds = _get_float_env("OUTBOX_METRICS_SAMPLE_INTERVAL_SECONDS", 15.0)
+    # Sharded consumers: claim only rows whose hash(entity_type, entity_id) bucket
+    # this worker holds a lease on (outbox_shard_leases).
+    sharded_enabled = _get_bool_env("OUTBOX_SHARDED_ENABLED", False)
+    shard_partitions = _get_int_env("OUTBOX_SHARD_PARTITIONS", 64)
+    shard_lease_seconds = _get_float_env("OUTBOX_SHARD_LEASE_SECONDS", 15.0)
+    # Pipelined mode: claim the next batch while the current one is in flight, and
+    # write each batch's acks from a separate stage while the next one is sent.
+    pipeline_enabled = _get_bool_env("OUTBOX_PIPELINE_ENABLED", False)
+    pipeline_depth = _get_int_env("OUTBOX_PIPELINE_DEPTH", 1)
+    # Adaptive mode: AIMD on batch size + concurrency, starting from the static values.
+    adaptive_enabled = _get_bool_env("OUTBOX_ADAPTIVE_ENABLED", False)
+    adaptive_min_batch_size = _get_int_env("OUTBOX_ADAPTIVE_MIN_BULK_SIZE", 10)
+    adaptive_max_batch_size = _get_int_env("OUTBOX_ADAPTIVE_MAX_BULK_SIZE", 1000)
+    adaptive_max_concurrency = _get_int_env("OUTBOX_ADAPTIVE_MAX_CONCURRENCY", 16)
+    adaptive_latency_target_seconds = _get_float_env("OUTBOX_ADAPTIVE_LATENCY_TARGET_SECONDS", 1.0)
+    adaptive_max_error_rate = _get_float_env("OUTBOX_ADAPTIVE_MAX_ERROR_RATE", 0.05)
+    # Retention for done rows (0 disables). Failed and replayed rows are kept.
+    retention_done_seconds = _get_float_env("OUTBOX_RETENTION_DONE_SECONDS", 7 * 24 * 3600.0)
+    retention_interval_seconds = _get_float_env("OUTBOX_RETENTION_INTERVAL_SECONDS", 60.0)
+    retention_batch_size = _get_int_env("OUTBOX_RETENTION_BATCH_SIZE", 1000)
 
     # Labs knobs: deterministic fault injection for Experiment B (ES 429).
     # Disabled by default.
@@ -455,6 +579,11 @@ async def _worker_loop() -> None:
     base_backoff_seconds = _get_float_env("OUTBOX_BASE_BACKOFF_SECONDS", 0.5)
     max_backoff_seconds = _get_float_env("OUTBOX_MAX_BACKOFF_SECONDS", 30.0)
     reclaim_interval_seconds = _get_float_env("OUTBOX_RECLAIM_INTERVAL_SECONDS", 5.0)
+    # LISTEN/NOTIFY wakeup: when the listener is up, idle waits end on NOTIFY and
+    # only fall back to polling every OUTBOX_LISTEN_FALLBACK_POLL_SECONDS
+    # (still needed for retry rows whose next_retry_at comes due).
+    listen_enabled = _get_bool_env("OUTBOX_LISTEN_ENABLED", True)
+    listen_fallback_poll_seconds = _get_float_env("OUTBOX_LISTEN_FALLBACK_POLL_SECONDS", 5.0)
     poll_interval_ms = os.getenv("OUTBOX_POLL_INTERVAL_MS")
     if poll_interval_ms:
         poll_interval_seconds = _get_int_env("OUTBOX_POLL_INTERVAL_MS", 1000) / 1000.0
@@ -561,6 +690,8 @@ async def _worker_loop() -> None:
     outbox_processed_total.labels(projection=PROJECTION_NAME, op="upsert").inc(0)
     outbox_processed_total.labels(projection=PROJECTION_NAME, op="delete").inc(0)
     outbox_idempotent_noop_total.labels(projection=PROJECTION_NAME, op="delete", reason="es_404").inc(0)
+    outbox_idempotent_noop_total.labels(projection=PROJECTION_NAME, op="upsert", reason="superseded").inc(0)
+    outbox_idempotent_noop_total.labels(projection=PROJECTION_NAME, op="delete", reason="superseded").inc(0)
     outbox_failed_total.labels(projection=PROJECTION_NAME, op="upsert", reason="none").inc(0)
     outbox_failed_total.labels(projection=PROJECTION_NAME, op="delete", reason="none").inc(0)
     outbox_retry_scheduled_total.labels(projection=PROJECTION_NAME, op="upsert", reason="none").inc(0)
@@ -622,10 +753,39 @@ async def _worker_loop() -> None:
             await assert_expected_database_environment(session)
         logger.info("[ENV_GUARD] Database environment check: OK")
 
+    adaptive = (
+        AimdController(
+            projection=PROJECTION_NAME,
+            batch_size=batch_size,
+            concurrency=concurrency,
+            min_batch_size=min(adaptive_min_batch_size, batch_size),
+            max_batch_size=max(adaptive_max_batch_size, batch_size),
+            max_concurrency=max(adaptive_max_concurrency, concurrency),
+            latency_target_seconds=adaptive_latency_target_seconds,
+            max_error_rate=adaptive_max_error_rate,
+            # Bulk mode sends one _bulk request per batch: only the batch size is live.
+            adapt_concurrency=not use_es_bulk_api,
+        )
+        if adaptive_enabled
+        else None
+    )
+    # Replaced per batch in adaptive mode (no task of the previous batch is left).
     semaphore = asyncio.Semaphore(concurrency)
-    entity_locks: dict[str, asyncio.Lock] = {}
+    # Per-entity ordering; entries exist only while an event of that entity is in flight.
+    entity_locks = EntityLockTable()
+    outbox_entity_locks.labels(projection=PROJECTION_NAME).set_function(lambda: len(entity_locks))
     last_success_timestamp_seconds = 0.0
 
+    wakeup = OutboxWakeup(db_url, SEARCH_OUTBOX_CHANNEL) if listen_enabled else None
+
+    async def _idle_wait() -> None:
+        if wakeup is None:
+            await asyncio.sleep(poll_interval_seconds)
+            return
+        timeout = listen_fallback_poll_seconds if wakeup.listening else poll_interval_seconds
+        notified = await wakeup.wait(timeout)
+        outbox_wakeups_total.labels(projection=PROJECTION_NAME, reason="notify" if notified else "poll").inc()
+
     last_db_ping_at = 0.0
     last_es_ping_at = 0.0
     stop_requested_at_mono: float | None = None
@@ -635,6 +795,8 @@ async def _worker_loop() -> None:
         runtime.request_stop(reason)
         if stop_requested_at_mono is None:
             stop_requested_at_mono = time.monotonic()
+        if wakeup is not None:
+            wakeup.wake()
 
     try:
         loop = asyncio.get_running_loop()
@@ -788,13 +950,8 @@ async def _worker_loop() -> None:
     def _entity_key(entity_type: str, entity_id: Any) -> str:
         return f"{entity_type}:{entity_id}"
 
-    def _get_entity_lock(entity_type: str, entity_id: Any) -> asyncio.Lock:
-        key = _entity_key(entity_type, entity_id)
-        lock = entity_locks.get(key)
-        if lock is None:
-            lock = asyncio.Lock()
-            entity_locks[key] = lock
-        return lock
+    def _entity_lock(entity_type: str, entity_id: Any):
+        return entity_locks.hold(_entity_key(entity_type, entity_id))
 
     def _should_retry_failure_class(failure_class: str) -> bool:
         # Policy: retry on 429 and server-side failures/timeouts.
@@ -812,7 +969,24 @@ async def _worker_loop() -> None:
             return "5xx", None
         return "unknown", None
 
-    async def _process_one(ev: _OutboxEventRow, client: httpx.AsyncClient) -> tuple[str, str]:
+    async def _write_batch_acks(acks: list[OutboxAck]) -> None:
+        if not acks:
+            return
+        try:
+            async with session_factory() as session:
+                await write_acks(session, SearchOutboxEventModel, acks, worker_id=worker_id, now=_utc_now())
+                await session.commit()
+        except Exception:  # noqa: BLE001
+            # Unacked rows stay processing and are reclaimed after their lease.
+            logger.exception("Failed to write %s outbox acks", len(acks))
+
+    async def _process_one(
+        ev: _OutboxEventRow,
+        client: httpx.AsyncClient,
+        acks: list[OutboxAck],
+        docs: dict[tuple[str, str], dict[str, Any]] | None = None,
+        rows: dict[Any, SearchOutboxEventModel] | None = None,
+    ) -> tuple[str, str]:
         nonlocal owner_mismatch_skip_count
         nonlocal last_owner_mismatch_log_at
         span_attrs: dict[str, Any] = {
@@ -843,198 +1017,442 @@ async def _worker_loop() -> None:
         ):
             # Concurrency guard: global cap + per-entity ordering.
             async with semaphore:
-                async with _get_entity_lock(ev.entity_type, ev.entity_id):
-                    async with session_factory() as session:
-                        session = session  # help type checkers (AsyncSession)
-                        try:
-                                # Reload row to confirm ownership/lease before doing work.
+                async with _entity_lock(ev.entity_type, ev.entity_id):
+                    try:
+                        # Confirm ownership/lease before doing work (rows are loaded once per batch).
+                        if rows is None:
+                            async with session_factory() as session:
                                 db_ev = (
                                     await session.execute(
                                         select(SearchOutboxEventModel).where(SearchOutboxEventModel.id == ev.id)
                                     )
                                 ).scalar_one_or_none()
+                        else:
+                            db_ev = rows.get(ev.id)
+
+                        if db_ev is None:
+                            return "ok", "none"
+
+                        now = _utc_now()
+                        if db_ev.processed_at is not None:
+                            return "ok", "none"
+                        if db_ev.status != "processing" or db_ev.owner != worker_id:
+                            if db_ev.owner != worker_id:
+                                outbox_owner_mismatch_skips_total.labels(projection=PROJECTION_NAME).inc()
+                                if break_claim_atomicity:
+                                    owner_mismatch_skip_count += 1
+                                    now_mono = time.monotonic()
+                                    if (now_mono - last_owner_mismatch_log_at) >= 5.0:
+                                        logger.warning(
+                                            "[LABS] Skipped %s outbox events due to owner mismatch (race / lost claim). Latest: id=%s owner=%s",
+                                            owner_mismatch_skip_count,
+                                            str(db_ev.id),
+                                            str(db_ev.owner),
+                                        )
+                                        last_owner_mismatch_log_at = now_mono
+                            return "ok", "owner_mismatch"
+                        if db_ev.lease_until is None or db_ev.lease_until <= now:
+                            # Lease expired; let reclaim handle it.
+                            return "retry", "lease_expired"
+
+                        def _maybe_inject_es_429(op: str) -> None:
+                            nonlocal fault_es_429_counter
+                            if fault_es_429_ratio <= 0.0 and (fault_es_429_every_n is None or fault_es_429_every_n <= 0):
+                                return
+
+                            op_norm = (op or "").strip().lower()
+                            if fault_es_429_ops and op_norm not in fault_es_429_ops:
+                                return
+
+                            inject = False
+                            if fault_es_429_every_n is not None and fault_es_429_every_n > 0:
+                                fault_es_429_counter += 1
+                                inject = (fault_es_429_counter % fault_es_429_every_n) == 0
+                            else:
+                                inject = fault_es_429_rng.random() < float(fault_es_429_ratio)
 
-                                if db_ev is None:
-                                    return "ok", "none"
-
-                                now = _utc_now()
-                                if db_ev.processed_at is not None:
-                                    return "ok", "none"
-                                if db_ev.status != "processing" or db_ev.owner != worker_id:
-                                    if db_ev.owner != worker_id:
-                                        outbox_owner_mismatch_skips_total.labels(projection=PROJECTION_NAME).inc()
-                                        if break_claim_atomicity:
-                                            owner_mismatch_skip_count += 1
-                                            now_mono = time.monotonic()
-                                            if (now_mono - last_owner_mismatch_log_at) >= 5.0:
-                                                logger.warning(
-                                                    "[LABS] Skipped %s outbox events due to owner mismatch (race / lost claim). Latest: id=%s owner=%s",
-                                                    owner_mismatch_skip_count,
-                                                    str(db_ev.id),
-                                                    str(db_ev.owner),
-                                                )
-                                                last_owner_mismatch_log_at = now_mono
-                                    return "ok", "owner_mismatch"
-                                if db_ev.lease_until is None or db_ev.lease_until <= now:
-                                    # Lease expired; let reclaim handle it.
-                                    return "retry", "lease_expired"
-
-                                def _maybe_inject_es_429(op: str) -> None:
-                                    nonlocal fault_es_429_counter
-                                    if fault_es_429_ratio <= 0.0 and (fault_es_429_every_n is None or fault_es_429_every_n <= 0):
-                                        return
-
-                                    op_norm = (op or "").strip().lower()
-                                    if fault_es_429_ops and op_norm not in fault_es_429_ops:
-                                        return
-
-                                    inject = False
-                                    if fault_es_429_every_n is not None and fault_es_429_every_n > 0:
-                                        fault_es_429_counter += 1
-                                        inject = (fault_es_429_counter % fault_es_429_every_n) == 0
-                                    else:
-                                        inject = fault_es_429_rng.random() < float(fault_es_429_ratio)
-
-                                    if not inject:
-                                        return
+                            if not inject:
+                                return
 
-                                    try:
-                                        from opentelemetry import trace as _otel_trace
+                            try:
+                                from opentelemetry import trace as _otel_trace
 
-                                        span = _otel_trace.get_current_span()
-                                        if span is not None and getattr(span, "is_recording", lambda: False)():
-                                            span.set_attribute("wordloom.labs.es_429.injected", True)
-                                            span.set_attribute("wordloom.labs.es_429.op", str(op_norm))
-                                            span.set_attribute("wordloom.labs.es_429.counter", int(fault_es_429_counter))
-                                    except Exception:
-                                        pass
+                                span = _otel_trace.get_current_span()
+                                if span is not None and getattr(span, "is_recording", lambda: False)():
+                                    span.set_attribute("wordloom.labs.es_429.injected", True)
+                                    span.set_attribute("wordloom.labs.es_429.op", str(op_norm))
+                                    span.set_attribute("wordloom.labs.es_429.counter", int(fault_es_429_counter))
+                            except Exception:
+                                pass
 
-                                    req = httpx.Request("GET", f"{es_url}/_labs/fault/429")
-                                    resp = httpx.Response(429, request=req, text="fault_injection")
-                                    raise httpx.HTTPStatusError("Injected 429 (fault injection)", request=req, response=resp)
+                            req = httpx.Request("GET", f"{es_url}/_labs/fault/429")
+                            resp = httpx.Response(429, request=req, text="fault_injection")
+                            raise httpx.HTTPStatusError("Injected 429 (fault injection)", request=req, response=resp)
 
-                                if db_ev.op == "upsert":
-                                    _maybe_inject_es_429("upsert")
+                        if db_ev.op == "upsert":
+                            _maybe_inject_es_429("upsert")
+                            if docs is None:
+                                async with session_factory() as session:
                                     await _process_upsert(session, client, es_index, ev)
-                                elif db_ev.op == "delete":
-                                    _maybe_inject_es_429("delete")
-                                    await _process_delete(client, es_index, ev)
-                                else:
-                                    raise ValueError(f"Unknown outbox op: {db_ev.op!r}")
-
-                                await session.execute(
-                                    update(SearchOutboxEventModel)
-                                    .where(
-                                        SearchOutboxEventModel.id == db_ev.id,
-                                        SearchOutboxEventModel.owner == worker_id,
-                                        SearchOutboxEventModel.status == "processing",
-                                        SearchOutboxEventModel.lease_until > now,
-                                    )
-                                    .values(
-                                        status="done",
-                                        processed_at=now,
-                                        owner=None,
-                                        lease_until=None,
-                                        processing_started_at=None,
-                                        next_retry_at=None,
-                                        error_reason=None,
-                                        error=None,
-                                        updated_at=now,
-                                    )
-                                )
-                                await session.commit()
+                            else:
+                                await _process_upsert(None, client, es_index, ev, docs)
+                        elif db_ev.op == "delete":
+                            _maybe_inject_es_429("delete")
+                            await _process_delete(client, es_index, ev)
+                        else:
+                            raise ValueError(f"Unknown outbox op: {db_ev.op!r}")
+
+                        # Status is written with the rest of the batch (write_acks).
+                        acks.append(OutboxAck(id=ev.id, outcome=ACK_DONE))
+
+                        outbox_processed_total.labels(projection=PROJECTION_NAME, op=db_ev.op).inc()
+                        outbox_last_success_timestamp_seconds.labels(projection=PROJECTION_NAME).set(time.time())
+                        return "ok", "none"
+                    except Exception as exc:  # noqa: BLE001
+                        logger.exception("Failed to process outbox event %s", ev.id)
 
-                                outbox_processed_total.labels(projection=PROJECTION_NAME, op=db_ev.op).inc()
-                                last_success_timestamp_seconds = time.time()
-                                outbox_last_success_timestamp_seconds.labels(projection=PROJECTION_NAME).set(
-                                    last_success_timestamp_seconds
+                        failure_class, _status_code = _classify_exception(exc)
+                        reason, is_retryable = _classify_attempt_outcome(exc)
+                        attempts = int(getattr(ev, "attempts", 0) or 0)
+                        next_attempt = attempts + 1
+
+                        is_transient = _is_transient_reason(reason)
+                        allow_retry = is_retryable and _should_retry_failure_class(failure_class)
+                        ignore_max_attempts = is_transient and (not terminal_on_transient)
+                        should_retry = allow_retry and (ignore_max_attempts or next_attempt < max_attempts)
+
+                        # Prevent unbounded attempt growth if we retry forever on transients.
+                        attempts_to_store = min(next_attempt, max_attempts) if ignore_max_attempts else next_attempt
+
+                        if should_retry:
+                            delay = _compute_backoff_seconds(
+                                attempt=attempts_to_store,
+                                base=base_backoff_seconds,
+                                max_backoff=max_backoff_seconds,
+                            )
+                            acks.append(
+                                OutboxAck(
+                                    id=ev.id,
+                                    outcome=ACK_RETRY,
+                                    attempts=attempts_to_store,
+                                    next_retry_at=_utc_now() + timedelta(seconds=delay),
+                                    error_reason=reason,
+                                    error=_format_error(exc),
                                 )
-                                return "ok", "none"
-                        except Exception as exc:  # noqa: BLE001
-                            logger.exception("Failed to process outbox event %s", ev.id)
-
-                            failure_class, _status_code = _classify_exception(exc)
-                            reason, is_retryable = _classify_attempt_outcome(exc)
-                            attempts = int(getattr(ev, "attempts", 0) or 0)
-                            next_attempt = attempts + 1
-
-                            is_transient = _is_transient_reason(reason)
-                            allow_retry = is_retryable and _should_retry_failure_class(failure_class)
-                            ignore_max_attempts = is_transient and (not terminal_on_transient)
-                            should_retry = allow_retry and (ignore_max_attempts or next_attempt < max_attempts)
-
-                            # Prevent unbounded attempt growth if we retry forever on transients.
-                            attempts_to_store = min(next_attempt, max_attempts) if ignore_max_attempts else next_attempt
-
-                            now = _utc_now()
-                            if should_retry:
-                                delay = _compute_backoff_seconds(
-                                    attempt=attempts_to_store,
-                                    base=base_backoff_seconds,
-                                    max_backoff=max_backoff_seconds,
+                            )
+                        else:
+                            acks.append(
+                                OutboxAck(
+                                    id=ev.id,
+                                    outcome=ACK_FAILED,
+                                    attempts=attempts_to_store,
+                                    error_reason=reason,
+                                    error=_format_error(exc),
                                 )
-                                next_retry_at = now + timedelta(seconds=delay)
-                                values = {
-                                    "status": "pending",
-                                    "owner": None,
-                                    "lease_until": None,
-                                    "processing_started_at": None,
-                                    "attempts": attempts_to_store,
-                                    "next_retry_at": next_retry_at,
-                                    "error_reason": reason,
-                                    "error": _format_error(exc),
-                                    "updated_at": now,
-                                }
-                            else:
-                                values = {
-                                    "status": "failed",
-                                    "owner": None,
-                                    "lease_until": None,
-                                    "processing_started_at": None,
-                                    "attempts": attempts_to_store,
-                                    "next_retry_at": None,
-                                    "error_reason": reason,
-                                    "error": _format_error(exc),
-                                    "updated_at": now,
-                                }
+                            )
 
-                            await session.execute(
-                                    update(SearchOutboxEventModel)
-                                    .where(
-                                        SearchOutboxEventModel.id == ev.id,
-                                        SearchOutboxEventModel.owner == worker_id,
-                                        SearchOutboxEventModel.status == "processing",
-                                        SearchOutboxEventModel.lease_until > now,
-                                    )
-                                    .values(**values)
-                                )
-                            await session.commit()
+                        outbox_failed_total.labels(
+                            projection=PROJECTION_NAME,
+                            op=str(getattr(ev, "op", "unknown")),
+                            reason=reason,
+                        ).inc()
 
-                            outbox_failed_total.labels(
+                        if should_retry:
+                            outbox_retry_scheduled_total.labels(
                                 projection=PROJECTION_NAME,
                                 op=str(getattr(ev, "op", "unknown")),
                                 reason=reason,
                             ).inc()
-
-                            if values.get("status") == "pending":
-                                outbox_retry_scheduled_total.labels(
-                                    projection=PROJECTION_NAME,
-                                    op=str(getattr(ev, "op", "unknown")),
-                                    reason=reason,
-                                ).inc()
-                                return "retry", reason
-                            else:
-                                outbox_terminal_failed_total.labels(
-                                    projection=PROJECTION_NAME,
-                                    op=str(getattr(ev, "op", "unknown")),
-                                    reason=reason,
-                                ).inc()
-                                return "failed", reason
+                            return "retry", reason
+                        else:
+                            outbox_terminal_failed_total.labels(
+                                projection=PROJECTION_NAME,
+                                op=str(getattr(ev, "op", "unknown")),
+                                reason=reason,
+                            ).inc()
+                            return "failed", reason
 
         # Defensive fallback; should be unreachable.
         return "failed", "unknown"
 
-    async with httpx.AsyncClient(base_url=es_url, timeout=10.0) as client:
+    async def _sample_rebuild_gauges(session: AsyncSession) -> None:
+        # Rebuild bookkeeping (optional): if present, export as gauges.
+        rebuild_row = (
+            await session.execute(
+                select(ProjectionStatusModel).where(ProjectionStatusModel.projection_name == "search")
+            )
+        ).scalar_one_or_none()
+        if rebuild_row is None:
+            return
+        duration_s = float(getattr(rebuild_row, "last_rebuild_duration_seconds", 0.0) or 0.0)
+        projection_rebuild_duration_seconds.labels(projection=PROJECTION_NAME).set(duration_s)
+
+        finished_at = getattr(rebuild_row, "last_rebuild_finished_at", None)
+        finished_ts = float(finished_at.timestamp()) if finished_at is not None else 0.0
+        projection_rebuild_last_finished_timestamp_seconds.labels(projection=PROJECTION_NAME).set(finished_ts)
+
+        ok = getattr(rebuild_row, "last_rebuild_success", None)
+        projection_rebuild_last_success.labels(projection=PROJECTION_NAME).set(1.0 if ok else 0.0)
+
+    # Backlog gauges are sampled off the claim path (count scans grow with the table).
+    backlog_sampler = BacklogSampler(
+        session_factory,
+        SearchOutboxEventModel,
+        projection=PROJECTION_NAME,
+        interval_seconds=metrics_sample_interval_seconds,
+        max_processing_seconds=max_processing_seconds,
+        extra=_sample_rebuild_gauges,
+    )
+    retention = OutboxRetention(
+        session_factory,
+        SearchOutboxEventModel,
+        projection=PROJECTION_NAME,
+        retention_seconds=retention_done_seconds,
+        interval_seconds=retention_interval_seconds,
+        batch_size=retention_batch_size,
+    )
+
+    shards = (
+        ShardLeaseManager(
+            session_factory,
+            projection=PROJECTION_NAME,
+            worker_id=str(worker_id),
+            partitions=shard_partitions,
+            lease_seconds=shard_lease_seconds,
+        )
+        if sharded_enabled
+        else None
+    )
+
+    last_rebalance_at = 0.0
+    claim_ahead: ClaimAhead[tuple[str, list[SearchOutboxEventModel], int]] | None = None
+    ack_writer: AckWriter[OutboxAck] | None = None
+
+    async def _submit_acks(acks: list[OutboxAck]) -> None:
+        # Pipelined: the ack-writer stage writes them while the next batch is sent.
+        if ack_writer is not None:
+            await ack_writer.submit(acks)
+        else:
+            await _write_batch_acks(acks)
+
+    async def _claim_batch(shard_filter: list[Any]) -> tuple[str, list[SearchOutboxEventModel], int]:
+        # Claim a batch of pending events. Also returns how many rows the claim
+        # query returned before coalescing (the adaptive full-batch signal).
+        #
+        # Normal behavior: SELECT ... FOR UPDATE SKIP LOCKED to avoid blocking
+        # between concurrent workers.
+        #
+        # Labs Experiment B1: when OUTBOX_EXPERIMENT_BREAK_CLAIM=1, we
+        # intentionally remove row locking and add a small delay between
+        # SELECT and UPDATE to widen the race window.
+        limit = adaptive.batch_size if adaptive is not None else batch_size
+        async with session_factory() as session:
+            session = session
+
+            now = _utc_now()
+            claim_batch_id = str(uuid.uuid4())
+            with _start_span(
+                "outbox.claim_batch",
+                {
+                    "wordloom.obs_schema": OBS_SCHEMA_VERSION,
+                    "projection": "search",
+                    "wordloom.projection": PROJECTION_NAME,
+                    "wordloom.worker.id": str(worker_id),
+                    "wordloom.claim_batch_id": claim_batch_id,
+                    "batch_size": int(limit),
+                    "claim_mode": "non_atomic" if break_claim_atomicity else "atomic",
+                },
+            ) as claim_span:
+                claimable = (
+                    await session.execute(
+                        select(SearchOutboxEventModel)
+                        .where(
+                            SearchOutboxEventModel.processed_at.is_(None),
+                            SearchOutboxEventModel.status == "pending",
+                            (
+                                SearchOutboxEventModel.next_retry_at.is_(None)
+                                | (SearchOutboxEventModel.next_retry_at <= now)
+                            ),
+                            *shard_filter,
+                        )
+                        .order_by(SearchOutboxEventModel.event_version.asc())
+                        .with_for_update(skip_locked=True)
+                        .limit(limit)
+                    )
+                ).scalars().all()
+
+                if break_claim_atomicity:
+                    # Re-run without row locking to intentionally allow races.
+                    claimable = (
+                        await session.execute(
+                            select(SearchOutboxEventModel)
+                            .where(
+                                SearchOutboxEventModel.processed_at.is_(None),
+                                SearchOutboxEventModel.status == "pending",
+                                (
+                                    SearchOutboxEventModel.next_retry_at.is_(None)
+                                    | (SearchOutboxEventModel.next_retry_at <= now)
+                                ),
+                                *shard_filter,
+                            )
+                            .order_by(SearchOutboxEventModel.event_version.asc())
+                            .limit(limit)
+                        )
+                    ).scalars().all()
+
+                if claim_span is not None:
+                    try:
+                        claim_span.set_attribute("claimed", int(len(claimable or [])))
+                    except Exception:
+                        pass
+                claimed_count = len(claimable or [])
+
+                superseded: list[SearchOutboxEventModel] = []
+                if claimable and coalesce_enabled:
+                    # Pull in the other pending rows of the claimed entities (newer
+                    # versions may sit beyond this batch) and keep one per entity.
+                    siblings = []
+                    if not break_claim_atomicity:
+                        siblings = (
+                            await session.execute(
+                                select(SearchOutboxEventModel)
+                                .where(
+                                    SearchOutboxEventModel.processed_at.is_(None),
+                                    SearchOutboxEventModel.status == "pending",
+                                    # A sibling still backing off is not due; leave it for its retry time.
+                                    (
+                                        SearchOutboxEventModel.next_retry_at.is_(None)
+                                        | (SearchOutboxEventModel.next_retry_at <= now)
+                                    ),
+                                    tuple_(
+                                        SearchOutboxEventModel.entity_type,
+                                        SearchOutboxEventModel.entity_id,
+                                    ).in_({(row.entity_type, row.entity_id) for row in claimable}),
+                                    SearchOutboxEventModel.id.not_in([row.id for row in claimable]),
+                                )
+                                .with_for_update(skip_locked=True)
+                            )
+                        ).scalars().all()
+                    claimable, superseded = coalesce_latest_per_entity([*claimable, *siblings])
+
+                if superseded:
+                    await session.execute(
+                        update(SearchOutboxEventModel)
+                        .where(SearchOutboxEventModel.id.in_([row.id for row in superseded]))
+                        .values(
+                            status="done",
+                            processed_at=now,
+                            owner=None,
+                            lease_until=None,
+                            processing_started_at=None,
+                            next_retry_at=None,
+                            error_reason=None,
+                            error=None,
+                            updated_at=now,
+                        )
+                    )
+                    for row in superseded:
+                        outbox_idempotent_noop_total.labels(
+                            projection=PROJECTION_NAME, op=row.op, reason="superseded"
+                        ).inc()
+                    if claim_span is not None:
+                        try:
+                            claim_span.set_attribute("superseded", int(len(superseded)))
+                        except Exception:
+                            pass
+
+                if claimable:
+                    if break_claim_atomicity and break_claim_sleep_seconds > 0:
+                        await asyncio.sleep(float(break_claim_sleep_seconds))
+                    ids = [row.id for row in claimable]
+                    await session.execute(
+                        update(SearchOutboxEventModel)
+                        .where(SearchOutboxEventModel.id.in_(ids))
+                        .values(
+                            status="processing",
+                            owner=worker_id,
+                            lease_until=_lease_until(now),
+                            processing_started_at=now,
+                            updated_at=now,
+                            error_reason=None,
+                            error=None,
+                        )
+                    )
+                    await session.commit()
+                else:
+                    ids = []
+
+                logger.info(
+                    {
+                        "event": "outbox.claim_batch",
+                        "layer": "worker",
+                        "projection": PROJECTION_NAME,
+                        "worker_id": str(worker_id),
+                        "claim_batch_id": claim_batch_id,
+                        "obs_schema": OBS_SCHEMA_VERSION,
+                        "batch_size": int(limit),
+                        "claimed": int(len(claimable or [])),
+                        "superseded": int(len(superseded)),
+                        "claim_mode": "non_atomic" if break_claim_atomicity else "atomic",
+                    }
+                )
+        return claim_batch_id, list(claimable or []), claimed_count
+
+    async def _shard_filter() -> list[Any] | None:
+        """Claim predicates for sharded mode; None while no bucket is held."""
+        nonlocal last_rebalance_at
+        if shards is None:
+            return []
+        now_monotonic = time.monotonic()
+        if (now_monotonic - last_rebalance_at) >= shards.rebalance_interval_seconds:
+            if claim_ahead is not None:
+                # Rebalance only with nothing queued or in flight.
+                await claim_ahead.drain()
+            if ack_writer is not None:
+                await ack_writer.drain()
+            try:
+                await shards.rebalance()
+            except Exception:  # noqa: BLE001
+                logger.exception("Shard rebalance failed; claiming only while current leases are valid")
+            last_rebalance_at = now_monotonic
+        if not shards.owned:
+            return None
+        return [shards.claim_predicate(SearchOutboxEventModel)]
+
+    async def _claim_for_pipeline() -> tuple[str, list[SearchOutboxEventModel], int] | None:
+        shard_filter = await _shard_filter()
+        if shard_filter is None:
+            return None
+        claimed = await _claim_batch(shard_filter)
+        return claimed if claimed[1] else None
+
+    def _pipeline_should_claim() -> bool:
+        snap = runtime.snapshot()
+        return not snap.stop_requested and snap.state != "DRAINING" and snap.last_db_ok
+
+    async def _release_claimed(batch: tuple[str, list[SearchOutboxEventModel], int]) -> None:
+        await _release_processing_rows([row.id for row in batch[1]])
+
+    if pipeline_enabled:
+        claim_ahead = ClaimAhead(
+            _claim_for_pipeline,
+            depth=pipeline_depth,
+            idle_wait=_idle_wait,
+            should_claim=_pipeline_should_claim,
+            on_abandon=_release_claimed,
+            pause_seconds=min(1.0, max(0.1, poll_interval_seconds)),
+        )
+        ack_writer = AckWriter(_write_batch_acks, depth=pipeline_depth)
+
+    async with (
+        httpx.AsyncClient(base_url=es_url, timeout=10.0) as client,
+        (wakeup or nullcontext()),
+        backlog_sampler,
+        retention,
+        (shards or nullcontext()),
+        (ack_writer or nullcontext()),
+        (claim_ahead or nullcontext()),
+    ):
         last_reclaim_at = 0.0
         while True:
             with _start_span(
@@ -1092,177 +1510,24 @@ async def _worker_loop() -> None:
                 await asyncio.sleep(min(1.0, max(0.1, poll_interval_seconds)))
                 continue
 
-            # Claim a batch of pending events.
-            #
-            # Normal behavior: SELECT ... FOR UPDATE SKIP LOCKED to avoid blocking
-            # between concurrent workers.
-            #
-            # Labs Experiment B1: when OUTBOX_EXPERIMENT_BREAK_CLAIM=1, we
-            # intentionally remove row locking and add a small delay between
-            # SELECT and UPDATE to widen the race window.
-            async with session_factory() as session:
-                session = session
-
-                now = _utc_now()
-                claim_batch_id = str(uuid.uuid4())
-                # Low-cardinality projection freshness gauges.
-                pending_count = (
-                    await session.execute(
-                        select(func.count()).select_from(SearchOutboxEventModel).where(
-                            SearchOutboxEventModel.processed_at.is_(None),
-                            SearchOutboxEventModel.status.in_(["pending", "processing", "failed"]),
-                        )
-                    )
-                ).scalar_one()
-                inflight_count = (
-                    await session.execute(
-                        select(func.count()).select_from(SearchOutboxEventModel).where(
-                            SearchOutboxEventModel.processed_at.is_(None),
-                            SearchOutboxEventModel.status == "processing",
-                        )
-                    )
-                ).scalar_one()
-
-                stuck_processing_count = (
-                    await session.execute(
-                        select(func.count()).select_from(SearchOutboxEventModel).where(
-                            stuck_processing_predicate(
-                                SearchOutboxEventModel,
-                                now=now,
-                                max_processing_seconds=max_processing_seconds,
-                            )
-                        )
-                    )
-                ).scalar_one()
-                oldest_created_at = (
-                    await session.execute(
-                        select(func.min(SearchOutboxEventModel.created_at)).where(
-                            SearchOutboxEventModel.processed_at.is_(None),
-                            SearchOutboxEventModel.status.in_(["pending", "processing", "failed"]),
-                        )
-                    )
-                ).scalar_one_or_none()
-
-                # Rebuild bookkeeping (optional): if present, export as gauges.
-                rebuild_row = (
-                    await session.execute(
-                        select(ProjectionStatusModel).where(ProjectionStatusModel.projection_name == "search")
-                    )
-                ).scalar_one_or_none()
-                if rebuild_row is not None:
-                    duration_s = float(getattr(rebuild_row, "last_rebuild_duration_seconds", 0.0) or 0.0)
-                    projection_rebuild_duration_seconds.labels(projection=PROJECTION_NAME).set(duration_s)
-
-                    finished_at = getattr(rebuild_row, "last_rebuild_finished_at", None)
-                    finished_ts = float(finished_at.timestamp()) if finished_at is not None else 0.0
-                    projection_rebuild_last_finished_timestamp_seconds.labels(projection=PROJECTION_NAME).set(
-                        finished_ts
-                    )
-
-                    ok = getattr(rebuild_row, "last_rebuild_success", None)
-                    projection_rebuild_last_success.labels(projection=PROJECTION_NAME).set(
-                        1.0 if ok else 0.0
-                    )
-
-                outbox_lag_events.labels(projection=PROJECTION_NAME).set(int(pending_count))
-                outbox_inflight_events.labels(projection=PROJECTION_NAME).set(int(inflight_count))
-                outbox_stuck_processing_events.labels(projection=PROJECTION_NAME).set(int(stuck_processing_count))
-                if oldest_created_at is None:
-                    outbox_oldest_age_seconds.labels(projection=PROJECTION_NAME).set(0)
-                else:
-                    age_s = max(0.0, (now - oldest_created_at).total_seconds())
-                    outbox_oldest_age_seconds.labels(projection=PROJECTION_NAME).set(float(age_s))
-
-                with _start_span(
-                    "outbox.claim_batch",
-                    {
-                        "wordloom.obs_schema": OBS_SCHEMA_VERSION,
-                        "projection": "search",
-                        "wordloom.projection": PROJECTION_NAME,
-                        "wordloom.worker.id": str(worker_id),
-                        "wordloom.claim_batch_id": claim_batch_id,
-                        "batch_size": int(batch_size),
-                        "claim_mode": "non_atomic" if break_claim_atomicity else "atomic",
-                    },
-                ) as claim_span:
-                    claimable = (
-                        await session.execute(
-                            select(SearchOutboxEventModel)
-                            .where(
-                                SearchOutboxEventModel.processed_at.is_(None),
-                                SearchOutboxEventModel.status == "pending",
-                                (
-                                    SearchOutboxEventModel.next_retry_at.is_(None)
-                                    | (SearchOutboxEventModel.next_retry_at <= now)
-                                ),
-                            )
-                            .order_by(SearchOutboxEventModel.event_version.asc())
-                            .with_for_update(skip_locked=True)
-                            .limit(batch_size)
-                        )
-                    ).scalars().all()
-
-                    if break_claim_atomicity:
-                        # Re-run without row locking to intentionally allow races.
-                        claimable = (
-                            await session.execute(
-                                select(SearchOutboxEventModel)
-                                .where(
-                                    SearchOutboxEventModel.processed_at.is_(None),
-                                    SearchOutboxEventModel.status == "pending",
-                                    (
-                                        SearchOutboxEventModel.next_retry_at.is_(None)
-                                        | (SearchOutboxEventModel.next_retry_at <= now)
-                                    ),
-                                )
-                                .order_by(SearchOutboxEventModel.event_version.asc())
-                                .limit(batch_size)
-                            )
-                        ).scalars().all()
-
-                    if claim_span is not None:
-                        try:
-                            claim_span.set_attribute("claimed", int(len(claimable or [])))
-                        except Exception:
-                            pass
-
-                    if claimable:
-                        if break_claim_atomicity and break_claim_sleep_seconds > 0:
-                            await asyncio.sleep(float(break_claim_sleep_seconds))
-                        ids = [row.id for row in claimable]
-                        await session.execute(
-                            update(SearchOutboxEventModel)
-                            .where(SearchOutboxEventModel.id.in_(ids))
-                            .values(
-                                status="processing",
-                                owner=worker_id,
-                                lease_until=_lease_until(now),
-                                processing_started_at=now,
-                                updated_at=now,
-                                error_reason=None,
-                                error=None,
-                            )
-                        )
-                        await session.commit()
-                    else:
-                        ids = []
-
-                    logger.info(
-                        {
-                            "event": "outbox.claim_batch",
-                            "layer": "worker",
-                            "projection": PROJECTION_NAME,
-                            "worker_id": str(worker_id),
-                            "claim_batch_id": claim_batch_id,
-                            "obs_schema": OBS_SCHEMA_VERSION,
-                            "batch_size": int(batch_size),
-                            "claimed": int(len(claimable or [])),
-                            "claim_mode": "non_atomic" if break_claim_atomicity else "atomic",
-                        }
-                    )
+            if claim_ahead is not None:
+                claimed = await claim_ahead.get(timeout=max(0.1, poll_interval_seconds))
+                if claimed is None:
+                    continue
+                claim_batch_id, claimable, claimed_count = claimed
+                # The batch may have waited in the queue: refresh its row leases.
+                async with session_factory() as session:
+                    await _renew_lease(session, [row.id for row in claimable])
+                    await session.commit()
+            else:
+                shard_filter = await _shard_filter()
+                if shard_filter is None:
+                    await _idle_wait()
+                    continue
+                claim_batch_id, claimable, claimed_count = await _claim_batch(shard_filter)
 
             if not claimable:
-                await asyncio.sleep(poll_interval_seconds)
+                await _idle_wait()
                 continue
 
             if process_sleep_seconds and float(process_sleep_seconds) > 0:
@@ -1353,7 +1618,39 @@ async def _worker_loop() -> None:
                         "projection.process_batch",
                         batch_span_attrs,
                     ) as batch_span:
-                        tasks = [asyncio.create_task(_process_one(ev, client)) for ev in events]
+                        # One set-based load of the outbox rows (ownership check) and
+                        # one hydration for every upsert in the batch.
+                        batch_rows: dict[Any, SearchOutboxEventModel] | None = None
+                        batch_docs: dict[tuple[str, str], dict[str, Any]] | None = None
+                        try:
+                            async with session_factory() as session:
+                                batch_rows = {
+                                    row.id: row
+                                    for row in (
+                                        await session.execute(
+                                            select(SearchOutboxEventModel).where(
+                                                SearchOutboxEventModel.id.in_([ev.id for ev in events])
+                                            )
+                                        )
+                                    ).scalars()
+                                }
+                                batch_docs = await _hydrate_docs(
+                                    session,
+                                    [(ev.entity_type, ev.entity_id) for ev in events if ev.op == "upsert"],
+                                )
+                        except Exception:  # noqa: BLE001
+                            logger.exception("Batch preload failed; falling back to per-event loads")
+                            batch_rows = batch_docs = None
+                        batch_acks: list[OutboxAck] = []
+                        batch_concurrency = concurrency
+                        if adaptive is not None:
+                            batch_concurrency = adaptive.concurrency
+                            semaphore = asyncio.Semaphore(batch_concurrency)
+                        batch_started = time.perf_counter()
+                        tasks = [
+                            asyncio.create_task(_process_one(ev, client, batch_acks, batch_docs, batch_rows))
+                            for ev in events
+                        ]
                         remaining = _remaining_grace_seconds()
                         batch_result = "failed"
                         batch_reason = "unknown"
@@ -1367,10 +1664,23 @@ async def _worker_loop() -> None:
                             else:
                                 results = await asyncio.wait_for(asyncio.gather(*tasks), timeout=remaining)
 
+                            await _submit_acks(batch_acks)
+
                             ok_count = sum(1 for r, _ in results if r == "ok")
                             retry_count = sum(1 for r, _ in results if r == "retry")
                             failed_count = sum(1 for r, _ in results if r == "failed")
 
+                            if adaptive is not None:
+                                # Events run in waves of `batch_concurrency` requests.
+                                waves = max(1, math.ceil(len(events) / batch_concurrency))
+                                adaptive.observe(
+                                    items=len(events),
+                                    latency_seconds=(time.perf_counter() - batch_started) / waves,
+                                    errors=retry_count + failed_count,
+                                    throttled=any(_is_throttle_reason(reason) for _r, reason in results),
+                                    claimed=claimed_count,
+                                )
+
                             if failed_count > 0:
                                 batch_result = "failed"
                             elif retry_count > 0:
@@ -1392,6 +1702,10 @@ async def _worker_loop() -> None:
                             for t in tasks:
                                 t.cancel()
                             await asyncio.gather(*tasks, return_exceptions=True)
+                            # Keep the outcomes that did finish; release the rest.
+                            if ack_writer is not None:
+                                await ack_writer.drain()
+                            await _write_batch_acks(batch_acks)
                             try:
                                 released = await _release_processing_rows([ev.id for ev in events])
                                 logger.warning(
@@ -1445,6 +1759,8 @@ async def _worker_loop() -> None:
 
             remaining = _remaining_grace_seconds()
             if remaining is not None and remaining <= 0.0:
+                if ack_writer is not None:
+                    await ack_writer.drain()
                 released = await _release_processing_rows([ev.id for ev in events])
                 logger.warning("Shutdown grace exceeded; released %s/%s claimed rows", released, len(events))
                 runtime.set_state("STOPPED")
@@ -1467,105 +1783,60 @@ async def _worker_loop() -> None:
                 },
                 context=batch_parent_ctx,
             ) as bulk_prepare_span:
-                async with session_factory() as session:
-                    session = session
-
-                bulk_ops: list[tuple[str, str, dict[str, Any] | None]] = []
+                bulk_ops: list[tuple[str, str, dict[str, Any] | None, int | None]] = []
                 bulk_event_ids: list[Any] = []
                 bulk_item_ops: list[str] = []
                 bulk_outbox_ops: list[str] = []
                 processed_immediately_ids: list[Any] = []
                 failed_immediately: list[tuple[Any, str, str]] = []  # (id, op, reason)
 
+                async with session_factory() as session:
+                    docs = await _hydrate_docs(
+                        session,
+                        [(ev.entity_type, ev.entity_id) for ev in events if ev.op == "upsert"],
+                    )
+
                 for ev in events:
                     if ev.op == "upsert":
-                        row = (
-                            await session.execute(
-                                select(SearchIndexModel).where(
-                                    SearchIndexModel.entity_type == ev.entity_type,
-                                    SearchIndexModel.entity_id == ev.entity_id,
-                                )
-                            )
-                        ).scalar_one_or_none()
-
-                        if row is None:
+                        doc = docs.get((ev.entity_type, str(ev.entity_id)))
+                        if doc is None:
                             processed_immediately_ids.append(ev.id)
                             continue
 
-                        doc = {
-                            "entity_type": row.entity_type,
-                            "library_id": (str(row.library_id) if getattr(row, "library_id", None) else None),
-                            "entity_id": str(row.entity_id),
-                            "text": row.text,
-                            "snippet": row.snippet,
-                            "rank_score": row.rank_score,
-                            "event_version": int(row.event_version),
-                        }
-                        doc_id = _es_doc_id(row.entity_type, row.entity_id)
-                        bulk_ops.append(("index", doc_id, doc))
+                        doc_id = _es_doc_id(ev.entity_type, ev.entity_id)
+                        bulk_ops.append(("index", doc_id, doc, doc["event_version"]))
                         bulk_event_ids.append(ev.id)
                         bulk_item_ops.append("index")
                         bulk_outbox_ops.append("upsert")
                     elif ev.op == "delete":
                         doc_id = _es_doc_id(ev.entity_type, ev.entity_id)
-                        bulk_ops.append(("delete", doc_id, None))
+                        bulk_ops.append(("delete", doc_id, None, ev.event_version))
                         bulk_event_ids.append(ev.id)
                         bulk_item_ops.append("delete")
                         bulk_outbox_ops.append("delete")
                     else:
                         failed_immediately.append((ev.id, "unknown", "unknown_op"))
 
-                now = _utc_now()
-
-                if processed_immediately_ids:
-                    await session.execute(
-                        update(SearchOutboxEventModel)
-                        .where(
-                            SearchOutboxEventModel.id.in_(processed_immediately_ids),
-                            SearchOutboxEventModel.owner == worker_id,
-                            SearchOutboxEventModel.status == "processing",
-                            SearchOutboxEventModel.lease_until > now,
-                        )
-                        .values(
-                            status="done",
-                            processed_at=now,
-                            owner=None,
-                            lease_until=None,
-                            processing_started_at=None,
-                            next_retry_at=None,
-                            error_reason=None,
-                            error=None,
-                            updated_at=now,
-                        )
-                    )
-                    for _id in processed_immediately_ids:
-                        outbox_processed_total.labels(projection=PROJECTION_NAME, op="upsert").inc()
+                # Rows settled without an ES request: acked together in one write_acks call.
+                prepare_acks: list[OutboxAck] = []
+                for ev_id in processed_immediately_ids:
+                    prepare_acks.append(OutboxAck(id=ev_id, outcome=ACK_DONE))
+                    outbox_processed_total.labels(projection=PROJECTION_NAME, op="upsert").inc()
 
                 for ev_id, op, reason in failed_immediately:
-                    await session.execute(
-                        update(SearchOutboxEventModel)
-                        .where(
-                            SearchOutboxEventModel.id == ev_id,
-                            SearchOutboxEventModel.owner == worker_id,
-                            SearchOutboxEventModel.status == "processing",
-                            SearchOutboxEventModel.lease_until > now,
-                        )
-                        .values(
-                            status="failed",
-                            owner=None,
-                            lease_until=None,
-                            processing_started_at=None,
-                            attempts=(attempts_by_id.get(ev_id, 0) + 1),
-                            next_retry_at=None,
+                    prepare_acks.append(
+                        OutboxAck(
+                            id=ev_id,
+                            outcome=ACK_FAILED,
+                            attempts=attempts_by_id.get(ev_id, 0) + 1,
                             error_reason=reason,
                             error=reason,
-                            updated_at=now,
                         )
                     )
                     outbox_failed_total.labels(projection=PROJECTION_NAME, op=op, reason=reason).inc()
                     outbox_terminal_failed_total.labels(projection=PROJECTION_NAME, op=op, reason=reason).inc()
 
-                await session.commit()
+                await _submit_acks(prepare_acks)
 
                 if bulk_prepare_span is not None:
                     try:
@@ -1631,31 +1902,39 @@ async def _worker_loop() -> None:
                             pass
 
                     logger.exception("ES bulk request failed")
-                    outbox_es_bulk_request_duration_seconds.labels(projection=PROJECTION_NAME).observe(
-                        time.perf_counter() - started
-                    )
+                    elapsed = time.perf_counter() - started
+                    outbox_es_bulk_request_duration_seconds.labels(projection=PROJECTION_NAME).observe(elapsed)
+                    if adaptive is not None:
+                        adaptive.observe(
+                            items=len(events),
+                            latency_seconds=elapsed,
+                            errors=len(bulk_event_ids),
+                            throttled=_is_throttle_reason(_classify_attempt_outcome(exc)[0]),
+                            claimed=claimed_count,
+                        )
 
                     # Treat as retryable failure for all items.
                     now = _utc_now()
-                    async with session_factory() as session:
-                        session = session
-                        for idx, ev_id in enumerate(bulk_event_ids):
-                            op = bulk_item_ops[idx]
-                            outbox_es_bulk_items_total.labels(projection=PROJECTION_NAME, op=op, result="failed").inc()
-                            outbox_es_bulk_item_failures_total.labels(
-                                projection=PROJECTION_NAME,
-                                op=op,
-                                failure_class="5xx",
-                            ).inc()
+                    reason, is_retryable = _classify_attempt_outcome(exc)
+                    is_transient = _is_transient_reason(reason)
+                    ignore_max_attempts = is_transient and (not terminal_on_transient)
+                    failed_acks: list[OutboxAck] = []
+                    for idx, ev_id in enumerate(bulk_event_ids):
+                        op = bulk_item_ops[idx]
+                        outbox_es_bulk_items_total.labels(projection=PROJECTION_NAME, op=op, result="failed").inc()
+                        outbox_es_bulk_item_failures_total.labels(
+                            projection=PROJECTION_NAME,
+                            op=op,
+                            failure_class="5xx",
+                        ).inc()
 
-                            attempts = attempts_by_id.get(ev_id, 0)
-                            next_attempt = attempts + 1
-                            reason, is_retryable = _classify_attempt_outcome(exc)
-                            is_transient = _is_transient_reason(reason)
-                            ignore_max_attempts = is_transient and (not terminal_on_transient)
-                            should_retry = is_retryable and (ignore_max_attempts or next_attempt < max_attempts)
+                        attempts = attempts_by_id.get(ev_id, 0)
+                        next_attempt = attempts + 1
+                        should_retry = is_retryable and (ignore_max_attempts or next_attempt < max_attempts)
 
-                            attempts_to_store = min(next_attempt, max_attempts) if ignore_max_attempts else next_attempt
+                        attempts_to_store = min(next_attempt, max_attempts) if ignore_max_attempts else next_attempt
+                        next_retry_at = None
+                        if should_retry:
                             delay = _compute_backoff_seconds(
                                 attempt=attempts_to_store,
                                 base=base_backoff_seconds,
@@ -1663,49 +1942,37 @@ async def _worker_loop() -> None:
                             )
                             next_retry_at = now + timedelta(seconds=delay)
 
-                            is_terminal = not should_retry
-
-                            await session.execute(
-                                update(SearchOutboxEventModel)
-                                .where(
-                                    SearchOutboxEventModel.id == ev_id,
-                                    SearchOutboxEventModel.owner == worker_id,
-                                    SearchOutboxEventModel.status == "processing",
-                                    SearchOutboxEventModel.lease_until > now,
-                                )
-                                .values(
-                                    status="pending" if should_retry else "failed",
-                                    owner=None,
-                                    lease_until=None,
-                                    processing_started_at=None,
-                                    attempts=attempts_to_store,
-                                    next_retry_at=(next_retry_at if should_retry else None),
-                                    error_reason=reason,
-                                    error=_format_error(exc),
-                                    updated_at=now,
-                                )
+                        failed_acks.append(
+                            OutboxAck(
+                                id=ev_id,
+                                outcome=ACK_RETRY if should_retry else ACK_FAILED,
+                                attempts=attempts_to_store,
+                                next_retry_at=next_retry_at,
+                                error_reason=reason,
+                                error=_format_error(exc),
                             )
+                        )
+
+                        outbox_failed_total.labels(
+                            projection=PROJECTION_NAME,
+                            op=bulk_outbox_ops[idx],
+                            reason=reason,
+                        ).inc()
 
-                            outbox_failed_total.labels(
+                        if should_retry:
+                            outbox_retry_scheduled_total.labels(
+                                projection=PROJECTION_NAME,
+                                op=bulk_outbox_ops[idx],
+                                reason=reason,
+                            ).inc()
+                        else:
+                            outbox_terminal_failed_total.labels(
                                 projection=PROJECTION_NAME,
                                 op=bulk_outbox_ops[idx],
                                 reason=reason,
                             ).inc()
 
-                            if is_terminal:
-                                outbox_terminal_failed_total.labels(
-                                    projection=PROJECTION_NAME,
-                                    op=bulk_outbox_ops[idx],
-                                    reason=reason,
-                                ).inc()
-                            else:
-                                outbox_retry_scheduled_total.labels(
-                                    projection=PROJECTION_NAME,
-                                    op=bulk_outbox_ops[idx],
-                                    reason=reason,
-                                ).inc()
-
-                        await session.commit()
+                    await _submit_acks(failed_acks)
 
                     outbox_es_bulk_requests_total.labels(projection=PROJECTION_NAME, result="failed").inc()
 
@@ -1727,9 +1994,8 @@ async def _worker_loop() -> None:
                     )
                     continue
 
-            outbox_es_bulk_request_duration_seconds.labels(projection=PROJECTION_NAME).observe(
-                time.perf_counter() - started
-            )
+            bulk_elapsed = time.perf_counter() - started
+            outbox_es_bulk_request_duration_seconds.labels(projection=PROJECTION_NAME).observe(bulk_elapsed)
 
             success_ids: list[Any] = []
             failure_ids: list[Any] = []
@@ -1816,6 +2082,10 @@ async def _worker_loop() -> None:
                                 is_success = True
                             elif 200 <= status_int < 300:
                                 is_success = True
+                            elif status_int == 409:
+                                # Version conflict: ES already holds a newer write.
+                                is_success = True
+                                _record_version_conflict_noop(bulk_outbox_ops[idx])
 
                         if is_success:
                             outbox_es_bulk_items_total.labels(projection=PROJECTION_NAME, op=op, result="success").inc()
@@ -1848,6 +2118,15 @@ async def _worker_loop() -> None:
 
             outbox_es_bulk_requests_total.labels(projection=PROJECTION_NAME, result=request_result).inc()
 
+            if adaptive is not None:
+                adaptive.observe(
+                    items=len(events),
+                    latency_seconds=bulk_elapsed,
+                    errors=len(failure_ids),
+                    throttled=(resp is not None and resp.status_code == 429) or ("429" in failure_classes),
+                    claimed=claimed_count,
+                )
+
             if bulk_span_ref is not None:
                 try:
                     bulk_span_ref.set_attribute("result", request_result)
@@ -1877,108 +2156,72 @@ async def _worker_loop() -> None:
             success_id_set = set(success_ids)
             failure_id_set = set(failure_ids)
 
-            async with session_factory() as session:
-                session = session
-
-                if success_ids:
-                    await session.execute(
-                        update(SearchOutboxEventModel)
-                        .where(
-                            SearchOutboxEventModel.id.in_(success_ids),
-                            SearchOutboxEventModel.owner == worker_id,
-                            SearchOutboxEventModel.status == "processing",
-                            SearchOutboxEventModel.lease_until > now,
-                        )
-                        .values(
-                            status="done",
-                            processed_at=now,
-                            owner=None,
-                            lease_until=None,
-                            processing_started_at=None,
-                            next_retry_at=None,
-                            error_reason=None,
-                            error=None,
-                            updated_at=now,
-                        )
-                    )
-                    for idx, ev_id in enumerate(bulk_event_ids):
-                        if ev_id in success_id_set:
-                            outbox_processed_total.labels(projection=PROJECTION_NAME, op=bulk_outbox_ops[idx]).inc()
-
-                if failure_ids:
-                    for idx, ev_id in enumerate(bulk_event_ids):
-                        if ev_id not in failure_id_set:
-                            continue
-
-                        failure_class = failure_classes[idx] or "unknown"
-                        attempts = attempts_by_id.get(ev_id, 0)
-                        next_attempt = attempts + 1
+            bulk_acks: list[OutboxAck] = []
+            for idx, ev_id in enumerate(bulk_event_ids):
+                if ev_id in success_id_set:
+                    bulk_acks.append(OutboxAck(id=ev_id, outcome=ACK_DONE))
+                    outbox_processed_total.labels(projection=PROJECTION_NAME, op=bulk_outbox_ops[idx]).inc()
+                    continue
+                if ev_id not in failure_id_set:
+                    continue
 
-                        status_code = failure_status_codes[idx]
-                        reason, is_retryable = _classify_bulk_item_failure(status_code=status_code)
+                failure_class = failure_classes[idx] or "unknown"
+                attempts = attempts_by_id.get(ev_id, 0)
+                next_attempt = attempts + 1
 
-                        is_transient = _is_transient_reason(reason)
-                        ignore_max_attempts = is_transient and (not terminal_on_transient)
-                        should_retry = (
-                            is_retryable
-                            and _should_retry_failure_class(failure_class)
-                            and (ignore_max_attempts or next_attempt < max_attempts)
-                        )
-                        next_retry_at = None
-                        new_status = "failed"
+                status_code = failure_status_codes[idx]
+                reason, is_retryable = _classify_bulk_item_failure(status_code=status_code)
 
-                        attempts_to_store = min(next_attempt, max_attempts) if ignore_max_attempts else next_attempt
+                is_transient = _is_transient_reason(reason)
+                ignore_max_attempts = is_transient and (not terminal_on_transient)
+                should_retry = (
+                    is_retryable
+                    and _should_retry_failure_class(failure_class)
+                    and (ignore_max_attempts or next_attempt < max_attempts)
+                )
+                next_retry_at = None
 
-                        if should_retry:
-                            delay = _compute_backoff_seconds(
-                                attempt=attempts_to_store,
-                                base=base_backoff_seconds,
-                                max_backoff=max_backoff_seconds,
-                            )
-                            next_retry_at = now + timedelta(seconds=delay)
-                            new_status = "pending"
+                attempts_to_store = min(next_attempt, max_attempts) if ignore_max_attempts else next_attempt
 
-                        await session.execute(
-                            update(SearchOutboxEventModel)
-                            .where(
-                                SearchOutboxEventModel.id == ev_id,
-                                SearchOutboxEventModel.owner == worker_id,
-                                SearchOutboxEventModel.status == "processing",
-                                SearchOutboxEventModel.lease_until > now,
-                            )
-                            .values(
-                                status=new_status,
-                                owner=None,
-                                lease_until=None,
-                                processing_started_at=None,
-                                attempts=attempts_to_store,
-                                next_retry_at=next_retry_at,
-                                error_reason=reason,
-                                error=(failure_error_texts[idx] or f"es_bulk_{failure_class}"),
-                                updated_at=now,
-                            )
-                        )
+                if should_retry:
+                    delay = _compute_backoff_seconds(
+                        attempt=attempts_to_store,
+                        base=base_backoff_seconds,
+                        max_backoff=max_backoff_seconds,
+                    )
+                    next_retry_at = now + timedelta(seconds=delay)
+
+                bulk_acks.append(
+                    OutboxAck(
+                        id=ev_id,
+                        outcome=ACK_RETRY if should_retry else ACK_FAILED,
+                        attempts=attempts_to_store,
+                        next_retry_at=next_retry_at,
+                        error_reason=reason,
+                        error=(failure_error_texts[idx] or f"es_bulk_{failure_class}"),
+                    )
+                )
 
-                        outbox_failed_total.labels(
-                            projection=PROJECTION_NAME,
-                            op=bulk_outbox_ops[idx],
-                            reason=reason,
-                        ).inc()
+                outbox_failed_total.labels(
+                    projection=PROJECTION_NAME,
+                    op=bulk_outbox_ops[idx],
+                    reason=reason,
+                ).inc()
 
-                        if new_status == "pending":
-                            outbox_retry_scheduled_total.labels(
-                                projection=PROJECTION_NAME,
-                                op=bulk_outbox_ops[idx],
-                                reason=reason,
-                            ).inc()
-                        else:
-                            outbox_terminal_failed_total.labels(
-                                projection=PROJECTION_NAME,
-                                op=bulk_outbox_ops[idx],
-                                reason=reason,
-                            ).inc()
+                if should_retry:
+                    outbox_retry_scheduled_total.labels(
+                        projection=PROJECTION_NAME,
+                        op=bulk_outbox_ops[idx],
+                        reason=reason,
+                    ).inc()
+                else:
+                    outbox_terminal_failed_total.labels(
+                        projection=PROJECTION_NAME,
+                        op=bulk_outbox_ops[idx],
+                        reason=reason,
+                    ).inc()
 
-                await session.commit()
+            await _submit_acks(bulk_acks)
 
 
 def main() -> None: